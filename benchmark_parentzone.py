@@ -0,0 +1,645 @@
+"""
+Benchmarks for the ParentZone scraper
+
+Builds synthetic bookings pages with the real MUI class names and times:
+- month extraction (every EXTRACTION_MODE) against a fake driver that counts
+  WebDriver commands, or against real headless Chrome with --chrome
+- the per-day session merge
+- iCal serialization, and the old list-and-join generator against write_ical
+  on --ical-events synthetic events (100k by default)
+- with --engines, whole months scraped from a local fixture server by the
+  Selenium path and by the asyncio DevTools ("cdp") engine, side by side
+
+Usage:
+    python benchmark_parentzone.py                       # run, print results
+    python benchmark_parentzone.py --output results.json # also save them
+    python benchmark_parentzone.py --save-baseline       # store as the baseline
+    python benchmark_parentzone.py --baseline benchmark_baseline.json
+    python benchmark_parentzone.py --chrome --browser-profile full   # vs the lean profile
+    python benchmark_parentzone.py --engines --cdp-concurrency 4     # Selenium vs cdp engine
+    python benchmark_parentzone.py --ical-events 0                   # skip the big iCal comparison
+
+With a baseline, any timing more than --threshold percent slower is flagged
+and the script exits with status 1.
+"""
+
+from datetime import datetime, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+from selenium.common.exceptions import NoSuchElementException
+
+import scrape_parentzone_bookings as pz
+
+
+DEFAULT_BASELINE_FILE = "benchmark_baseline.json"
+
+# (children per day, sessions per child, months)
+SCENARIOS = [
+    (1, 1, 1),
+    (1, 4, 3),
+    (3, 2, 3),
+    (3, 4, 6),
+]
+
+
+# ============= SYNTHETIC PAGES =============
+
+def build_calendar(month_start, children, sessions_per_child):
+    """Lay out a month grid: (header_text, [(date_text, [(child, session_time), ...]), ...])
+
+    The grid runs Monday to Sunday and shows the overflow days of the
+    neighbouring months as 'D Mon', like ParentZone does.
+    """
+    grid_start = month_start - timedelta(days=month_start.weekday())
+    next_month = pz.add_months(month_start, 1)
+    weeks = -(-((next_month - grid_start).days) // 7)
+
+    days = []
+    for offset in range(weeks * 7):
+        day = grid_start + timedelta(days=offset)
+        if day.month == month_start.month:
+            date_text = str(day.day)
+        else:
+            date_text = f"{day.day} {day:%b}"
+
+        rows = []
+        if day.weekday() < 5:
+            for child_idx in range(children):
+                for session_idx in range(sessions_per_child):
+                    start_hour = 8 + session_idx * 2
+                    rows.append((
+                        f"Child {child_idx + 1}",
+                        f"{start_hour:02d}:00 - {start_hour + 2:02d}:00"
+                    ))
+        days.append((date_text, rows))
+
+    return f"Bookings - {month_start:%b %Y}", days
+
+
+def _classes(selector):
+    tag, *classes = selector.split('.')
+    return tag, ' '.join(classes)
+
+
+def render_calendar_html(header_text, days):
+    """Render a calendar layout as HTML using the selectors the scraper looks for"""
+    header_tag, header_classes = _classes(pz.HEADER_SELECTOR)
+    day_tag, day_classes = _classes(pz.DAY_SELECTOR)
+    date_tag, date_classes = _classes(pz.DATE_SELECTOR)
+    booking_tag, booking_classes = _classes(pz.BOOKING_SELECTOR)
+    child_tag, child_classes = _classes(pz.CHILD_NAME_SELECTOR)
+    session_tag, session_classes = _classes(pz.SESSION_TIME_SELECTOR)
+
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Bookings</title></head><body>",
+        f"<div class='css-header'><{header_tag} class='{header_classes}'>{escape(header_text)}</{header_tag}>",
+        "<button data-test-id='next_btn'><svg data-testid='ChevronRightIcon'></svg></button></div>",
+        "<div class='css-grid'>",
+    ]
+    for date_text, rows in days:
+        parts.append(f"<{day_tag} class='{day_classes}'>")
+        parts.append(f"<{date_tag} class='{date_classes}'>{escape(date_text)}</{date_tag}>")
+        for child_name, session_time in rows:
+            parts.append(
+                f"<{booking_tag} class='{booking_classes}'><button>"
+                f"<{child_tag} class='{child_classes}'>{escape(child_name)}</{child_tag}>"
+                f"<{session_tag} class='{session_classes}'>{escape(session_time)}</{session_tag}>"
+                f"</button></{booking_tag}>"
+            )
+        parts.append(f"</{day_tag}>")
+    parts.append("</div></body></html>")
+    return ''.join(parts)
+
+
+# ============= FAKE DRIVER =============
+
+class FakeElement:
+    """Just enough of a WebElement for the per-element extraction path"""
+
+    def __init__(self, driver, text='', children=None):
+        self._driver = driver
+        self._text = text
+        self._children = children or {}
+
+    @property
+    def text(self):
+        self._driver.command()
+        return self._text
+
+    def find_element(self, by, selector):
+        found = self.find_elements(by, selector)
+        if not found:
+            raise NoSuchElementException(selector)
+        return found[0]
+
+    def find_elements(self, by, selector):
+        self._driver.command()
+        return list(self._children.get(selector, []))
+
+
+class FakeDriver:
+    """Serves one synthetic calendar page and counts every WebDriver command
+
+    latency adds a sleep per command to stand in for the chromedriver round
+    trip, which is what the snapshot and page_source modes save.
+    """
+
+    def __init__(self, header_text, days, latency=0.0):
+        self.commands = 0
+        self.latency = latency
+        self.header_text = header_text
+        self.days = days
+        self.html = render_calendar_html(header_text, days)
+        self.current_url = pz.PARENTZONE_BOOKINGS_URL
+
+        day_elements = []
+        for date_text, rows in days:
+            containers = [
+                FakeElement(self, children={
+                    pz.CHILD_NAME_SELECTOR: [FakeElement(self, child_name)],
+                    pz.SESSION_TIME_SELECTOR: [FakeElement(self, session_time)],
+                })
+                for child_name, session_time in rows
+            ]
+            day_elements.append(FakeElement(self, children={
+                pz.DATE_SELECTOR: [FakeElement(self, date_text)],
+                pz.BOOKING_SELECTOR: containers,
+            }))
+        self.root = FakeElement(self, children={
+            pz.HEADER_SELECTOR: [FakeElement(self, header_text)],
+            pz.DAY_SELECTOR: day_elements,
+        })
+
+    def command(self):
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def find_element(self, by, selector):
+        return self.root.find_element(by, selector)
+
+    def find_elements(self, by, selector):
+        return self.root.find_elements(by, selector)
+
+    @property
+    def page_source(self):
+        self.command()
+        return self.html
+
+    def execute_script(self, script, *args):
+        self.command()
+        if script == pz.CALENDAR_SNAPSHOT_JS:
+            return {
+                'header': self.header_text,
+                'days': [[date_text, [list(row) for row in rows]] for date_text, rows in self.days],
+            }
+        if script == pz.CALENDAR_STATE_JS:
+            first, last = self.days[0][0], self.days[-1][0]
+            return [self.header_text, len(self.days), first, last, sum(len(r) for _, r in self.days)]
+        raise NotImplementedError("FakeDriver only runs the scraper's own scripts")
+
+
+# ============= FIXTURE SERVER =============
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves /bookings?date=YYYY-MM-01 from self.server.pages, like PARENTZONE_BOOKINGS_MONTH_URL"""
+
+    def do_GET(self):
+        date = parse_qs(urlsplit(self.path).query).get('date', [''])[0]
+        html = self.server.pages.get(date)
+        if html is None:
+            self.send_error(404)
+            return
+        body = html.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def page_month_start(header_text):
+    _, month, year = pz.parse_month_header(header_text)
+    return datetime(year, month, 1)
+
+
+@contextlib.contextmanager
+def fixture_server(pages):
+    """Serve the pages on a local port and point PARENTZONE_BOOKINGS_MONTH_URL at them"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    server.pages = {
+        page_month_start(header_text).strftime('%Y-%m-%d'): render_calendar_html(header_text, days)
+        for header_text, days in pages
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    month_url = pz.PARENTZONE_BOOKINGS_MONTH_URL
+    pz.PARENTZONE_BOOKINGS_MONTH_URL = f"http://127.0.0.1:{server.server_address[1]}/bookings?date={{date}}"
+    try:
+        yield
+    finally:
+        pz.PARENTZONE_BOOKINGS_MONTH_URL = month_url
+        server.shutdown()
+        server.server_close()
+
+
+# ============= BENCHMARKS =============
+
+def _quietly(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def _best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def scenario_pages(children, sessions_per_child, months):
+    first_month = datetime(2026, 1, 1)
+    return [
+        build_calendar(pz.add_months(first_month, idx), children, sessions_per_child)
+        for idx in range(months)
+    ]
+
+
+def bench_extraction(pages, mode, latency, repeat):
+    """Extract every page with EXTRACTION_MODE = mode; returns (seconds, commands, bookings)"""
+    pz.EXTRACTION_MODE = mode
+    # The fake page is settled straight away, so don't let the poll interval
+    # of the settle wait swamp the extraction itself
+    pz.WAIT_POLL_SECONDS = 0.001
+
+    def run():
+        commands = 0
+        bookings = 0
+        for header_text, days in pages:
+            driver = FakeDriver(header_text, days, latency)
+            bookings += len(_quietly(pz.extract_bookings_from_page, driver))
+            commands += driver.commands
+        return commands, bookings
+
+    seconds, (commands, bookings) = _best_of(repeat, run)
+    return seconds, commands, bookings
+
+
+def bench_extraction_chrome(pages, mode, repeat):
+    """Extract every page with real headless Chrome loading the pages from disk
+    
+    Returns (seconds, None, bookings, Chrome startup seconds).
+    """
+    pz.EXTRACTION_MODE = mode
+    started = time.perf_counter()
+    driver = _quietly(pz.setup_driver, headless=True)
+    startup = time.perf_counter() - started
+    folder = tempfile.mkdtemp(prefix="pz_bench_")
+    try:
+        paths = []
+        for idx, (header_text, days) in enumerate(pages):
+            path = os.path.join(folder, f"month_{idx}.html")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(render_calendar_html(header_text, days))
+            paths.append(path)
+
+        def run():
+            bookings = 0
+            for path in paths:
+                driver.get("file:///" + os.path.abspath(path).replace(os.sep, '/'))
+                bookings += len(_quietly(pz.extract_bookings_from_page, driver))
+            return bookings
+
+        seconds, bookings = _best_of(repeat, run)
+        return seconds, None, bookings, startup
+    finally:
+        driver.quit()
+
+
+def bench_engine_selenium(pages, repeat):
+    """Load and read every month from the fixture server with one Selenium driver, in turn
+
+    Returns (seconds, bookings); Chrome startup is not included.
+    """
+    pz.EXTRACTION_MODE = "snapshot"
+    month_starts = [page_month_start(header_text) for header_text, _ in pages]
+    driver = _quietly(pz.setup_driver, headless=True)
+    try:
+        def run():
+            bookings = 0
+            for month_start in month_starts:
+                driver.get(pz.PARENTZONE_BOOKINGS_MONTH_URL.format(date=month_start.strftime('%Y-%m-%d')))
+                bookings += len(_quietly(pz.extract_bookings_from_page, driver))
+            return bookings
+
+        return _best_of(repeat, run)
+    finally:
+        driver.quit()
+
+
+def bench_engine_cdp(pages, repeat, concurrency):
+    """Load and read every month from the fixture server with the cdp engine, `concurrency` tabs at once
+
+    Returns (seconds, bookings); Chrome startup is not included.
+    """
+    month_starts = [page_month_start(header_text) for header_text, _ in pages]
+
+    async def scrape_all(browser):
+        bookings = []
+        await pz.cdp_scrape_months(browser, month_starts,
+                                   lambda month_idx, month_year, found, seconds, error: bookings.extend(found),
+                                   concurrency)
+        return len(bookings)
+
+    async def run_all():
+        browser = await pz.CdpBrowser.start()
+        try:
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                bookings = await scrape_all(browser)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            return best, bookings
+        finally:
+            await browser.close()
+
+    return _quietly(asyncio.run, run_all())
+
+
+def run_engine_benchmarks(repeat, concurrency):
+    """Selenium vs cdp engine on every scenario, each month served by a local fixture server"""
+    results = {}
+    pz.CHROME_DEBUGGER_ADDRESS = ""
+
+    print(f"\n🏁 Engines (fixture server, cdp engine {concurrency} tab(s) at a time)")
+    for children, sessions_per_child, months in SCENARIOS:
+        name = f"{children}c_{sessions_per_child}s_{months}m"
+        pages = scenario_pages(children, sessions_per_child, months)
+        print(f"▶ {name}")
+
+        with fixture_server(pages):
+            timings = {
+                'selenium': bench_engine_selenium(pages, repeat),
+                'cdp': bench_engine_cdp(pages, repeat, concurrency),
+            }
+
+        for engine, (seconds, bookings) in timings.items():
+            results[f"engine.{engine}.{name}"] = {'seconds': seconds, 'bookings': bookings}
+            print(f"   {engine:<9} {seconds * 1000:>9.2f} ms  {months / seconds:>7.1f} month(s)/s  {bookings} booking(s)")
+        if timings['selenium'][1] != timings['cdp'][1]:
+            print("   ⚠️ The engines found a different number of bookings")
+
+    return results
+
+
+def bench_merge(pages, repeat):
+    """Time build_month_bookings (date parsing + per-child merge) alone"""
+    parsed = [(pz.parse_month_header(header_text), days) for header_text, days in pages]
+
+    def run():
+        bookings = 0
+        for (month_abbrev, _, year), days in parsed:
+            bookings += len(pz.build_month_bookings(month_abbrev, year, days, verbose=False))
+        return bookings
+
+    return _best_of(repeat, run)
+
+
+def bench_ical(pages, repeat):
+    """Time write_ical for the bookings of every page"""
+    bookings = []
+    for header_text, days in pages:
+        month_abbrev, _, year = pz.parse_month_header(header_text)
+        bookings.extend(pz.build_month_bookings(month_abbrev, year, days, verbose=False))
+
+    def run():
+        buffer = io.StringIO()
+        pz.write_ical(buffer, "ParentZone benchmark", bookings)
+        return len(bookings)
+
+    return _best_of(repeat, run)
+
+
+def legacy_write_ical(f, calendar_name, bookings):
+    """The iCal generator before write_ical: a list of lines joined at the end
+
+    Kept as it was (strftime, datetime.now() per event, index-based UIDs, no
+    escaping or folding) so the two can be timed against each other.
+    """
+    ical_content = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//ParentZone Scraper//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{calendar_name}",
+        "X-WR-TIMEZONE:Europe/London",
+    ]
+
+    for idx, booking in enumerate(bookings):
+        date_str = booking.start.strftime('%Y%m%d')
+        uid = f"parentzone-{date_str}-{booking.booked_start.strftime('%H:%M').replace(':', '')}-{idx}@parentzone.me"
+
+        dtstart = booking.start.strftime('%Y%m%dT%H%M%S')
+        dtend = booking.end.strftime('%Y%m%dT%H%M%S')
+        dtstamp = datetime.now().strftime('%Y%m%dT%H%M%SZ')
+
+        ical_content.extend([
+            "BEGIN:VEVENT",
+            f"UID:{uid}",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART:{dtstart}",
+            f"DTEND:{dtend}",
+            f"SUMMARY:{booking.summary}",
+            f"DESCRIPTION:{booking.description}",
+            "STATUS:CONFIRMED",
+            "END:VEVENT"
+        ])
+
+    ical_content.append("END:VCALENDAR")
+    f.write('\n'.join(ical_content))
+
+
+def synthetic_bookings(count):
+    """count bookings, three children a weekday, spread over as many months as it takes"""
+    bookings = []
+    day = datetime(2026, 1, 1)
+    while len(bookings) < count:
+        if day.weekday() < 5:
+            for child_idx in range(3):
+                for start_hour in (8, 13):
+                    if len(bookings) < count:
+                        bookings.append(pz.Booking.from_session(
+                            f"Child {child_idx + 1}",
+                            day.replace(hour=start_hour), day.replace(hour=start_hour + 4, minute=30)
+                        ))
+        day += timedelta(days=1)
+    return bookings
+
+
+def bench_ical_generators(events, repeat):
+    """Time the old generator and write_ical on the same events, one calendar per month
+
+    Returns {'old': seconds, 'new': seconds}. Both write to StringIO, so only
+    building the text is timed, not the disk.
+    """
+    by_month = {}
+    for booking in synthetic_bookings(events):
+        by_month.setdefault((booking.start.year, booking.start.month), []).append(booking)
+
+    def run(generate):
+        def write_every_month():
+            for (year, month), bookings in by_month.items():
+                generate(io.StringIO(), f"ParentZone {year} {month:02d}", bookings)
+        return write_every_month
+
+    old_seconds, _ = _best_of(repeat, run(legacy_write_ical))
+    new_seconds, _ = _best_of(repeat, run(pz.write_ical))
+    return {'old': old_seconds, 'new': new_seconds}, len(by_month)
+
+
+def run_benchmarks(latency, repeat, use_chrome=False):
+    results = {}
+    modes = ("elements", "snapshot", "page_source")
+
+    for children, sessions_per_child, months in SCENARIOS:
+        name = f"{children}c_{sessions_per_child}s_{months}m"
+        pages = scenario_pages(children, sessions_per_child, months)
+        print(f"▶ {name}: {children} child(ren)/day, {sessions_per_child} session(s)/child, {months} month(s)")
+
+        for mode in modes:
+            if use_chrome:
+                seconds, commands, bookings, startup = bench_extraction_chrome(pages, mode, repeat)
+                previous = results.get(f"startup.{pz.BROWSER_PROFILE}", {}).get('seconds', startup)
+                results[f"startup.{pz.BROWSER_PROFILE}"] = {'seconds': min(previous, startup)}
+            else:
+                seconds, commands, bookings = bench_extraction(pages, mode, latency, repeat)
+            results[f"extract.{mode}.{name}"] = {'seconds': seconds, 'commands': commands, 'bookings': bookings}
+            command_text = f"{commands:>6} commands" if commands is not None else ""
+            print(f"   extract {mode:<12} {seconds * 1000:>9.2f} ms {command_text}  {bookings} booking(s)")
+
+        seconds, bookings = bench_merge(pages, repeat)
+        results[f"merge.{name}"] = {'seconds': seconds, 'bookings': bookings}
+        print(f"   merge                {seconds * 1000:>9.2f} ms")
+
+        seconds, bookings = bench_ical(pages, repeat)
+        results[f"ical.{name}"] = {'seconds': seconds, 'bookings': bookings}
+        print(f"   ical                 {seconds * 1000:>9.2f} ms")
+
+    for name, result in results.items():
+        if name.startswith("startup."):
+            print(f"\n🚀 Chrome startup ({name[8:]} profile): {result['seconds'] * 1000:.0f} ms")
+    return results
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """Print the change against the baseline; returns the names that regressed"""
+    regressions = []
+    print(f"\n📏 Against baseline (regression = more than {threshold:.0f}% slower, or more commands):")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+
+        change = (result['seconds'] / previous['seconds'] - 1) * 100 if previous['seconds'] else 0.0
+        slower = change > threshold
+        more_commands = (result.get('commands') is not None and previous.get('commands') is not None
+                         and result['commands'] > previous['commands'])
+
+        flag = "❌" if slower or more_commands else "  "
+        print(f" {flag} {name:<32} {change:>+7.1f}%")
+        if slower or more_commands:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ParentZone scraper")
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="simulated chromedriver round trip per command (default 2)")
+    parser.add_argument("--repeat", type=int, default=3, help="keep the best of this many runs")
+    parser.add_argument("--chrome", action="store_true",
+                        help="extract with real headless Chrome instead of the fake driver")
+    parser.add_argument("--browser-profile", choices=("lean", "full"), default=pz.BROWSER_PROFILE,
+                        help="BROWSER_PROFILE for --chrome runs, to compare startup and page times")
+    parser.add_argument("--engines", action="store_true",
+                        help="also scrape months from a local fixture server with Selenium and the cdp engine")
+    parser.add_argument("--cdp-concurrency", type=int, default=pz.CDP_CONCURRENCY,
+                        help=f"tabs the cdp engine loads at once for --engines (default {pz.CDP_CONCURRENCY})")
+    parser.add_argument("--ical-events", type=int, default=100000,
+                        help="events for the old vs new iCal generator comparison (default 100000, 0 = skip)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_FILE,
+                        help=f"baseline JSON to compare with (default {DEFAULT_BASELINE_FILE})")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=20.0,
+                        help="percent slower than baseline that counts as a regression (default 20)")
+    args = parser.parse_args()
+    pz.BROWSER_PROFILE = args.browser_profile
+
+    results = run_benchmarks(args.latency_ms / 1000.0, args.repeat, args.chrome)
+    if args.engines:
+        results.update(run_engine_benchmarks(args.repeat, args.cdp_concurrency))
+    if args.ical_events:
+        timings, months = bench_ical_generators(args.ical_events, args.repeat)
+        print(f"\n📆 iCal generators, {args.ical_events} events in {months} monthly calendar(s):")
+        for generator, seconds in timings.items():
+            results[f"ical_generator.{generator}.{args.ical_events}"] = {'seconds': seconds, 'bookings': args.ical_events}
+            print(f"   {generator:<4} {seconds * 1000:>9.2f} ms")
+        print(f"   write_ical is x{timings['old'] / timings['new']:.2f} the speed of the old generator")
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'latency_ms': None if args.chrome else args.latency_ms,
+        'browser_profile': args.browser_profile if args.chrome else None,
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if (baseline.get('latency_ms'), baseline.get('browser_profile')) != (report['latency_ms'], report['browser_profile']):
+            print("\n⚠️ Baseline was recorded with a different driver/latency, timings may not compare.")
+        regressions = compare_with_baseline(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s)")
+            return 1
+        print("\n✅ No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
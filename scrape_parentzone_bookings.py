@@ -3,12 +3,14 @@ ParentZone Calendar Scraper for Windows
 Generates separate iCal (.ics) files per month for import into Google Calendar
 
 Requirements:
-- Python 3.7+
+- Python 3.9+ (for zoneinfo and asyncio.to_thread)
 - Chrome browser installed
 - selenium package
+- tzdata package on Windows, for SCRAPE_ENGINE = "http" (Windows has no time zone data of its own)
 
 Install dependencies:
     pip install selenium
+    pip install tzdata      (Windows only)
 """
 
 from selenium import webdriver
@@ -17,16 +19,47 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from datetime import datetime, timedelta
+from selenium.common.exceptions import TimeoutException
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import urljoin, urlsplit
+from zoneinfo import ZoneInfo
+from contextlib import contextmanager
+import http.client
+import asyncio
+import base64
+import shutil
+import struct
+import tempfile
+import functools
+import subprocess
+import threading
+import hashlib
+import sqlite3
+import random
+import queue
+import json
+import io
+import gzip
 import time
 import re
 import os
+import sys
 
 # ============= CONFIGURATION =============
 PARENTZONE_USERNAME = "your_email@example.com"  # CHANGE THIS
 PARENTZONE_PASSWORD = "your_password"           # CHANGE THIS
 MONTHS_TO_SCRAPE = 3                            # How many months ahead to scrape
 
+# Or scrape any range of months, past ones included ("YYYY-MM", both needed).
+# Each month is opened directly instead of clicking 'next' from this month.
+SCRAPE_START_MONTH = ""                         # e.g. "2026-01"
+SCRAPE_END_MONTH = ""                           # e.g. "2026-06"
+
 # ============= APPOINTMENT CUSTOMIZATION =============
 # Choose how appointments appear in your calendar:
 
@@ -45,518 +78,4475 @@ REMINDER_DURATION_MINUTES = 30    # How long the reminder lasts (e.g., 30 = 30 m
 INCLUDE_TIME_IN_SUMMARY = True
 # ====================================================
 
+# ============= PERFORMANCE =============
+# How the calendar grid is read from the browser:
+# "snapshot" = one JavaScript call returns the whole month (fast, DEFAULT)
+# "page_source" = download the page HTML once and parse it in Python
+# "elements" = one WebDriver call per day cell / booking (slow, original method)
+EXTRACTION_MODE = "snapshot"
+
+# Save each month's page HTML here so it can be re-parsed later without a
+# browser (python scrape_parentzone_bookings.py --parse-saved pages/*.html)
+# Leave empty ("") to turn off.
+ARCHIVE_PAGES_FOLDER = ""
+
+# How many months to scrape at the same time (browser engine only).
+# 1 = one after another (DEFAULT). Above 1, extra headless browsers are
+# started that share your login, so keep this small (e.g. 3-4).
+PARALLEL_WORKERS = 1
+
+# Browser profile:
+# "lean" = headless, skips images, fonts, media and trackers, and doesn't wait
+#          for every last file of a page before carrying on (DEFAULT, fastest)
+# "full" = a visible Chrome window that loads everything, handy to watch it work
+BROWSER_PROFILE = "lean"
+PAGE_LOAD_STRATEGY = "eager"    # lean only: "eager" = once the HTML is parsed, "none" = straight away
+
+# Requests the lean profile blocks (* matches anything)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*intercom.io*", "*intercomcdn.com*",
+    "*segment.io*", "*sentry.io*", "*newrelic.com*", "*nr-data.net*",
+]
+
+# Reuse a Chrome that is already running instead of starting one every run.
+# Start Chrome yourself with --remote-debugging-port=9222 and its own
+# --user-data-dir, then set this to "127.0.0.1:9222". The script leaves that
+# browser running when it finishes. "" = start a fresh Chrome every run.
+CHROME_DEBUGGER_ADDRESS = ""
+
+# Browser pool: python scrape_parentzone_bookings.py --pool keeps
+# BROWSER_POOL_SIZE logged-in headless Chromes warm. Set BROWSER_POOL_URL
+# (e.g. "http://127.0.0.1:8766") and runs borrow one of those instead of
+# starting Chrome, then give it back. Pool stats: BROWSER_POOL_URL + "/stats"
+BROWSER_POOL_URL = ""
+BROWSER_POOL_PORT = 8766
+BROWSER_POOL_SIZE = 2
+BROWSER_POOL_FOLDER = "browser_pool"    # one Chrome profile per pool browser
+BROWSER_POOL_FIRST_DEBUG_PORT = 9301    # pool browsers use this port and up
+BROWSER_MAX_USES = 50                   # restart a browser after this many borrows...
+BROWSER_MAX_MEMORY_MB = 1500            # ...or once it uses this much memory
+BROWSER_POOL_WAIT_SECONDS = 30          # how long a run waits for a free browser
+BROWSER_LEASE_MAX_MINUTES = 30          # take back browsers that were never returned
+BROWSER_HEALTH_CHECK_SECONDS = 30
+
+# Remember the login between runs so repeat runs can skip it.
+# The file holds your login cookies, so keep it private. "" = don't save.
+SESSION_CACHE_FILE = "parentzone_session.json"
+SESSION_CACHE_HOURS = 12
+
+# Longest time (seconds) to wait for each step before giving up. Steps finish
+# as soon as the page is ready, so a fast connection never waits this long.
+WAIT_BUDGETS = {
+    'login': 20,            # login form submitted -> left the login page
+    'bookings_page': 20,    # bookings page opened -> calendar rendered
+    'month_change': 10,     # 'next' clicked -> new month rendered
+    'month_jump': 3,        # jumped to a month inside the page -> new month rendered
+    'calendar': 15,         # calendar ready before reading a month
+    'selectors': 5,         # bookings page opened -> header, days and buttons found
+}
+WAIT_POLL_SECONDS = 0.1
+
+# Only rewrite the .ics files for months whose bookings changed since the
+# last run. The fingerprints are kept in this file. "" = always rewrite everything.
+MONTH_STATE_FILE = "parentzone_state.json"
+
+# The ways of finding each part of the page that worked last time are kept
+# here and tried first next time. "" = always start from the first way.
+SELECTOR_CACHE_FILE = "parentzone_selectors.json"
+
+# Crash-safe runs: every month is saved here as soon as it is scraped, so a
+# run that is interrupted (or where some months fail) carries on next time
+# with only the months still missing. Deleted once every month is done.
+# The months are then worked out up front and each one is opened directly
+# (see goto_month), so clicking 'next' from the current month (iter_months)
+# only happens with "" = no checkpoint.
+CHECKPOINT_FILE = "parentzone_checkpoint.json"
+CHECKPOINT_MAX_HOURS = 12           # older checkpoints are ignored, bookings may have changed
+MONTH_RETRIES = 2                   # extra tries for a month that fails
+MONTH_RETRY_BACKOFF_SECONDS = 5     # wait before the first retry, doubled for each one after
+
+# Stop paging once this many months in a row are unchanged since the last run
+# (0 = always scrape every month). Later months keep their existing files.
+STOP_AFTER_UNCHANGED_MONTHS = 0
+
+# Daemon mode: keep running and re-scrape on a schedule, reusing the same
+# logged-in browser. Turn on here or run with --daemon. Stop with Ctrl+C.
+RUN_AS_DAEMON = False
+POLL_INTERVAL_MINUTES = 60
+POLL_JITTER_SECONDS = 120       # random +/- so polls don't land on the same second
+DAEMON_RETRY_SECONDS = 60       # wait after a failed poll before trying again
+
+# Keep every scraped booking in a small database so you can look back later:
+#   python scrape_parentzone_bookings.py --history 2026-07-01 2026-09-30
+#   python scrape_parentzone_bookings.py --export-history 2026-07-01 2026-09-30 [folder]
+# "" = don't keep history.
+HISTORY_DB_FILE = "parentzone_history.db"
+
+# Calendar feed server: python scrape_parentzone_bookings.py --serve
+# Runs the daemon and serves the calendars at http://SERVER_HOST:SERVER_PORT/calendar.ics
+# Use "0.0.0.0" as the host to reach it from other machines.
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_MAX_AGE_SECONDS = 900
+
+# Batch mode for several accounts: python scrape_parentzone_bookings.py --batch accounts.json
+# Each account's files go in its own folder under BATCH_OUTPUT_FOLDER.
+BATCH_WORKERS = 2               # accounts scraped at the same time
+BATCH_OUTPUT_FOLDER = "accounts"
+
+# After every run, write how long each step took (browser start, login,
+# reading months, next month, writing files) and the WebDriver commands it sent.
+# TRACE_FILE is JSON; METRICS_FILE is a Prometheus textfile (point it into
+# node_exporter's textfile collector folder to alert on slow scrapes).
+# "" = don't write.
+TRACE_FILE = "parentzone_trace.json"
+METRICS_FILE = "parentzone_metrics.prom"
+
+# How bookings are fetched:
+# "browser" = drive Chrome through the bookings page (DEFAULT)
+# "http" = no browser, call the JSON API the bookings page itself uses
+# "cdp" = drive Chrome directly over the DevTools Protocol, without chromedriver,
+#         loading CDP_CONCURRENCY months at once in separate tabs. Needs
+#         PARENTZONE_BOOKINGS_MONTH_URL to work.
+SCRAPE_ENGINE = "browser"
+CDP_CONCURRENCY = 4
+# Chrome for the "cdp" engine to start, "" = look in the usual places.
+# With CHROME_DEBUGGER_ADDRESS set it uses that browser instead.
+CHROME_BINARY = ""
+# ====================================================
+
 # URLs
 PARENTZONE_LOGIN_URL = "https://www.parentzone.me/login"
 PARENTZONE_BOOKINGS_URL = "https://www.parentzone.me/bookings"
+# A small page on the site to restore a saved session on. It mustn't match
+# BLOCKED_URL_PATTERNS, or Chrome shows its "blocked" error page instead.
+PARENTZONE_SESSION_SEED_URL = "https://www.parentzone.me/robots.txt"
+# Opens the bookings page on one month ({date} = its first day, YYYY-MM-DD).
+# If ParentZone ignores it, the script notices and clicks through months instead.
+PARENTZONE_BOOKINGS_MONTH_URL = "https://www.parentzone.me/bookings?date={date}"
+
+# API used by SCRAPE_ENGINE = "http". If ParentZone changes these, copy the new
+# ones from the Network tab of your browser's developer tools on the bookings page.
+# {start} and {end} are replaced with the first and last day of each month.
+# The login answers {"token": ...}; each month answers {"bookings": [{"childName",
+# "start", "end"}, ...]} with UTC times (see tests/fixtures for examples).
+PARENTZONE_API_URL = "https://api.parentzone.me"
+API_LOGIN_PATH = "/v1/auth/login"
+API_BOOKINGS_PATH = "/v1/bookings?dateFrom={start}&dateTo={end}"
+# The nursery's time zone: API times are converted to it, and the calendars use it.
+# On Windows the "http" engine needs: pip install tzdata
+PARENTZONE_TIMEZONE = "Europe/London"
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+# Calendar selectors (ParentZone uses MUI / emotion class names)
+HEADER_SELECTOR = "h6.MuiTypography-root.MuiTypography-h6.MuiTypography-noWrap.css-1dw86cl-titleWithButtons"
+DAY_SELECTOR = "div.css-1btmizi-day.css-1eqmmqv-dayDesktop.css-1ke78x2-dayBorder"
+DATE_SELECTOR = "p.MuiTypography-root.MuiTypography-body2.css-68o8xu"
+BOOKING_SELECTOR = "div.css-jvibwz-buttonContainer"
+CHILD_NAME_SELECTOR = "span.css-cypr81-childName"
+SESSION_TIME_SELECTOR = "span.css-11fzqss-sessionTime"
+
+# Every way of finding each part of the page, best first. The css-xxxx parts of
+# ParentZone's class names change whenever they update the site, so the later
+# ways match on the parts of the names that stay the same. Calendar parts must
+# stay in the simple form tag.class[class*='text'] so saved pages can be read too.
+SELECTOR_STRATEGIES = {
+    'header': [HEADER_SELECTOR, "h6[class*='-titleWithButtons']", "h6.MuiTypography-h6.MuiTypography-noWrap"],
+    'day': [DAY_SELECTOR, "div[class*='-dayDesktop']", "div[class*='-dayBorder']"],
+    'date': [DATE_SELECTOR, "p.MuiTypography-body2"],
+    'booking': [BOOKING_SELECTOR, "div[class*='-buttonContainer']"],
+    'child': [CHILD_NAME_SELECTOR, "span[class*='-childName']"],
+    'session': [SESSION_TIME_SELECTOR, "span[class*='-sessionTime']"],
+    'next_button': [
+        'button[data-test-id="next_btn"]',
+        'button:has(> svg[data-testid="ChevronRightIcon"])',
+        "button.MuiButtonBase-root.MuiIconButton-root.MuiIconButton-sizeSmall.css-1j7qk7u",
+    ],
+    'previous_button': [
+        'button[data-test-id="prev_btn"]',
+        'button:has(> svg[data-testid="ChevronLeftIcon"])',
+    ],
+}
+
+# Page parts a bookings page can't be read without (a month with no bookings
+# has no booking, child or session elements, so those can't be checked)
+REQUIRED_SELECTORS = ('header', 'day', 'date', 'next_button')
+
+# The way currently used for each part (see probe_selectors)
+SELECTORS = {name: strategies[0] for name, strategies in SELECTOR_STRATEGIES.items()}
+
+MONTH_MAP = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+TIME_RANGE_RE = re.compile(r'(\d{1,2}:\d{2})\s*-\s*(\d{1,2}:\d{2})')
+
+# Cheap probe of what the calendar is showing, used to tell when it has
+# finished rendering: [header text, day cells, first date, last date, bookings]
+# It goes by the calendar itself rather than document.readyState, which
+# doesn't reach 'complete' until every file has loaded (see PAGE_LOAD_STRATEGY).
+# Each argument is a list of selectors, the first one that matches is used.
+CALENDAR_STATE_JS = """
+const all = selectors => {
+    for (const selector of selectors) {
+        const found = document.querySelectorAll(selector);
+        if (found.length) {
+            return found;
+        }
+    }
+    return [];
+};
+const header = all(arguments[0])[0];
+const days = all(arguments[1]);
+if (!header || !days.length) {
+    return null;
+}
+return [
+    header.innerText,
+    days.length,
+    days[0].innerText.split('\\n')[0],
+    days[days.length - 1].innerText.split('\\n')[0],
+    all(arguments[2]).length
+];
+"""
+
+# Which of the ways of finding each page part matches anything: {name: index or -1}
+SELECTOR_PROBE_JS = """
+const found = {};
+for (const [name, selectors] of Object.entries(arguments[0])) {
+    found[name] = selectors.findIndex(selector => {
+        try {
+            return document.querySelector(selector) !== null;
+        } catch (e) {
+            return false;
+        }
+    });
+}
+return found;
+"""
+
+# Reads the whole calendar grid in a single round trip to chromedriver.
+# Returns {header: "...", days: [[date_text, [[child_name, session_time], ...]], ...]}
+CALENDAR_SNAPSHOT_JS = """
+const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText : null;
+};
+const days = [];
+document.querySelectorAll(arguments[1]).forEach(day => {
+    if (!day.querySelector(arguments[2])) {
+        return;
+    }
+    const rows = [];
+    day.querySelectorAll(arguments[3]).forEach(container => {
+        rows.push([text(container, arguments[4]), text(container, arguments[5])]);
+    });
+    days.push([text(day, arguments[2]), rows]);
+});
+return {header: text(document, arguments[0]), days: days};
+"""
+
+
+WAIT_TIMINGS = {}
+PAGE_TIMINGS = []
+
+
+def wait_for(driver, phase, condition):
+    """Wait until condition(driver) is truthy, within the time budget for phase
+    
+    Raises TimeoutException once the budget runs out. The time actually spent
+    waiting is recorded in WAIT_TIMINGS either way.
+    """
+    started = time.perf_counter()
+    try:
+        return WebDriverWait(driver, WAIT_BUDGETS[phase], poll_frequency=WAIT_POLL_SECONDS).until(condition)
+    finally:
+        WAIT_TIMINGS.setdefault(phase, []).append(time.perf_counter() - started)
+
+
+class CalendarSettled:
+    """Wait condition: the calendar is rendered and has stopped changing
+    
+    Ready once two polls in a row see the same header, day cells and booking
+    count. With previous_header set, the header must also differ from it
+    (i.e. the month has changed).
+    """
+    
+    def __init__(self, previous_header=None):
+        self.previous_header = previous_header
+        self.last_state = None
+    
+    def __call__(self, driver):
+        state = driver.execute_script(
+            CALENDAR_STATE_JS,
+            selector_candidates('header'), selector_candidates('day'), selector_candidates('booking')
+        )
+        
+        if not state or (self.previous_header is not None and state[0].strip() == self.previous_header):
+            self.last_state = None
+            return False
+        
+        settled = state == self.last_state
+        self.last_state = state
+        return state if settled else False
+
+
+def selector_candidates(name):
+    """The ways of finding a page part, the one in use first"""
+    active = SELECTORS[name]
+    return [active] + [selector for selector in SELECTOR_STRATEGIES[name] if selector != active]
+
+
+def load_selector_cache(cache_file=None):
+    """Start from the ways of finding each page part that worked last time"""
+    cache_file = SELECTOR_CACHE_FILE if cache_file is None else cache_file
+    if not cache_file or not os.path.exists(cache_file):
+        return
+    
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return
+    
+    for name, selector in cached.items():
+        if selector in SELECTOR_STRATEGIES.get(name, ()):
+            SELECTORS[name] = selector
+
+
+def save_selector_cache(cache_file=None):
+    cache_file = SELECTOR_CACHE_FILE if cache_file is None else cache_file
+    if not cache_file:
+        return
+    
+    temp_file = cache_file + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(SELECTORS, f, indent=2)
+    os.replace(temp_file, cache_file)
+
+
+def use_selector(name, selector):
+    """Switch a page part to another way of finding it, and remember that for next time"""
+    if SELECTORS[name] == selector:
+        return
+    print(f"  🔧 Finding the {name.replace('_', ' ')} with {selector} from now on")
+    SELECTORS[name] = selector
+    save_selector_cache()
+
+
+class SelectorsBroken(Exception):
+    """None of the ways of finding some page part match, ParentZone has changed its page"""
+
+
+def probe_selectors(driver, wait=True):
+    """Check every page part can be found on the page just opened, before waiting for the calendar
+    
+    Polls (one round trip each) until the required parts show up or the site
+    sends us to the login page, within WAIT_BUDGETS['selectors'] (or looks
+    just once with wait=False). Picks the first way that matches for each part
+    (trying the one that worked last time first).
+    
+    Returns 'login', 'calendar', or 'loading' if none of the required parts
+    are there yet (the page may only be slow). Raises SelectorsBroken only once
+    the page has clearly rendered, i.e. some required parts are found but not
+    others, rather than letting the calendar waits time out.
+    """
+    candidates = {name: selector_candidates(name) for name in SELECTOR_STRATEGIES}
+    found = {}
+    
+    def parts_or_login(driver):
+        if 'login' in driver.current_url:
+            return 'login'
+        found.clear()
+        found.update(driver.execute_script(SELECTOR_PROBE_JS, candidates) or {})
+        return 'calendar' if all(found.get(name, -1) >= 0 for name in REQUIRED_SELECTORS) else False
+    
+    try:
+        outcome = wait_for(driver, 'selectors', parts_or_login) if wait else parts_or_login(driver)
+    except TimeoutException:
+        outcome = False
+    
+    if outcome == 'login':
+        return 'login'
+    if not outcome and not any(found.get(name, -1) >= 0 for name in REQUIRED_SELECTORS):
+        return 'loading'
+    apply_selector_probe(candidates, found)
+    return 'calendar'
+
+
+def wait_for_bookings_page(driver):
+    """Wait for the bookings page just opened: probe its parts, then let the calendar settle
+    
+    A page that is only slow gets the whole WAIT_BUDGETS['bookings_page'] and
+    is probed again after it. Returns 'login' if ParentZone sent us to the
+    login page instead (even late), otherwise 'calendar'. Raises
+    TimeoutException if the calendar didn't settle in time, and
+    SelectorsBroken (see probe_selectors).
+    """
+    outcome = probe_selectors(driver)
+    if outcome == 'login':
+        return 'login'
+    
+    timed_out = None
+    try:
+        wait_for(driver, 'bookings_page', CalendarSettled())
+    except TimeoutException as e:
+        timed_out = e
+    
+    if outcome == 'loading' and probe_selectors(driver, wait=False) == 'login':
+        return 'login'
+    if timed_out:
+        raise timed_out
+    return 'calendar'
+
+
+def apply_selector_probe(candidates, found):
+    """Use what SELECTOR_PROBE_JS found for the candidates, see probe_selectors"""
+    broken = []
+    for name, selectors in candidates.items():
+        index = found.get(name, -1)
+        if index >= 0:
+            use_selector(name, selectors[index])
+        elif name in REQUIRED_SELECTORS:
+            broken.append(name)
+    
+    if broken:
+        raise SelectorsBroken(
+            "ParentZone's page has changed, can't find: " +
+            "; ".join(f"{name} (tried {', '.join(candidates[name])})" for name in broken) +
+            ". Add a selector that works to SELECTOR_STRATEGIES."
+        )
+
+
+def find_page_element(driver, name):
+    """Find a page part, trying its other ways if the one in use has stopped working"""
+    for selector in selector_candidates(name):
+        try:
+            element = driver.find_element(By.CSS_SELECTOR, selector)
+        except Exception:
+            continue
+        use_selector(name, selector)
+        return element
+    return None
+
+
+def report_wait_timings():
+    """Print how long each step actually waited for the page"""
+    if not WAIT_TIMINGS:
+        return
+    
+    print("\n⏱️ Time spent waiting for the page:")
+    for phase, timings in WAIT_TIMINGS.items():
+        print(f"   {phase}: {sum(timings):.2f}s over {len(timings)} wait(s) "
+              f"(longest {max(timings):.2f}s, budget {WAIT_BUDGETS[phase]}s)")
+
+
+class RunTrace:
+    """Timed spans for one run, with the WebDriver commands and bytes sent in each
+    
+    Spans can nest (the run's phases inside each other); a command is counted
+    against the innermost span open on its thread, or 'other' outside any span.
+    Likewise each span's self_seconds leaves out the time spent in spans nested
+    inside it, so adding up the phases doesn't count anything twice.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+    
+    def reset(self):
+        with self.lock:
+            self.started_at = time.time()
+            self.started = time.perf_counter()
+            self.spans = []
+            self.loose = {'commands': 0, 'bytes_sent': 0, 'bytes_received': 0}
+    
+    @contextmanager
+    def span(self, phase):
+        stack = self.local.__dict__.setdefault('stack', [])
+        record = {
+            'phase': phase,
+            'parent': stack[-1]['phase'] if stack else None,
+            'start': time.perf_counter() - self.started,
+            'seconds': 0.0,
+            'self_seconds': 0.0,
+            'commands': 0,
+            'bytes_sent': 0,
+            'bytes_received': 0,
+            'ok': False,
+        }
+        stack.append(record)
+        try:
+            yield record
+            record['ok'] = True
+        finally:
+            stack.pop()
+            record['seconds'] = time.perf_counter() - self.started - record['start']
+            record['self_seconds'] += record['seconds']
+            if stack:
+                stack[-1]['self_seconds'] -= record['seconds']
+            with self.lock:
+                self.spans.append(record)
+    
+    def count_command(self, bytes_sent, bytes_received):
+        stack = self.local.__dict__.get('stack')
+        target = stack[-1] if stack else self.loose
+        with self.lock:
+            target['commands'] += 1
+            target['bytes_sent'] += bytes_sent
+            target['bytes_received'] += bytes_received
+    
+    def phase_totals(self):
+        """{phase: {calls, failed, seconds, commands, bytes_sent, bytes_received}}
+        
+        seconds is the phase's own time, without the phases nested inside it.
+        """
+        totals = {}
+        with self.lock:
+            spans = list(self.spans)
+            loose = dict(self.loose)
+        
+        for record in spans:
+            phase = totals.setdefault(record['phase'], {
+                'calls': 0, 'failed': 0, 'seconds': 0.0,
+                'commands': 0, 'bytes_sent': 0, 'bytes_received': 0,
+            })
+            phase['calls'] += 1
+            phase['failed'] += 0 if record['ok'] else 1
+            phase['seconds'] += record['self_seconds']
+            for key in ('commands', 'bytes_sent', 'bytes_received'):
+                phase[key] += record[key]
+        
+        if loose['commands']:
+            totals['other'] = dict(loose, calls=0, failed=0, seconds=0.0)
+        return totals
+
+
+TRACE = RunTrace()
+
+
+def traced(phase):
+    """Decorator: record every call of the function as a span of the run trace"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with TRACE.span(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _json_size(value):
+    return len(json.dumps(value, default=str)) if value is not None else 0
+
+
+def count_driver_commands(driver):
+    """Count every WebDriver command the driver sends (and roughly its JSON size) in TRACE"""
+    execute = driver.execute
+    
+    def counted_execute(driver_command, params=None):
+        response = None
+        try:
+            response = execute(driver_command, params)
+            return response
+        finally:
+            received = _json_size(response.get('value')) if response else 0
+            TRACE.count_command(_json_size(params), received)
+    
+    driver.execute = counted_execute
+    return driver
+
+
+def _atomic_write_text(path, text):
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def prometheus_metrics(totals, run_seconds, ok, bookings=None):
+    """Render the phase totals in the Prometheus text exposition format"""
+    lines = []
+    
+    def metric(name, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+    
+    metric("parentzone_run_seconds", "Duration of the last scrape run",
+           [({}, f"{run_seconds:.3f}")])
+    metric("parentzone_run_success", "1 if the last scrape run finished without errors",
+           [({}, 1 if ok else 0)])
+    metric("parentzone_last_run_timestamp_seconds", "When the last scrape run finished",
+           [({}, f"{time.time():.0f}")])
+    if bookings is not None:
+        metric("parentzone_bookings", "Bookings found in the last scrape run", [({}, bookings)])
+    
+    metric("parentzone_phase_seconds", "Time spent in each phase of the last run, not counting phases nested inside it",
+           [({'phase': phase}, f"{t['seconds']:.3f}") for phase, t in totals.items()])
+    metric("parentzone_phase_calls", "Times each phase ran in the last run",
+           [({'phase': phase}, t['calls']) for phase, t in totals.items()])
+    metric("parentzone_phase_failures", "Times each phase raised an error in the last run",
+           [({'phase': phase}, t['failed']) for phase, t in totals.items()])
+    metric("parentzone_webdriver_commands", "WebDriver commands sent in each phase of the last run",
+           [({'phase': phase}, t['commands']) for phase, t in totals.items()])
+    metric("parentzone_webdriver_bytes", "Approximate WebDriver JSON bytes per phase of the last run",
+           [({'phase': phase, 'direction': direction}, t[f'bytes_{direction}'])
+            for phase, t in totals.items() for direction in ('sent', 'received')])
+    metric("parentzone_wait_seconds", "Time spent waiting for the page at each step of the last run",
+           [({'step': step}, f"{sum(timings):.3f}") for step, timings in WAIT_TIMINGS.items()])
+    
+    return '\n'.join(lines) + '\n'
 
 
-def setup_driver():
-    """Configure Chrome driver with options for visibility"""
+def write_run_trace(ok=True, bookings=None, trace_file=None, metrics_file=None):
+    """Print where the run's time went and write TRACE_FILE / METRICS_FILE"""
+    trace_file = TRACE_FILE if trace_file is None else trace_file
+    metrics_file = METRICS_FILE if metrics_file is None else metrics_file
+    run_seconds = time.perf_counter() - TRACE.started
+    totals = TRACE.phase_totals()
+    
+    if totals:
+        print("\n⏱️ Where the time went:")
+        for phase, t in sorted(totals.items(), key=lambda item: -item[1]['seconds']):
+            print(f"   {phase}: {t['seconds']:.2f}s over {t['calls']} call(s), "
+                  f"{t['commands']} WebDriver command(s), {t['bytes_received'] / 1024:.0f} KB received")
+    
+    try:
+        if trace_file:
+            with TRACE.lock:
+                spans = [dict(record, start=round(record['start'], 4), seconds=round(record['seconds'], 4),
+                              self_seconds=round(record['self_seconds'], 4))
+                         for record in sorted(TRACE.spans, key=lambda record: record['start'])]
+            _atomic_write_text(trace_file, json.dumps({
+                'started': datetime.fromtimestamp(TRACE.started_at).isoformat(timespec='seconds'),
+                'seconds': round(run_seconds, 3),
+                'ok': ok,
+                'bookings': bookings,
+                'phases': {phase: dict(t, seconds=round(t['seconds'], 4)) for phase, t in totals.items()},
+                'waits': {step: [round(t, 3) for t in timings] for step, timings in WAIT_TIMINGS.items()},
+                'pages': PAGE_TIMINGS,
+                'spans': spans,
+            }, indent=2))
+        if metrics_file:
+            _atomic_write_text(metrics_file, prometheus_metrics(totals, run_seconds, ok, bookings))
+    except OSError as e:
+        print(f"⚠️ Couldn't write the run trace: {e}")
+
+
+# Chrome switches for the lean profile: nothing running that the scrape doesn't need
+LEAN_CHROME_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+]
+
+# How the page itself loaded: [DOM ready ms, fully loaded ms, requests made]
+PAGE_TIMING_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav) {
+    return null;
+}
+return [nav.domContentLoadedEventEnd, nav.loadEventEnd, performance.getEntriesByType('resource').length];
+"""
+
+
+@traced('setup_driver')
+def setup_driver(headless=None, profile_dir=None, debugging_port=None):
+    """Configure Chrome driver for BROWSER_PROFILE
+    
+    headless defaults to True for the lean profile and False for the full one.
+    With debugging_port, other scripts can attach to the browser on that port.
+    """
+    lean = BROWSER_PROFILE == "lean"
+    if headless is None:
+        headless = lean
+    
+    chrome_options = Options()
+    
+    # A separate profile folder keeps cookies apart when running several accounts
+    if profile_dir:
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    
+    # Set BROWSER_PROFILE = "full" if you want to SEE the browser working
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    
+    if debugging_port:
+        chrome_options.add_argument(f"--remote-debugging-port={debugging_port}")
+    
+    # Keep the desktop size even when headless, the calendar selectors are for the desktop layout
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    
+    if lean:
+        for argument in LEAN_CHROME_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
+    
+    started = time.perf_counter()
+    driver = count_driver_commands(webdriver.Chrome(options=chrome_options))
+    if lean:
+        apply_request_blocking(driver)
+    
+    print(f"🚀 Chrome started in {time.perf_counter() - started:.2f}s "
+          f"({BROWSER_PROFILE} profile{', headless' if headless else ''})")
+    return driver
+
+
+def apply_request_blocking(driver):
+    """Block BLOCKED_URL_PATTERNS in the driver's current tab"""
+    if not BLOCKED_URL_PATTERNS:
+        return
+    
+    # Blocked requests fail straight away inside Chrome, they never reach the network
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"⚠️ Couldn't turn on request blocking: {e}")
+
+
+@traced('setup_driver')
+def attach_driver(debugger_address):
+    """Take control of a Chrome that is already running with --remote-debugging-port
+    
+    Quitting this driver only stops chromedriver; the browser keeps running.
+    """
     chrome_options = Options()
+    chrome_options.debugger_address = debugger_address
+    
+    started = time.perf_counter()
+    driver = count_driver_commands(webdriver.Chrome(options=chrome_options))
+    driver.parentzone_attached = True
+    if BROWSER_PROFILE == "lean":
+        apply_request_blocking(driver)
+    
+    print(f"🔗 Attached to Chrome at {debugger_address} in {time.perf_counter() - started:.2f}s")
+    return driver
+
+
+def _pool_request(method, path, timeout):
+    """Call the browser pool supervisor at BROWSER_POOL_URL; returns (status, JSON body)"""
+    url = urlsplit(BROWSER_POOL_URL)
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+    try:
+        connection.request(method, path, headers={'Content-Length': '0'})
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, json.loads(body) if body else None
+    finally:
+        connection.close()
+
+
+def borrow_pool_browser():
+    """Borrow a warm browser from the pool; returns its lease, or None if none is free"""
+    try:
+        status, lease = _pool_request('POST', '/borrow', BROWSER_POOL_WAIT_SECONDS + 10)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Browser pool not reachable at {BROWSER_POOL_URL}: {e}")
+        return None
+    return lease if status == 200 else None
+
+
+def return_pool_browser(lease_id, healthy=True):
+    """Give a borrowed browser back to the pool (unhealthy ones get restarted)"""
+    try:
+        _pool_request('POST', f"/return?id={lease_id}&healthy={1 if healthy else 0}", 10)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Couldn't give the browser back to the pool: {e}")
+
+
+def acquire_driver(headless=None, attach=True):
+    """Get a browser for this run: borrowed from the pool, attached, or freshly started
+    
+    With attach=False CHROME_DEBUGGER_ADDRESS is ignored, for extra browsers
+    that must not share the one running Chrome (each pool lease is its own).
+    """
+    if BROWSER_POOL_URL:
+        lease = borrow_pool_browser()
+        if lease:
+            try:
+                driver = attach_driver(lease['debugger_address'])
+                driver.parentzone_lease = lease['id']
+                print(f"🏊 Borrowed pool browser #{lease['id']} (used {lease['uses']} time(s) before)")
+                return driver
+            except Exception as e:
+                print(f"⚠️ Couldn't attach to the pool browser: {e}")
+                return_pool_browser(lease['id'], healthy=False)
+        print("⚠️ No pool browser free, starting one of our own...")
+    
+    elif CHROME_DEBUGGER_ADDRESS and attach:
+        try:
+            return attach_driver(CHROME_DEBUGGER_ADDRESS)
+        except Exception as e:
+            print(f"⚠️ Couldn't attach to Chrome at {CHROME_DEBUGGER_ADDRESS}: {e}")
+            print("   Starting a new browser instead...")
+    
+    return setup_driver(headless)
+
+
+def release_driver(driver, healthy=True):
+    """Finish with a browser from acquire_driver
+    
+    Started browsers are closed. Attached and borrowed ones stay running (only
+    chromedriver stops), and borrowed ones go back to the pool.
+    """
+    lease_id = getattr(driver, 'parentzone_lease', None)
+    try:
+        driver.quit()
+    except Exception:
+        healthy = False
+    finally:
+        if lease_id is not None:
+            return_pool_browser(lease_id, healthy)
+
+
+def record_page_timing(driver, page):
+    """Note how long page took to load (from the browser's own timings) for the report"""
+    try:
+        timing = driver.execute_script(PAGE_TIMING_JS)
+    except Exception:
+        timing = None
+    if not timing:
+        return
+    
+    dom_ready_ms, loaded_ms, requests = timing
+    PAGE_TIMINGS.append({
+        'page': page,
+        'profile': BROWSER_PROFILE,
+        'dom_ready': round(dom_ready_ms / 1000, 3),
+        # 0 = still loading (the lean profile doesn't wait for it)
+        'loaded': round(loaded_ms / 1000, 3) if loaded_ms else None,
+        'requests': requests,
+    })
+
+
+def report_page_timings():
+    """Print how quickly each page became usable"""
+    if not PAGE_TIMINGS:
+        return
+    
+    print(f"\n📊 Page load ({BROWSER_PROFILE} profile):")
+    for timing in PAGE_TIMINGS:
+        loaded = f"{timing['loaded']:.2f}s" if timing['loaded'] else "not waited for"
+        print(f"   {timing['page']}: ready in {timing['dom_ready']:.2f}s, "
+              f"fully loaded {loaded}, {timing['requests']} request(s)")
+
+
+@traced('login')
+def login_to_parentzone(driver, username, password):
+    """Log into ParentZone"""
+    print("🔐 Logging into ParentZone...")
+    driver.get(PARENTZONE_LOGIN_URL)
+    
+    try:
+        email_field = wait_for(driver, 'login', EC.presence_of_element_located((By.NAME, "email")))
+        email_field.clear()
+        email_field.send_keys(username)
+        
+        password_field = driver.find_element(By.NAME, "password")
+        password_field.clear()
+        password_field.send_keys(password)
+        
+        login_button = driver.find_element(By.XPATH, "//button[@type='submit']")
+        login_button.click()
+        
+        wait_for(driver, 'login', lambda d: 'login' not in d.current_url.lower())
+        record_page_timing(driver, 'login')
+        print("✅ Login successful!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Login failed: {e}")
+        return False
+
+
+def export_session_state(driver):
+    """Copy the logged-in cookies and local storage out of a driver"""
+    return {
+        'cookies': driver.get_cookies(),
+        'local_storage': driver.execute_script("return Object.assign({}, window.localStorage);"),
+    }
+
+
+def restore_session_state(driver, state):
+    """Load cookies and local storage from export_session_state into a driver
+    
+    The driver has to be on the ParentZone site before cookies can be set, so
+    this opens a lightweight page there first.
+    """
+    driver.get(PARENTZONE_SESSION_SEED_URL)
+    
+    for cookie in state['cookies']:
+        cookie = {k: v for k, v in cookie.items()
+                  if k in ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry')}
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            print(f"  ⚠️ Could not restore cookie {cookie.get('name')}: {e}")
+    
+    driver.execute_script(
+        "for (const [k, v] of Object.entries(arguments[0])) { window.localStorage.setItem(k, v); }",
+        state['local_storage']
+    )
+
+
+def save_session_cache(driver, cache_file=None):
+    """Save the logged-in session to disk so the next run can skip the login"""
+    cache_file = cache_file or SESSION_CACHE_FILE
+    if not cache_file:
+        return
+    write_session_cache(export_session_state(driver), cache_file)
+
+
+def write_session_cache(state, cache_file):
+    """Write an export_session_state()-style session to cache_file"""
+    state['expires_at'] = time.time() + SESSION_CACHE_HOURS * 3600
+    
+    try:
+        temp_file = cache_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.chmod(temp_file, 0o600)
+        os.replace(temp_file, cache_file)
+        print(f"💾 Saved session for {SESSION_CACHE_HOURS}h")
+    except OSError as e:
+        print(f"⚠️ Could not save session cache: {e}")
+
+
+def load_session_cache(cache_file=None):
+    """Load a saved session, or None if there isn't one or it has expired"""
+    cache_file = cache_file or SESSION_CACHE_FILE
+    if not cache_file or not os.path.exists(cache_file):
+        return None
+    
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if state.get('expires_at', 0) <= time.time():
+        clear_session_cache(cache_file)
+        return None
+    return state
+
+
+def clear_session_cache(cache_file=None):
+    """Forget the saved session"""
+    cache_file = cache_file or SESSION_CACHE_FILE
+    if cache_file and os.path.exists(cache_file):
+        os.remove(cache_file)
+
+
+def resume_cached_session(driver, cache_file=None):
+    """Open the bookings page using the saved session instead of logging in
+    
+    Returns True when the calendar loads with the saved session (or is just
+    slow to). Only if the site rejects it by sending us back to the login
+    page is the cache cleared and False returned, so the caller can log in.
+    """
+    state = load_session_cache(cache_file)
+    if not state:
+        return False
+    
+    print("♻️ Trying saved session...")
+    restore_session_state(driver, state)
+    driver.get(PARENTZONE_BOOKINGS_URL)
+    
+    try:
+        # Broken selectors raise here, before anything decides the session was rejected
+        outcome = wait_for_bookings_page(driver)
+    except TimeoutException:
+        # Still loading is not a rejection, the session is kept
+        print(f"⚠️ Bookings page still loading after {WAIT_BUDGETS['bookings_page']}s, carrying on...")
+        return True
+    
+    if outcome == 'login':
+        print("⚠️ Saved session was rejected, logging in again")
+        clear_session_cache(cache_file)
+        driver.delete_all_cookies()
+        return False
+    
+    print("✅ Saved session accepted, skipped login")
+    return True
+
+
+def format_hour_12h(hour):
+    """Format an hour of the day as e.g. 9am / 12pm"""
+    if hour == 0:
+        return "12am"
+    elif hour < 12:
+        return f"{hour}am"
+    elif hour == 12:
+        return "12pm"
+    else:
+        return f"{hour - 12}pm"
+
+
+def parse_month_header(header_text):
+    """Parse the 'Bookings - Mon YYYY' header into (month_abbrev, month, year)"""
+    month_year_str = header_text.strip().replace('Bookings - ', '').strip()
+    
+    parts = month_year_str.split(' ')
+    if len(parts) != 2:
+        print(f"⚠️ Could not parse month/year: {month_year_str}")
+        return None
+    
+    month_abbrev = parts[0]
+    year_str = parts[1]
+    
+    current_month = MONTH_MAP.get(month_abbrev)
+    current_year = int(year_str)
+    
+    if not current_month:
+        print(f"⚠️ Invalid month abbreviation: {month_abbrev}")
+        return None
+    
+    return month_abbrev, current_month, current_year
+
+
+class Booking:
+    """One calendar event: a child's (merged) session on one day
+    
+    start/end are the event times (the reminder slot when USE_ACTUAL_TIMES is
+    off), booked_start/booked_end the actual session. Slotted and immutable to
+    keep long scrapes small; summary and description are only built the first
+    time they are used.
+    """
+    
+    __slots__ = ('child_name', 'start', 'end', 'booked_start', 'booked_end', '_summary', '_description')
+    
+    def __init__(self, child_name, start, end, booked_start=None, booked_end=None):
+        init = object.__setattr__
+        init(self, 'child_name', child_name)
+        init(self, 'start', start)
+        init(self, 'end', end)
+        init(self, 'booked_start', booked_start or start)
+        init(self, 'booked_end', booked_end or end)
+        init(self, '_summary', None)
+        init(self, '_description', None)
+    
+    @classmethod
+    def from_session(cls, child_name, booked_start, booked_end):
+        """Build the calendar event for a booked session, honouring USE_ACTUAL_TIMES"""
+        if USE_ACTUAL_TIMES:
+            return cls(child_name, booked_start, booked_end)
+        
+        reminder_hour, reminder_minute = map(int, REMINDER_TIME.split(':'))
+        event_start = booked_start.replace(hour=reminder_hour, minute=reminder_minute)
+        event_end = event_start + timedelta(minutes=REMINDER_DURATION_MINUTES)
+        return cls(child_name, event_start, event_end, booked_start, booked_end)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Booking is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Booking is immutable")
+    
+    def __reduce__(self):
+        return (Booking, (self.child_name, self.start, self.end, self.booked_start, self.booked_end))
+    
+    def _key(self):
+        return (self.child_name, self.start, self.end, self.booked_start, self.booked_end)
+    
+    def __eq__(self, other):
+        return isinstance(other, Booking) and self._key() == other._key()
+    
+    def __hash__(self):
+        return hash(self._key())
+    
+    def __repr__(self):
+        return f"Booking({self.child_name!r}, {self.booked_start:%Y-%m-%d %H:%M}-{self.booked_end:%H:%M})"
+    
+    @property
+    def original_start(self):
+        return f"{self.booked_start.hour:02d}:{self.booked_start.minute:02d}"
+    
+    @property
+    def original_end(self):
+        return f"{self.booked_end.hour:02d}:{self.booked_end.minute:02d}"
+    
+    @property
+    def summary(self):
+        if self._summary is None:
+            if INCLUDE_TIME_IN_SUMMARY:
+                time_str = f"{format_hour_12h(self.booked_start.hour)}-{format_hour_12h(self.booked_end.hour)}"
+                summary = f"{self.child_name} {time_str}"
+            else:
+                summary = self.child_name
+            object.__setattr__(self, '_summary', summary)
+        return self._summary
+    
+    @property
+    def description(self):
+        if self._description is None:
+            description = f'ParentZone booking: {self.child_name} ({self.original_start}-{self.original_end})'
+            object.__setattr__(self, '_description', description)
+        return self._description
+
+
+def merge_day_bookings(sessions, verbose=True):
+    """Merge one day's booked sessions into Booking events
+    
+    sessions is a list of (child_name, start, end) tuples. Each child's sessions
+    are merged separately, so back-to-back or overlapping sessions join up even
+    when another child's sessions fall in between. One sort, one pass.
+    """
+    bookings = []
+    current_child = None
+    combined_start = combined_end = None
+    
+    for child_name, start, end in sorted(sessions):
+        if child_name == current_child and start <= combined_end:
+            combined_end = max(combined_end, end)
+            continue
+        
+        if current_child is not None:
+            bookings.append(Booking.from_session(current_child, combined_start, combined_end))
+        current_child, combined_start, combined_end = child_name, start, end
+    
+    if current_child is not None:
+        bookings.append(Booking.from_session(current_child, combined_start, combined_end))
+    
+    bookings.sort(key=lambda booking: (booking.booked_start, booking.child_name))
+    
+    if verbose:
+        for booking in bookings:
+            print(f"    ✓ {booking.summary}")
+    
+    return bookings
+
+
+def build_month_bookings(month_abbrev, current_year, days, verbose=True):
+    """Turn the raw text of a month's day cells into merged Bookings
+    
+    days is a list of (date_text, [(child_name, session_time), ...]) tuples,
+    exactly as read from the calendar grid. A missing child name or session
+    time is passed as None.
+    """
+    current_month = MONTH_MAP[month_abbrev]
+    bookings = []
+    
+    for date_text, booking_rows in days:
+        try:
+            date_text = (date_text or '').strip()
+            
+            if not date_text:
+                continue
+            
+            date_parts = date_text.split(' ')
+            day_number = int(date_parts[0])
+            
+            day_month = current_month
+            day_year = current_year
+            
+            if len(date_parts) > 1:
+                day_month_abbrev = date_parts[1]
+                day_month = MONTH_MAP.get(day_month_abbrev, current_month)
+                
+                if day_month_abbrev == 'Dec' and month_abbrev == 'Jan':
+                    day_year = current_year - 1
+                elif day_month_abbrev == 'Jan' and month_abbrev == 'Dec':
+                    day_year = current_year + 1
+            
+            if booking_rows and verbose:
+                print(f"  Day {date_text}: Found {len(booking_rows)} booking(s)")
+            
+            day_bookings = []
+            
+            for child_name, session_time in booking_rows:
+                try:
+                    if child_name is None or session_time is None:
+                        raise ValueError("booking is missing its child name or session time")
+                    
+                    child_name = child_name.strip()
+                    session_time = session_time.strip()
+                    
+                    if not session_time:
+                        continue
+                    
+                    time_match = TIME_RANGE_RE.search(session_time)
+                    if not time_match:
+                        if verbose:
+                            print(f"    ⚠️ Could not parse time: {session_time}")
+                        continue
+                    
+                    start_time = time_match.group(1)
+                    end_time = time_match.group(2)
+                    
+                    date_str = f"{day_year}-{day_month:02d}-{day_number:02d}"
+                    start_datetime = datetime.strptime(f"{date_str} {start_time}", "%Y-%m-%d %H:%M")
+                    end_datetime = datetime.strptime(f"{date_str} {end_time}", "%Y-%m-%d %H:%M")
+                    
+                    day_bookings.append((child_name, start_datetime, end_datetime))
+                    
+                except Exception as e:
+                    if verbose:
+                        print(f"    ⚠️ Failed to parse booking: {e}")
+                    continue
+            
+            bookings.extend(merge_day_bookings(day_bookings, verbose=verbose))
+                
+        except Exception as e:
+            continue
+    
+    return bookings
+
+
+def count_element_mode_commands(days):
+    """Number of WebDriver commands the per-element extraction needs for a grid"""
+    # header find + .text, then the day cell lookup
+    commands = 3
+    for date_text, booking_rows in days:
+        # date <p> find + .text, then the booking container lookup
+        commands += 3
+        # childName find + .text, sessionTime find + .text
+        commands += 4 * len(booking_rows)
+    return commands
+
+
+def read_calendar_snapshot(driver):
+    """Read the header and every day cell of the calendar in one execute_script call"""
+    snapshot = driver.execute_script(
+        CALENDAR_SNAPSHOT_JS,
+        SELECTORS['header'], SELECTORS['day'], SELECTORS['date'],
+        SELECTORS['booking'], SELECTORS['child'], SELECTORS['session']
+    )
+    days = [(day[0], [(row[0], row[1]) for row in day[1]]) for day in snapshot['days']]
+    return snapshot['header'], days
+
+
+def read_calendar_elements(driver):
+    """Read the header and every day cell of the calendar one WebElement at a time"""
+    month_year_element = driver.find_element(By.CSS_SELECTOR, SELECTORS['header'])
+    header_text = month_year_element.text
+    
+    day_elements = driver.find_elements(By.CSS_SELECTOR, SELECTORS['day'])
+    
+    days = []
+    for day_el in day_elements:
+        try:
+            date_text = day_el.find_element(By.CSS_SELECTOR, SELECTORS['date']).text
+        except Exception:
+            continue
+        
+        booking_rows = []
+        for container in day_el.find_elements(By.CSS_SELECTOR, SELECTORS['booking']):
+            try:
+                child_name = container.find_element(By.CSS_SELECTOR, SELECTORS['child']).text
+            except Exception:
+                child_name = None
+            try:
+                session_time = container.find_element(By.CSS_SELECTOR, SELECTORS['session']).text
+            except Exception:
+                session_time = None
+            booking_rows.append((child_name, session_time))
+        
+        days.append((date_text, booking_rows))
+    
+    return header_text, days
+
+
+SIMPLE_SELECTOR_RE = re.compile(r"""^([\w-]*)((?:\.[\w-]+)*)((?:\[class\*=['"][^'"]+['"]\])*)$""")
+
+
+def _split_selector(selector):
+    """Split a simple "tag.class1.class2[class*='part']" selector into (tag, {classes}, (parts))"""
+    match = SIMPLE_SELECTOR_RE.match(selector)
+    if not match:
+        raise ValueError(f"Saved pages can only be read with tag.class[class*='...'] selectors, not {selector}")
+    
+    tag, classes, parts = match.groups()
+    return tag, set(classes.split('.')[1:]), tuple(re.findall(r"""['"]([^'"]+)['"]""", parts))
+
+
+class CalendarHTMLParser(HTMLParser):
+    """Reads the calendar grid out of a saved page source (driver.page_source)
+    
+    Produces the same (header_text, days) structure as the live readers so the
+    result can go straight into build_month_bookings without a browser.
+    """
+    
+    VOID_TAGS = {
+        'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+        'link', 'meta', 'source', 'track', 'wbr'
+    }
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.roles = {
+            role: _split_selector(SELECTORS[role])
+            for role in ('header', 'day', 'date', 'booking', 'child', 'session')
+        }
+        self.stack = []
+        self.header_text = None
+        self.days = []
+        self.day = None
+        self.booking = None
+        self.text_target = None
+    
+    def _role_for(self, tag, class_attr):
+        classes = set(class_attr.split())
+        for role, (role_tag, role_classes, role_parts) in self.roles.items():
+            if ((not role_tag or tag == role_tag) and role_classes <= classes
+                    and all(part in class_attr for part in role_parts)):
+                return role
+        return None
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID_TAGS:
+            return
+        
+        role = self._role_for(tag, dict(attrs).get('class') or '')
+        
+        if role == 'header' and self.header_text is None and self.text_target is None:
+            self.header_text = []
+            self.text_target = ('header', len(self.stack))
+        elif role == 'day' and self.day is None:
+            self.day = {'date': None, 'rows': [], 'depth': len(self.stack)}
+        elif role == 'date' and self.day is not None and self.day['date'] is None and self.text_target is None:
+            self.day['date'] = []
+            self.text_target = ('date', len(self.stack))
+        elif role == 'booking' and self.day is not None and self.booking is None:
+            self.booking = {'child': None, 'session': None, 'depth': len(self.stack)}
+        elif role in ('child', 'session') and self.booking is not None and self.booking[role] is None and self.text_target is None:
+            self.booking[role] = []
+            self.text_target = (role, len(self.stack))
+        
+        self.stack.append(tag)
+    
+    def handle_startendtag(self, tag, attrs):
+        pass
+    
+    def handle_endtag(self, tag):
+        if tag in self.VOID_TAGS or tag not in self.stack:
+            return
+        
+        while self.stack:
+            open_tag = self.stack.pop()
+            self._close(len(self.stack))
+            if open_tag == tag:
+                break
+    
+    def _close(self, depth):
+        if self.text_target and self.text_target[1] == depth:
+            self.text_target = None
+        
+        if self.booking is not None and self.booking['depth'] == depth:
+            self.day['rows'].append((self._join(self.booking['child']), self._join(self.booking['session'])))
+            self.booking = None
+        
+        if self.day is not None and self.day['depth'] == depth:
+            if self.day['date'] is not None:
+                self.days.append((self._join(self.day['date']), self.day['rows']))
+            self.day = None
+    
+    def handle_data(self, data):
+        if not self.text_target:
+            return
+        
+        role = self.text_target[0]
+        if role == 'header':
+            self.header_text.append(data)
+        elif role == 'date':
+            self.day['date'].append(data)
+        else:
+            self.booking[role].append(data)
+    
+    @staticmethod
+    def _join(chunks):
+        if chunks is None:
+            return None
+        return ' '.join(''.join(chunks).split())
+
+
+def parse_calendar_html(page_source):
+    """Read (header_text, days) out of a calendar page's HTML"""
+    parser = CalendarHTMLParser()
+    parser.feed(page_source)
+    parser.close()
+    return CalendarHTMLParser._join(parser.header_text), parser.days
+
+
+def extract_bookings_from_html(page_source, verbose=False):
+    """Extract bookings from a saved calendar page without a browser"""
+    header_text, days = parse_calendar_html(page_source)
+    
+    parsed = parse_month_header(header_text or '')
+    if not parsed:
+        return []
+    
+    month_abbrev, current_month, current_year = parsed
+    return build_month_bookings(month_abbrev, current_year, days, verbose=verbose)
+
+
+def _extract_bookings_from_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return extract_bookings_from_html(f.read())
+
+
+def parse_saved_pages(paths, workers=None):
+    """Parse many saved calendar pages, spread over a process pool
+    
+    Returns a list of (path, bookings) in the same order as paths.
+    """
+    paths = list(paths)
+    if workers == 1 or len(paths) < 2:
+        return [(path, _extract_bookings_from_file(path)) for path in paths]
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_extract_bookings_from_file, paths, chunksize=16)
+        return list(zip(paths, results))
+
+
+def archive_page_source(page_source, header_text):
+    """Save the calendar HTML so it can be re-parsed later without a browser"""
+    os.makedirs(ARCHIVE_PAGES_FOLDER, exist_ok=True)
+    month_year = header_text.replace('Bookings - ', '').strip().replace(' ', '_')
+    stamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+    filepath = os.path.join(ARCHIVE_PAGES_FOLDER, f"bookings_{month_year}_{stamp}.html")
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(page_source)
+    return filepath
+
+
+@traced('extract')
+def extract_bookings_from_page(driver, raise_errors=False):
+    """Extract bookings from the current calendar view
+    
+    Problems are printed and whatever was read is returned, unless
+    raise_errors is set, when they are raised so the month can be retried.
+    """
+    
+    try:
+        wait_for(driver, 'calendar', CalendarSettled())
+    except TimeoutException:
+        if raise_errors:
+            raise
+        print(f"⚠️ Calendar not loaded properly after {WAIT_BUDGETS['calendar']}s, reading it anyway...")
+    
+    bookings = []
+    
+    try:
+        page_source = None
+        if EXTRACTION_MODE == "snapshot":
+            header_text, days = read_calendar_snapshot(driver)
+        elif EXTRACTION_MODE == "page_source":
+            page_source = driver.page_source
+            header_text, days = parse_calendar_html(page_source)
+        else:
+            header_text, days = read_calendar_elements(driver)
+        
+        if ARCHIVE_PAGES_FOLDER and header_text:
+            archive_page_source(page_source or driver.page_source, header_text)
+        
+        parsed = parse_month_header(header_text or '')
+        if not parsed:
+            if raise_errors:
+                raise ValueError(f"Could not read the calendar header: {header_text!r}")
+            return bookings
+        
+        month_abbrev, current_month, current_year = parsed
+        
+        print(f"📅 Processing {month_abbrev} {current_year}...")
+        print(f"  Found {len(days)} day elements")
+        
+        bookings = build_month_bookings(month_abbrev, current_year, days)
+        
+        print(f"  Total: {len(bookings)} booking(s) this month")
+        if EXTRACTION_MODE in ("snapshot", "page_source"):
+            saved = count_element_mode_commands(days) - 1
+            print(f"  ⚡ {EXTRACTION_MODE} read saved {saved} WebDriver command(s)")
+        print()
+        
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f"❌ Error extracting bookings: {e}")
+    
+    return bookings
+
+
+def click_month_button(driver, direction):
+    """Click the 'next' or 'previous' month button and wait for page to update"""
+    try:
+        old_header = driver.find_element(By.CSS_SELECTOR, SELECTORS['header']).text.strip()
+        
+        button = find_page_element(driver, f'{direction}_button')
+        if not button:
+            print(f"⚠️ Could not find {direction} month button")
+            return False
+        
+        button.click()
+        
+        wait_for(driver, 'month_change', CalendarSettled(previous_header=old_header))
+        
+        print(f"  {'➡️' if direction == 'next' else '⬅️'} Moved to {direction} month")
+        return True
+        
+    except Exception as e:
+        print(f"⚠️ Could not move to {direction} month: {e}")
+        return False
+
+
+@traced('next_month')
+def click_next_month(driver):
+    """Click the next month button and wait for page to update"""
+    return click_month_button(driver, 'next')
+
+
+@traced('next_month')
+def click_previous_month(driver):
+    """Click the previous month button and wait for page to update"""
+    return click_month_button(driver, 'previous')
+
+
+def shown_month(driver):
+    """First day of the month the calendar is showing, or None if it isn't showing one"""
+    try:
+        header_text = driver.find_element(By.CSS_SELECTOR, SELECTORS['header']).text
+    except Exception:
+        return None
+    
+    match = re.fullmatch(r'(?:Bookings - )?(\w{3}) (\d{4})', header_text.strip())
+    if not match or match.group(1) not in MONTH_MAP:
+        return None
+    return datetime(int(match.group(2)), MONTH_MAP[match.group(1)], 1)
+
+
+# Whether PARENTZONE_BOOKINGS_MONTH_URL lands on the right month, and whether
+# the page follows it without a reload (None = not tried yet)
+DIRECT_NAVIGATION = {'works': None, 'in_page': None}
+
+# Tells the page's router that the URL changed, without reloading the page
+SOFT_NAVIGATE_JS = """
+window.history.pushState({}, '', arguments[0]);
+window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));
+"""
+
+
+def open_month_url(driver, month_start):
+    """Load the bookings page for month_start through PARENTZONE_BOOKINGS_MONTH_URL
+    
+    Once the URL is known to work, the page's own router is told about the new
+    URL instead of reloading everything. Returns True if month_start is shown.
+    """
+    url = PARENTZONE_BOOKINGS_MONTH_URL.format(date=month_start.strftime('%Y-%m-%d'))
+    
+    if DIRECT_NAVIGATION['works'] and DIRECT_NAVIGATION['in_page'] is not False and shown_month(driver):
+        old_header = driver.find_element(By.CSS_SELECTOR, SELECTORS['header']).text.strip()
+        try:
+            driver.execute_script(SOFT_NAVIGATE_JS, url)
+            wait_for(driver, 'month_jump', CalendarSettled(previous_header=old_header))
+            in_page = shown_month(driver) == month_start
+        except TimeoutException:
+            in_page = False
+        
+        if in_page:
+            DIRECT_NAVIGATION['in_page'] = True
+            return True
+        if DIRECT_NAVIGATION['in_page'] is None:
+            DIRECT_NAVIGATION['in_page'] = False
+    
+    driver.get(url)
+    try:
+        wait_for(driver, 'bookings_page', CalendarSettled())
+    except TimeoutException:
+        return False
+    return shown_month(driver) == month_start
+
+
+@traced('goto_month')
+def goto_month(driver, month_start):
+    """Show the calendar for month_start, checked against the 'Bookings - Mon YYYY' header
+    
+    Jumps straight there with PARENTZONE_BOOKINGS_MONTH_URL. If ParentZone
+    doesn't honour it, clicks 'next' / 'previous' from the month shown instead.
+    Returns False if the month can't be reached.
+    """
+    if shown_month(driver) == month_start:
+        return True
+    
+    if PARENTZONE_BOOKINGS_MONTH_URL and DIRECT_NAVIGATION['works'] is not False:
+        if open_month_url(driver, month_start):
+            DIRECT_NAVIGATION['works'] = True
+            return True
+        
+        if DIRECT_NAVIGATION['works'] is None:
+            DIRECT_NAVIGATION['works'] = False
+            print("ℹ️ ParentZone didn't open the month from the URL, clicking through months instead")
+    
+    current = shown_month(driver)
+    if current is None:
+        driver.get(PARENTZONE_BOOKINGS_URL)
+        wait_for(driver, 'bookings_page', CalendarSettled())
+        current = shown_month(driver)
+        if current is None:
+            return False
+    
+    while current != month_start:
+        if current < month_start:
+            moved = click_next_month(driver)
+        else:
+            moved = click_previous_month(driver)
+        
+        now_showing = shown_month(driver)
+        if not moved or now_showing is None or now_showing == current:
+            return False
+        current = now_showing
+    
+    return True
+
+
+def scrape_window():
+    """First days of SCRAPE_START_MONTH to SCRAPE_END_MONTH, or None if no range is set"""
+    if not (SCRAPE_START_MONTH and SCRAPE_END_MONTH):
+        return None
+    
+    first_month = datetime.strptime(SCRAPE_START_MONTH, '%Y-%m')
+    last_month = datetime.strptime(SCRAPE_END_MONTH, '%Y-%m')
+    month_count = (last_month.year - first_month.year) * 12 + last_month.month - first_month.month + 1
+    if month_count < 1:
+        raise ValueError(f"SCRAPE_END_MONTH ({SCRAPE_END_MONTH}) is before SCRAPE_START_MONTH ({SCRAPE_START_MONTH})")
+    return [add_months(first_month, month_idx) for month_idx in range(month_count)]
+
+
+def generate_ical_per_month(all_bookings, output_folder="."):
+    """Generate separate iCal files for each month"""
+    
+    bookings_by_month = {}
+    
+    for booking in all_bookings:
+        month_key = booking.start.strftime('%Y-%m')
+        month_name = booking.start.strftime('%Y_%B')
+        
+        if month_key not in bookings_by_month:
+            bookings_by_month[month_key] = {
+                'name': month_name,
+                'bookings': []
+            }
+        
+        bookings_by_month[month_key]['bookings'].append(booking)
+    
+    created_files = []
+    
+    for month_key in sorted(bookings_by_month.keys()):
+        month_data = bookings_by_month[month_key]
+        created_files.append(write_month_ical(month_data['name'], month_data['bookings'], output_folder))
+    
+    return created_files
+
+
+_run_dtstamp = None
+
+
+def ical_dtstamp():
+    """DTSTAMP for this run, worked out once and shared by every event"""
+    global _run_dtstamp
+    if _run_dtstamp is None:
+        _run_dtstamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    return _run_dtstamp
+
+
+def reset_ical_dtstamp():
+    """Start a new run: the next file written gets a fresh DTSTAMP"""
+    global _run_dtstamp
+    _run_dtstamp = None
+
+
+def ical_escape(text):
+    """Escape a TEXT value (RFC 5545 3.3.11)"""
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def ical_line(line):
+    """Terminate a content line with CRLF, folding it at 75 octets (RFC 5545 3.1)"""
+    if len(line) <= 75 and line.isascii():
+        return line + '\r\n'
+    
+    folded = []
+    chunk = ''
+    chunk_octets = 0
+    limit = 75
+    for char in line:
+        char_octets = len(char.encode('utf-8'))
+        if chunk_octets + char_octets > limit:
+            folded.append(chunk)
+            chunk = ' '
+            chunk_octets = 1
+            limit = 75
+        chunk += char
+        chunk_octets += char_octets
+    folded.append(chunk)
+    return '\r\n'.join(folded) + '\r\n'
+
+
+def booking_uid(booking):
+    """UID that only depends on the child, the day and the booked times
+    
+    Adding or removing another event in the month leaves it unchanged, so
+    calendar apps update the event instead of importing a duplicate.
+    """
+    start = booking.booked_start
+    end = booking.booked_end
+    day = f"{start.year:04d}{start.month:02d}{start.day:02d}"
+    key = f"{booking.child_name}|{day}|{start.hour:02d}{start.minute:02d}|{end.hour:02d}{end.minute:02d}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return f"parentzone-{day}-{start.hour:02d}{start.minute:02d}-{digest}@parentzone.me"
+
+
+def ical_datetime(value):
+    """Floating local date-time, e.g. 20260105T083000"""
+    return (f"{value.year:04d}{value.month:02d}{value.day:02d}"
+            f"T{value.hour:02d}{value.minute:02d}{value.second:02d}")
+
+
+def write_ical(f, calendar_name, bookings):
+    """Stream an RFC 5545 calendar of bookings to an open text file
+    
+    Open the file with newline='' so the CRLF line endings are kept as-is.
+    """
+    f.write(
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//ParentZone Scraper//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        "METHOD:PUBLISH\r\n"
+        + ical_line(f"X-WR-CALNAME:{ical_escape(calendar_name)}")
+        + f"X-WR-TIMEZONE:{PARENTZONE_TIMEZONE}\r\n"
+    )
+    
+    dtstamp_line = f"DTSTAMP:{ical_dtstamp()}\r\n"
+    
+    for booking in bookings:
+        f.write(
+            "BEGIN:VEVENT\r\n"
+            + ical_line(f"UID:{booking_uid(booking)}")
+            + dtstamp_line
+            + f"DTSTART:{ical_datetime(booking.start)}\r\n"
+            + f"DTEND:{ical_datetime(booking.end)}\r\n"
+            + ical_line(f"SUMMARY:{ical_escape(booking.summary)}")
+            + ical_line(f"DESCRIPTION:{ical_escape(booking.description)}")
+            + "STATUS:CONFIRMED\r\n"
+            "END:VEVENT\r\n"
+        )
+    
+    f.write("END:VCALENDAR\r\n")
+
+
+def unique_month_bookings(month_bookings):
+    """Drop repeated bookings (the same day can be scraped from two pages)"""
+    seen = set()
+    unique_bookings = []
+    
+    for booking in month_bookings:
+        booking_key = (
+            booking.summary,
+            booking.start.date(),
+            booking.booked_start,
+            booking.booked_end
+        )
+        
+        if booking_key not in seen:
+            seen.add(booking_key)
+            unique_bookings.append(booking)
+    
+    return unique_bookings
+
+
+@traced('generate')
+def write_month_ical(month_name, month_bookings, output_folder="."):
+    """De-duplicate one month's bookings and write its iCal file
+    
+    The file is written to a temporary name and then renamed into place, so an
+    interrupted run never leaves a half-written calendar behind.
+    Returns the file name.
+    """
+    unique_bookings = unique_month_bookings(month_bookings)
+    duplicates_removed = len(month_bookings) - len(unique_bookings)
+    
+    filename = f"parentzone_bookings_{month_name}.ics"
+    filepath = os.path.join(output_folder, filename)
+    
+    temp_filepath = filepath + '.tmp'
+    try:
+        with open(temp_filepath, 'w', encoding='utf-8', newline='') as f:
+            write_ical(f, f"ParentZone {month_name.replace('_', ' ')}", unique_bookings)
+    except BaseException:
+        os.remove(temp_filepath)
+        raise
+    os.replace(temp_filepath, filepath)
+    
+    print(f"✅ Created: {filename}")
+    print(f"   📊 {len(unique_bookings)} unique event(s)", end="")
+    if duplicates_removed > 0:
+        print(f" ({duplicates_removed} duplicate(s) removed)")
+    else:
+        print()
+    
+    return filename
+
+
+def month_key_from_header(month_year):
+    """'Oct 2026' -> '2026-10'"""
+    return datetime.strptime(month_year.strip(), '%b %Y').strftime('%Y-%m')
+
+
+def month_event_rows(bookings):
+    """Sorted, de-duplicated rows describing a month's calendar events"""
+    return sorted({
+        (
+            booking.start.strftime('%Y-%m-%d'),
+            booking.child_name,
+            booking.original_start,
+            booking.original_end,
+            booking.summary,
+            booking.start.isoformat(),
+            booking.end.isoformat(),
+            booking.description,
+        )
+        for booking in bookings
+    })
+
+
+def month_fingerprint(event_rows):
+    """Content hash of a month's events, used to spot months that haven't changed"""
+    return hashlib.sha256(json.dumps(event_rows).encode('utf-8')).hexdigest()
+
+
+def load_month_state(state_file=None):
+    """Load the per-month fingerprints saved by the last run"""
+    state_file = state_file or MONTH_STATE_FILE
+    if not state_file or not os.path.exists(state_file):
+        return {}
+    
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read {state_file}, starting fresh: {e}")
+        return {}
+
+
+def save_month_state(month_state, state_file=None):
+    """Save the per-month fingerprints for the next run"""
+    state_file = state_file or MONTH_STATE_FILE
+    if not state_file:
+        return
+    
+    temp_file = state_file + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(month_state, f)
+    os.replace(temp_file, state_file)
+
+
+def month_unchanged(month_state, month_key, bookings):
+    """True if a month's bookings match the fingerprint from the last run"""
+    year, month = map(int, month_key.split('-'))
+    rows = month_event_rows(b for b in bookings if (b.start.year, b.start.month) == (year, month))
+    saved = month_state.get(month_key)
+    return bool(saved) and saved['fingerprint'] == month_fingerprint(rows)
+
+
+def diff_month_events(old_rows, new_rows):
+    """Count added, removed and changed events between two sets of event rows
+    
+    An event that moved to a different time (same child, same day) counts as
+    changed rather than as one removal plus one addition.
+    """
+    old_events = {tuple(row[:4]) for row in old_rows}
+    new_events = {tuple(row[:4]) for row in new_rows}
+    removed = old_events - new_events
+    added = new_events - old_events
+    
+    changed = 0
+    for slot in {event[:2] for event in added} & {event[:2] for event in removed}:
+        changed += min(
+            sum(1 for event in added if event[:2] == slot),
+            sum(1 for event in removed if event[:2] == slot)
+        )
+    
+    return len(added) - changed, len(removed) - changed, changed
+
+
+def month_needs_writing(month_key, month_bookings, month_state, output_folder="."):
+    """Compare a scraped month with the last run and record its new fingerprint
+    
+    True when the month's iCal file needs writing: its content changed, or it
+    is unchanged but the file has gone missing. A month with no bookings now
+    or last time never needs one, like without month_state.
+    """
+    rows = month_event_rows(month_bookings)
+    fingerprint = month_fingerprint(rows)
+    saved = month_state.get(month_key)
+    
+    if not rows and not (saved and saved['events']):
+        print(f"🔎 {month_key}: no bookings, skipped")
+        return False
+    
+    month_name = datetime.strptime(month_key, '%Y-%m').strftime('%Y_%B')
+    filepath = os.path.join(output_folder, f"parentzone_bookings_{month_name}.ics")
+    
+    if saved and saved['fingerprint'] == fingerprint:
+        if os.path.exists(filepath):
+            print(f"🔎 {month_key}: unchanged since last run, skipped")
+            return False
+        print(f"🔎 {month_key}: unchanged since last run, but its file is missing")
+        return True
+    
+    added, removed, changed = diff_month_events(saved['events'] if saved else [], rows)
+    print(f"🔎 {month_key}: +{added} added, -{removed} removed, ~{changed} changed since last run")
+    
+    month_state[month_key] = {'fingerprint': fingerprint, 'events': rows}
+    return True
+
+
+def add_months(month_start, count):
+    """First day of the month `count` months after month_start"""
+    month_index = month_start.year * 12 + (month_start.month - 1) + count
+    return month_start.replace(year=month_index // 12, month=month_index % 12 + 1, day=1)
+
+
+class HttpSession:
+    """Small keep-alive HTTP client with a per-host connection pool and cookies
+    
+    Connections are reused between requests (HTTP/1.1 keep-alive), so a whole
+    run normally needs a single TLS handshake. Safe to share between threads.
+    """
+    
+    MAX_REDIRECTS = 5
+    
+    def __init__(self, timeout=30, pool_size=4):
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.headers = {
+            'User-Agent': HTTP_USER_AGENT,
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Encoding': 'gzip',
+        }
+        self.cookies = {}
+        self._idle = {}
+        self._lock = threading.Lock()
+    
+    def _connection(self, scheme, netloc):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(netloc, timeout=self.timeout)
+    
+    def _release(self, scheme, netloc, connection):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.pool_size:
+                idle.append(connection)
+                return
+        connection.close()
+    
+    def request(self, method, url, json_body=None, headers=None):
+        """Send a request and return (status, response headers, body bytes)"""
+        for _ in range(self.MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            path = parts.path or '/'
+            if parts.query:
+                path += '?' + parts.query
+            
+            request_headers = dict(self.headers)
+            request_headers.update(headers or {})
+            if self.cookies:
+                request_headers['Cookie'] = '; '.join(f"{k}={v}" for k, v in self.cookies.items())
+            
+            body = None
+            if json_body is not None:
+                body = json.dumps(json_body).encode('utf-8')
+                request_headers['Content-Type'] = 'application/json'
+            
+            status, response_headers, data = self._send(parts.scheme, parts.netloc, method, path, body, request_headers)
+            
+            for cookie_header in response_headers.get_all('Set-Cookie') or []:
+                cookie = SimpleCookie()
+                cookie.load(cookie_header)
+                for name, morsel in cookie.items():
+                    self.cookies[name] = morsel.value
+            
+            if status in (301, 302, 303, 307, 308) and response_headers.get('Location'):
+                url = urljoin(url, response_headers['Location'])
+                if status == 303 or (status in (301, 302) and method == 'POST'):
+                    method, json_body = 'GET', None
+                continue
+            
+            return status, response_headers, data
+        
+        raise RuntimeError(f"Too many redirects fetching {url}")
+    
+    def _send(self, scheme, netloc, method, path, body, headers):
+        # A pooled connection may have been closed by the server while idle,
+        # so retry once on a fresh connection before giving up.
+        for attempt in range(2):
+            connection = self._connection(scheme, netloc)
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                connection.close()
+                raise
+            
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(scheme, netloc, connection)
+            
+            if response.headers.get('Content-Encoding') == 'gzip':
+                data = gzip.decompress(data)
+            return response.status, response.headers, data
+    
+    def get_json(self, url, headers=None):
+        status, _, data = self.request('GET', url, headers=headers)
+        if status >= 400:
+            raise RuntimeError(f"GET {url} returned HTTP {status}")
+        return json.loads(data.decode('utf-8')) if data else None
+    
+    def post_json(self, url, payload, headers=None):
+        status, _, data = self.request('POST', url, json_body=payload, headers=headers)
+        if status >= 400:
+            raise RuntimeError(f"POST {url} returned HTTP {status}")
+        return json.loads(data.decode('utf-8')) if data else None
+    
+    def close(self):
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+
+def login_over_http(session, username, password):
+    """Log into the ParentZone API, leaving the auth token/cookies on the session"""
+    print("🔐 Logging into ParentZone (HTTP)...")
+    
+    try:
+        response = session.post_json(
+            PARENTZONE_API_URL + API_LOGIN_PATH,
+            {'email': username, 'password': password}
+        )
+    except Exception as e:
+        print(f"❌ Login failed: {e}")
+        return False
+    
+    token = response.get('token') if isinstance(response, dict) else None
+    if token:
+        session.headers['Authorization'] = f"Bearer {token}"
+    elif not session.cookies:
+        print("❌ Login failed: no token or session cookie in the response")
+        return False
+    
+    print("✅ Login successful!")
+    return True
+
+
+def _api_items(payload):
+    bookings = payload.get('bookings') if isinstance(payload, dict) else None
+    return bookings if isinstance(bookings, list) else []
+
+
+def _api_datetime(value):
+    """An API timestamp as a floating PARENTZONE_TIMEZONE time, like the calendar page shows"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(ZoneInfo(PARENTZONE_TIMEZONE)).replace(tzinfo=None)
+    return parsed
+
+
+def bookings_from_api(payload, month_start, verbose=True):
+    """Turn a bookings API response into the same Bookings as the page scrape"""
+    days = {}
+    
+    for item in _api_items(payload):
+        try:
+            child_name = (item.get('childName') or '').strip()
+            start, end = _api_datetime(item['start']), _api_datetime(item['end'])
+            if not child_name:
+                continue
+        except Exception as e:
+            if verbose:
+                print(f"    ⚠️ Failed to parse booking: {e}")
+            continue
+        
+        if (start.year, start.month) != (month_start.year, month_start.month):
+            continue
+        
+        days.setdefault(start.date(), []).append((child_name, start, end))
+    
+    bookings = []
+    for day in sorted(days):
+        if verbose:
+            print(f"  Day {day.day}: Found {len(days[day])} booking(s)")
+        bookings.extend(merge_day_bookings(days[day], verbose=verbose))
+    return bookings
+
+
+def ensure_http_login(session, username, password):
+    """Log the HTTP session in unless it already is"""
+    if session.headers.get('Authorization') or session.cookies:
+        return True
+    return login_over_http(session, username, password)
+
+
+def fetch_month_over_http(session, month_start):
+    """Fetch one month's bookings from the API, retrying up to MONTH_RETRIES times
+    
+    Same backoff as scrape_month_with_retries. A 401/403 isn't retried, it
+    raises SessionExpired straight away.
+    """
+    month_end = add_months(month_start, 1) - timedelta(days=1)
+    url = PARENTZONE_API_URL + API_BOOKINGS_PATH.format(
+        start=month_start.strftime('%Y-%m-%d'),
+        end=month_end.strftime('%Y-%m-%d')
+    )
+    
+    for attempt in range(MONTH_RETRIES + 1):
+        try:
+            status, _, data = session.request('GET', url)
+            if status in (401, 403):
+                raise SessionExpired(f"ParentZone answered HTTP {status}, the login has expired")
+            if status >= 400:
+                raise RuntimeError(f"GET {url} returned HTTP {status}")
+            return bookings_from_api(json.loads(data.decode('utf-8')) if data else None, month_start)
+        
+        except SessionExpired:
+            raise
+        except Exception as e:
+            if attempt == MONTH_RETRIES:
+                raise
+            delay = MONTH_RETRY_BACKOFF_SECONDS * 2 ** attempt
+            print(f"⚠️ {month_start:%b %Y} failed ({e}), trying again in {delay}s...")
+            time.sleep(delay)
+
+
+def iter_months_over_http(session, months_to_scrape, failures=None):
+    """Fetch the current month and the following ones from the API, one at a time
+    
+    months_to_scrape is a number of months from this one, or a list of month
+    first days (see scrape_window). Yields ('Mon YYYY', bookings) as soon as
+    each month has been fetched. Like iter_month_range, a month that still
+    fails after its retries is skipped (and noted in failures, if given).
+    """
+    if isinstance(months_to_scrape, int):
+        first_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        months_to_scrape = [add_months(first_month, month_idx) for month_idx in range(months_to_scrape)]
+    
+    print(f"\n🔍 Fetching up to {len(months_to_scrape)} month(s) over HTTP...\n")
+    
+    for month_start in months_to_scrape:
+        month_year = month_start.strftime('%b %Y')
+        print(f"📅 Processing {month_year}...")
+        try:
+            bookings = fetch_month_over_http(session, month_start)
+        except SessionExpired:
+            raise
+        except Exception as e:
+            print(f"❌ Giving up on {month_year}: {e}\n")
+            if failures is not None:
+                failures[month_start.strftime('%Y-%m')] = str(e)
+            continue
+        print(f"  Total: {len(bookings)} booking(s) this month\n")
+        
+        yield month_year, bookings
+
+
+def iter_months_with_http(session, checkpoint_file=None):
+    """The "http" engine's iter_months_with_driver: MONTHS_TO_SCRAPE from this month, or the range set"""
+    checkpoint_file = CHECKPOINT_FILE if checkpoint_file is None else checkpoint_file
+    window = scrape_window()
+    if not window:
+        first_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        window = [add_months(first_month, month_idx) for month_idx in range(MONTHS_TO_SCRAPE)]
+    
+    def scrape(month_starts, failures):
+        return iter_months_over_http(session, month_starts, failures)
+    
+    if checkpoint_file:
+        return iter_months_resumable(window, scrape, checkpoint_file)
+    return scrape(window, {})
+
+
+def scrape_bookings_over_http(username, password, months_to_scrape, session=None, scraped_months=None):
+    """Scrape bookings without a browser, straight from the ParentZone API
+    
+    Returns the booking list, or None if the login failed.
+    """
+    own_session = session is None
+    if own_session:
+        session = HttpSession()
+    
+    try:
+        if not ensure_http_login(session, username, password):
+            return None
+        return collect_months(iter_months_over_http(session, months_to_scrape), scraped_months)
+    
+    finally:
+        if own_session:
+            session.close()
+
+
+def load_checkpoint(month_keys, checkpoint_file=None):
+    """Load the progress of an interrupted run over the same months (or batch accounts)
+    
+    Returns a fresh checkpoint if there is none, it is for a different list,
+    or it is older than CHECKPOINT_MAX_HOURS.
+    """
+    checkpoint_file = checkpoint_file or CHECKPOINT_FILE
+    fresh = {'created': time.time(), 'months': month_keys, 'done': {}, 'failed': {}}
+    if not os.path.exists(checkpoint_file):
+        return fresh
+    
+    try:
+        with open(checkpoint_file, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read {checkpoint_file}, starting from the first month: {e}")
+        return fresh
+    
+    if checkpoint.get('months') != month_keys:
+        return fresh
+    if time.time() - checkpoint.get('created', 0) > CHECKPOINT_MAX_HOURS * 3600:
+        print(f"⚠️ Checkpoint is more than {CHECKPOINT_MAX_HOURS}h old, starting from the first month")
+        return fresh
+    return checkpoint
+
+
+def save_checkpoint(checkpoint, checkpoint_file=None):
+    """Write the run's progress so far"""
+    checkpoint_file = checkpoint_file or CHECKPOINT_FILE
+    temp_file = checkpoint_file + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_file, checkpoint_file)
+
+
+def clear_checkpoint(checkpoint_file=None):
+    checkpoint_file = checkpoint_file or CHECKPOINT_FILE
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+
+
+def checkpoint_entry(month_year, bookings):
+    """A scraped month as saved in the checkpoint: its booked sessions"""
+    return {
+        'month_year': month_year,
+        'sessions': [
+            [b.child_name, b.booked_start.isoformat(), b.booked_end.isoformat()] for b in bookings
+        ],
+    }
+
+
+def bookings_from_checkpoint(entry):
+    return [
+        Booking.from_session(child_name, datetime.fromisoformat(start), datetime.fromisoformat(end))
+        for child_name, start, end in entry['sessions']
+    ]
+
+
+def iter_months_resumable(month_starts, scrape, checkpoint_file=None):
+    """Scrape month_starts with scrape(months, failures), saving each month as it arrives
+    
+    Months already in the checkpoint of an interrupted run are replayed from
+    it first, and only the rest are passed to scrape. If every month gets
+    scraped the checkpoint is removed; if some fail, it is kept so the next
+    run only re-scrapes those.
+    """
+    checkpoint_file = checkpoint_file or CHECKPOINT_FILE
+    month_keys = [month_start.strftime('%Y-%m') for month_start in month_starts]
+    checkpoint = load_checkpoint(month_keys, checkpoint_file)
+    done = checkpoint['done']
+    
+    if done:
+        print(f"♻️ Carrying on from the last run: {len(done)} of {len(month_keys)} month(s) already scraped\n")
+    for month_key in month_keys:
+        if month_key in done:
+            yield done[month_key]['month_year'], bookings_from_checkpoint(done[month_key])
+    
+    failures = {}
+    todo = [month_start for month_start, month_key in zip(month_starts, month_keys) if month_key not in done]
+    if todo:
+        for month_year, bookings in scrape(todo, failures):
+            month_key = month_key_from_header(month_year)
+            done[month_key] = checkpoint_entry(month_year, bookings)
+            checkpoint['failed'].pop(month_key, None)
+            save_checkpoint(checkpoint, checkpoint_file)
+            yield month_year, bookings
+    
+    if failures:
+        checkpoint['failed'] = failures
+        save_checkpoint(checkpoint, checkpoint_file)
+        failed_months = ', '.join(datetime.strptime(key, '%Y-%m').strftime('%b %Y') for key in failures)
+        print(f"⚠️ {len(failures)} month(s) failed: {failed_months}")
+        print("   Run the script again to scrape just those.")
+    else:
+        clear_checkpoint(checkpoint_file)
+
+
+def collect_months(months, scraped_months=None):
+    """Gather everything a month iterator yields into one booking list"""
+    all_bookings = []
+    for month_year, bookings in months:
+        if scraped_months is not None:
+            scraped_months.append(month_year)
+        all_bookings.extend(bookings)
+    return all_bookings
+
+
+def iter_months(driver, months_to_scrape, month_state=None):
+    """Scrape the current month and the following ones, clicking 'next' between them
+    
+    Yields ('Mon YYYY', bookings) as soon as each month has been extracted.
+    With month_state and STOP_AFTER_UNCHANGED_MONTHS set, paging stops early
+    once that many months in a row match the last run.
+    """
+    scraped_months = []
+    unchanged_streak = 0
+    
+    for month_idx in range(months_to_scrape):
+        try:
+            month_year_element = driver.find_element(By.CSS_SELECTOR, SELECTORS['header'])
+            current_month_year = month_year_element.text.replace('Bookings - ', '').strip()
+            
+            if current_month_year in scraped_months:
+                print(f"⚠️ Already scraped {current_month_year}, stopping to avoid duplicates.")
+                break
+            
+            scraped_months.append(current_month_year)
+            
+        except:
+            print("⚠️ Could not read current month, stopping.")
+            break
+        
+        bookings = extract_bookings_from_page(driver)
+        
+        stop_early = False
+        if month_state is not None and STOP_AFTER_UNCHANGED_MONTHS:
+            if month_unchanged(month_state, month_key_from_header(current_month_year), bookings):
+                unchanged_streak += 1
+            else:
+                unchanged_streak = 0
+            stop_early = unchanged_streak >= STOP_AFTER_UNCHANGED_MONTHS
+        
+        yield current_month_year, bookings
+        
+        if stop_early:
+            print(f"⏭️ {unchanged_streak} month(s) in a row unchanged, stopping early.")
+            break
+        
+        if month_idx < months_to_scrape - 1:
+            if not click_next_month(driver):
+                print("⚠️ Could not navigate further, stopping here.")
+                break
+
+
+def scrape_months(driver, months_to_scrape, scraped_months=None, month_state=None):
+    """Scrape months one after another and return all their bookings
+    
+    The 'Mon YYYY' of every month scraped is appended to scraped_months.
+    """
+    return collect_months(iter_months(driver, months_to_scrape, month_state), scraped_months)
+
+
+def scrape_month_with_retries(driver, month_start):
+    """Go to a month and extract it, retrying up to MONTH_RETRIES times
+    
+    Waits MONTH_RETRY_BACKOFF_SECONDS before the first retry, doubling each
+    time, and reloads the bookings page in between. Raises the last error if
+    every try fails.
+    """
+    for attempt in range(MONTH_RETRIES + 1):
+        try:
+            if not goto_month(driver, month_start):
+                raise RuntimeError(f"couldn't open {month_start:%b %Y}")
+            return extract_bookings_from_page(driver, raise_errors=True)
+        
+        except Exception as e:
+            if attempt == MONTH_RETRIES:
+                raise
+            delay = MONTH_RETRY_BACKOFF_SECONDS * 2 ** attempt
+            print(f"⚠️ {month_start:%b %Y} failed ({e}), trying again in {delay}s...")
+            time.sleep(delay)
+            try:
+                driver.get(PARENTZONE_BOOKINGS_URL)
+            except Exception:
+                pass
+
+
+def iter_month_range(driver, month_starts, month_state=None, failures=None):
+    """Scrape the given months (first days), going straight to each one
+    
+    Every month costs one navigation (see goto_month) however far it is from
+    the last, and is checked against the page header before it is read. A
+    month that still fails after its retries is skipped (and noted in
+    failures, if given) without stopping the others.
+    Yields ('Mon YYYY', bookings) like iter_months.
+    """
+    unchanged_streak = 0
+    
+    for month_start in month_starts:
+        month_year = month_start.strftime('%b %Y')
+        try:
+            bookings = scrape_month_with_retries(driver, month_start)
+        except Exception as e:
+            print(f"❌ Giving up on {month_year}: {e}\n")
+            if failures is not None:
+                failures[month_start.strftime('%Y-%m')] = str(e)
+            continue
+        
+        stop_early = False
+        if month_state is not None and STOP_AFTER_UNCHANGED_MONTHS:
+            if month_unchanged(month_state, month_start.strftime('%Y-%m'), bookings):
+                unchanged_streak += 1
+            else:
+                unchanged_streak = 0
+            stop_early = unchanged_streak >= STOP_AFTER_UNCHANGED_MONTHS
+        
+        yield month_year, bookings
+        
+        if stop_early:
+            print(f"⏭️ {unchanged_streak} month(s) in a row unchanged, stopping early.")
+            break
+
+
+def iter_months_parallel(driver, months_to_scrape, workers, failures=None):
+    """Scrape months concurrently, each in its own headless browser
+    
+    months_to_scrape is a number of months from the one `driver` shows, or a
+    list of month first days (see scrape_window). The logged-in session of
+    `driver` is copied into up to `workers - 1` extra headless drivers. Every
+    month is a separate task: go to the month and extract it, with retries
+    (scrape_month_with_retries). Months are yielded in calendar order as soon
+    as they (and every month before them) are done. With failures given,
+    months that fail are noted there and skipped; otherwise the first failure
+    stops the scrape, like iter_months.
+    """
+    started = time.perf_counter()
+    state = export_session_state(driver)
+    
+    if isinstance(months_to_scrape, int):
+        first_month = shown_month(driver)
+        if first_month is None:
+            print("⚠️ Could not read current month, stopping.")
+            return
+        months_to_scrape = [add_months(first_month, month_idx) for month_idx in range(months_to_scrape)]
+    
+    idle_drivers = queue.Queue()
+    idle_drivers.put(driver)
+    extra_drivers = []
+    lock = threading.Lock()
+    
+    def borrow_driver():
+        try:
+            return idle_drivers.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with lock:
+            start_new = len(extra_drivers) + 1 < workers
+            if start_new:
+                extra_drivers.append(None)
+        
+        if not start_new:
+            return idle_drivers.get()
+        
+        try:
+            # Never the attached Chrome: months in the same tab would break each other
+            new_driver = acquire_driver(headless=True, attach=False)
+        except Exception as e:
+            print(f"⚠️ Could not start an extra browser: {e}")
+            with lock:
+                extra_drivers.remove(None)
+            return idle_drivers.get()
+        
+        with lock:
+            extra_drivers[extra_drivers.index(None)] = new_driver
+        restore_session_state(new_driver, state)
+        return new_driver
+    
+    def scrape_month(month_idx):
+        worker_driver = borrow_driver()
+        month_start = months_to_scrape[month_idx]
+        try:
+            month_started = time.perf_counter()
+            bookings = scrape_month_with_retries(worker_driver, month_start)
+            return month_idx, month_start.strftime('%b %Y'), bookings, time.perf_counter() - month_started, None
+        
+        except Exception as e:
+            print(f"⚠️ {month_start:%b %Y} failed: {e}")
+            return month_idx, None, [], 0.0, str(e)
+        
+        finally:
+            idle_drivers.put(worker_driver)
+    
+    pool = ThreadPoolExecutor(max_workers=workers)
+    futures = [pool.submit(scrape_month, month_idx) for month_idx in range(len(months_to_scrape))]
+    scraped_months = []
+    timings = []
+    
+    try:
+        for future in futures:
+            month_idx, month_year, bookings, month_seconds, error = future.result()
+            timings.append(month_seconds)
+            
+            if month_year is None:
+                if failures is None:
+                    print("⚠️ Could not navigate further, stopping here.")
+                    break
+                failures[months_to_scrape[month_idx].strftime('%Y-%m')] = error
+                continue
+            
+            if month_year in scraped_months:
+                print(f"⚠️ Already scraped {month_year}, stopping to avoid duplicates.")
+                break
+            
+            scraped_months.append(month_year)
+            yield month_year, bookings
+    
+    finally:
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=True)
+        for extra_driver in extra_drivers:
+            if extra_driver:
+                release_driver(extra_driver)
+    
+    wall_seconds = time.perf_counter() - started
+    # Every month is one navigation plus the read, the same work one browser would do in turn
+    sequential_estimate = sum(timings)
+    
+    print(f"\n⏱️ Parallel scrape of {len(scraped_months)} month(s) with {workers} worker(s): {wall_seconds:.1f}s")
+    if wall_seconds > 0:
+        print(f"   Sequential estimate: {sequential_estimate:.1f}s "
+              f"(speedup x{sequential_estimate / wall_seconds:.2f})")
+
+
+def scrape_months_parallel(driver, months_to_scrape, workers, scraped_months=None):
+    """Scrape months concurrently and return all their bookings in calendar order"""
+    return collect_months(iter_months_parallel(driver, months_to_scrape, workers), scraped_months)
+
+
+@traced('navigate')
+def open_bookings_page(driver, username, password, session_cache_file=None):
+    """Get the driver onto the bookings page and check every part of it can be found"""
+    load_selector_cache()
+    return reach_bookings_page(driver, username, password, session_cache_file)
+
+
+def reach_bookings_page(driver, username, password, session_cache_file=None):
+    """Get the driver onto the bookings page, logging in only if the saved session fails"""
+    if getattr(driver, 'parentzone_attached', False):
+        # A browser that was already running is often still logged in
+        try:
+            refresh_bookings_page(driver)
+            print("✅ Browser is already logged in")
+            record_page_timing(driver, 'bookings')
+            return True
+        except (SessionExpired, TimeoutException):
+            pass
+    
+    if resume_cached_session(driver, session_cache_file):
+        record_page_timing(driver, 'bookings')
+        return True
+    
+    if not login_to_parentzone(driver, username, password):
+        return False
+    
+    print("📆 Navigating to bookings page...")
+    driver.get(PARENTZONE_BOOKINGS_URL)
+    try:
+        if wait_for_bookings_page(driver) == 'login':
+            print("❌ ParentZone sent us back to the login page")
+            return False
+    except TimeoutException:
+        print(f"⚠️ Bookings page still loading after {WAIT_BUDGETS['bookings_page']}s, carrying on...")
+    record_page_timing(driver, 'bookings')
+    save_session_cache(driver, session_cache_file)
+    return True
+
+
+def iter_months_with_driver(driver, month_state=None, checkpoint_file=None):
+    """Scrape MONTHS_TO_SCRAPE months from the bookings page the driver is on
+    
+    With SCRAPE_START_MONTH / SCRAPE_END_MONTH set, scrapes that range instead.
+    Progress is checkpointed to checkpoint_file (default CHECKPOINT_FILE,
+    "" = off) so an interrupted run can carry on where it stopped. That needs
+    the months known up front, so they are taken from the one shown and each
+    is opened directly like a range; only with neither a range nor a
+    checkpoint does it click 'next' from month to month (iter_months).
+    """
+    checkpoint_file = CHECKPOINT_FILE if checkpoint_file is None else checkpoint_file
+    window = scrape_window()
+    if not window and checkpoint_file:
+        first_month = shown_month(driver)
+        if first_month:
+            window = [add_months(first_month, month_idx) for month_idx in range(MONTHS_TO_SCRAPE)]
+    
+    if window:
+        print(f"\n🔍 Scraping {window[0]:%b %Y} to {window[-1]:%b %Y} ({len(window)} month(s))...\n")
+        if PARALLEL_WORKERS > 1:
+            def scrape(month_starts, failures):
+                return iter_months_parallel(driver, month_starts, PARALLEL_WORKERS, failures)
+        else:
+            def scrape(month_starts, failures):
+                return iter_month_range(driver, month_starts, month_state, failures)
+        
+        if checkpoint_file:
+            return iter_months_resumable(window, scrape, checkpoint_file)
+        return scrape(window, {})
+    
+    print(f"\n🔍 Scraping up to {MONTHS_TO_SCRAPE} month(s)...\n")
+    if PARALLEL_WORKERS > 1:
+        return iter_months_parallel(driver, MONTHS_TO_SCRAPE, PARALLEL_WORKERS)
+    return iter_months(driver, MONTHS_TO_SCRAPE, month_state)
+
+
+# Fills in and submits the login form like a person typing would (React only
+# notices input events, not a plain .value change). False if the form isn't there.
+CDP_LOGIN_JS = """
+const email = document.querySelector('input[name="email"]');
+const password = document.querySelector('input[name="password"]');
+const button = document.querySelector('button[type="submit"]');
+if (!email || !password || !button) {
+    return false;
+}
+const setValue = (input, value) => {
+    Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(input, value);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+};
+setValue(email, arguments[0]);
+setValue(password, arguments[1]);
+button.click();
+return true;
+"""
+
+CHROME_BINARY_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+CHROME_BINARY_PATHS = (
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class CdpError(Exception):
+    """Chrome answered a DevTools command with an error, or the connection dropped"""
+
+
+class CdpConnection:
+    """Just enough of a WebSocket client to send DevTools commands to Chrome
+    
+    Commands can be sent from many tasks at once; a reader task matches each
+    reply to its command by id. Events are ignored, pages are polled instead.
+    """
+    
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.pending = {}
+        self.reader_task = asyncio.create_task(self._read_replies())
+    
+    @classmethod
+    async def connect(cls, ws_url):
+        url = urlsplit(ws_url)
+        reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+        
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write((
+            f"GET {url.path or '/'} HTTP/1.1\r\n"
+            f"Host: {url.hostname}:{url.port or 80}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode())
+        await writer.drain()
+        
+        response = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1')
+        status_line, *header_lines = response.split("\r\n")
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        if status_line.split()[1:2] != ['101'] or headers.get('sec-websocket-accept') != accept:
+            writer.close()
+            raise CdpError(f"Chrome refused the DevTools connection: {status_line}")
+        return cls(reader, writer)
+    
+    def _send_frame(self, opcode, payload):
+        # Client frames are always masked (RFC 6455 5.3)
+        header = bytearray([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header.append(0x80 | length)
+        elif length < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack('!H', length)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack('!Q', length)
+        
+        mask = os.urandom(4)
+        repeated = (mask * (length // 4 + 1))[:length]
+        masked = (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(length, 'big')
+        self.writer.write(bytes(header) + mask + masked)
+    
+    async def _read_message(self):
+        """Next text message from Chrome, or None once it closes the connection"""
+        parts = []
+        while True:
+            first, second = await self.reader.readexactly(2)
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack('!H', await self.reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack('!Q', await self.reader.readexactly(8))[0]
+            mask = await self.reader.readexactly(4) if second & 0x80 else None
+            payload = await self.reader.readexactly(length)
+            if mask:
+                payload = bytes(byte ^ mask[idx % 4] for idx, byte in enumerate(payload))
+            
+            opcode = first & 0x0F
+            if opcode == 0x8:
+                return None
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            
+            parts.append(payload)
+            if first & 0x80:
+                return b''.join(parts)
+    
+    async def _read_replies(self):
+        error = CdpError("Chrome closed the DevTools connection")
+        try:
+            while True:
+                message = await self._read_message()
+                if message is None:
+                    break
+                reply = json.loads(message)
+                waiter = self.pending.pop(reply.get('id'), None)
+                if waiter and not waiter.done():
+                    waiter.set_result((reply, len(message)))
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            error = CdpError(f"DevTools connection lost: {e}")
+        finally:
+            for waiter in self.pending.values():
+                if not waiter.done():
+                    waiter.set_exception(error)
+            self.pending.clear()
+    
+    async def send(self, method, params=None, session_id=None, timeout=60):
+        """Send one command and return its result, counted in TRACE like a WebDriver command"""
+        if self.reader_task.done():
+            raise CdpError("Chrome closed the DevTools connection")
+        
+        self.next_id += 1
+        command_id = self.next_id
+        command = {'id': command_id, 'method': method, 'params': params or {}}
+        if session_id:
+            command['sessionId'] = session_id
+        
+        payload = json.dumps(command).encode()
+        waiter = asyncio.get_running_loop().create_future()
+        self.pending[command_id] = waiter
+        try:
+            self._send_frame(0x1, payload)
+            await self.writer.drain()
+            reply, reply_size = await asyncio.wait_for(waiter, timeout)
+        finally:
+            self.pending.pop(command_id, None)
+        TRACE.count_command(len(payload), reply_size)
+        if 'error' in reply:
+            raise CdpError(f"{method}: {reply['error'].get('message')}")
+        return reply.get('result', {})
+    
+    async def close(self):
+        self.reader_task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (OSError, asyncio.CancelledError):
+            pass
+
+
+def find_chrome_binary():
+    """CHROME_BINARY, or the first Chrome / Chromium found on this computer"""
+    if CHROME_BINARY:
+        return CHROME_BINARY
+    for name in CHROME_BINARY_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    for path in CHROME_BINARY_PATHS:
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError("Couldn't find Chrome, set CHROME_BINARY to the path of chrome.exe / google-chrome")
+
+
+class CdpPage:
+    """One browser tab, driven through its own DevTools session"""
+    
+    def __init__(self, browser, target_id, session_id):
+        self.browser = browser
+        self.target_id = target_id
+        self.session_id = session_id
+    
+    async def send(self, method, params=None):
+        return await self.browser.connection.send(method, params, self.session_id)
+    
+    async def evaluate(self, script, *args):
+        """Run an execute_script-style script (it can use arguments[n]) and return its result"""
+        expression = f"(function() {{{script}}}).apply(null, {json.dumps(list(args))})"
+        result = await self.send('Runtime.evaluate', {'expression': expression, 'returnByValue': True})
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise CdpError(details.get('exception', {}).get('description') or details.get('text'))
+        return result['result'].get('value')
+    
+    async def goto(self, url):
+        result = await self.send('Page.navigate', {'url': url})
+        if result.get('errorText'):
+            raise CdpError(f"Couldn't open {url}: {result['errorText']}")
+    
+    async def close(self):
+        try:
+            await self.browser.connection.send('Target.closeTarget', {'targetId': self.target_id})
+        except CdpError:
+            pass
+
+
+class CdpBrowser:
+    """Chrome started (or attached to, with CHROME_DEBUGGER_ADDRESS) for the "cdp" engine"""
+    
+    def __init__(self, connection, process=None, profile_dir=None):
+        self.connection = connection
+        self.process = process
+        self.profile_dir = profile_dir
+    
+    @classmethod
+    async def start(cls, profile_dir=None):
+        started = time.perf_counter()
+        
+        if CHROME_DEBUGGER_ADDRESS:
+            def browser_ws_url():
+                host, _, port = CHROME_DEBUGGER_ADDRESS.rpartition(':')
+                connection = http.client.HTTPConnection(host, int(port), timeout=10)
+                try:
+                    connection.request('GET', '/json/version')
+                    return json.loads(connection.getresponse().read())['webSocketDebuggerUrl']
+                finally:
+                    connection.close()
+            
+            browser = cls(await CdpConnection.connect(await asyncio.to_thread(browser_ws_url)))
+            print(f"🔗 Attached to Chrome at {CHROME_DEBUGGER_ADDRESS} in {time.perf_counter() - started:.2f}s")
+            return browser
+        
+        lean = BROWSER_PROFILE == "lean"
+        own_profile = profile_dir is None
+        profile_dir = tempfile.mkdtemp(prefix="parentzone_cdp_") if own_profile else os.path.abspath(profile_dir)
+        os.makedirs(profile_dir, exist_ok=True)
+        port_file = os.path.join(profile_dir, 'DevToolsActivePort')
+        if os.path.exists(port_file):
+            os.remove(port_file)
+        
+        # Port 0 lets Chrome pick a free port, which it writes to DevToolsActivePort
+        arguments = [
+            find_chrome_binary(),
+            "--remote-debugging-port=0",
+            f"--user-data-dir={profile_dir}",
+            "--window-size=1920,1080",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ]
+        if lean:
+            arguments += ["--headless=new"] + LEAN_CHROME_ARGUMENTS
+        process = subprocess.Popen(arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        
+        try:
+            deadline = time.perf_counter() + WAIT_BUDGETS['bookings_page']
+            while True:
+                if process.poll() is not None:
+                    raise CdpError(f"Chrome exited straight away (code {process.returncode})")
+                try:
+                    with open(port_file, 'r', encoding='utf-8') as f:
+                        port, path = f.read().split()[:2]
+                    break
+                except (OSError, ValueError):
+                    pass
+                if time.perf_counter() > deadline:
+                    raise CdpError("Chrome didn't open its DevTools port")
+                await asyncio.sleep(0.05)
+            
+            connection = await CdpConnection.connect(f"ws://127.0.0.1:{port}{path}")
+        except BaseException:
+            process.kill()
+            raise
+        
+        print(f"🚀 Chrome started in {time.perf_counter() - started:.2f}s "
+              f"(DevTools, {BROWSER_PROFILE} profile{', headless' if lean else ''})")
+        return cls(connection, process, profile_dir if own_profile else None)
+    
+    async def new_page(self):
+        target = await self.connection.send('Target.createTarget', {'url': 'about:blank'})
+        attached = await self.connection.send('Target.attachToTarget', {'targetId': target['targetId'], 'flatten': True})
+        page = CdpPage(self, target['targetId'], attached['sessionId'])
+        if BROWSER_PROFILE == "lean" and BLOCKED_URL_PATTERNS:
+            await page.send('Network.enable')
+            await page.send('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        return page
+    
+    async def export_session_state(self, page):
+        """Like export_session_state(), in the format save_session_cache writes"""
+        cookies = []
+        for cookie in (await self.connection.send('Storage.getCookies'))['cookies']:
+            if 'parentzone' not in cookie['domain']:
+                continue
+            saved = {key: cookie[key] for key in ('name', 'value', 'path', 'domain', 'secure', 'httpOnly')}
+            if cookie.get('expires', -1) > 0:
+                saved['expiry'] = int(cookie['expires'])
+            cookies.append(saved)
+        local_storage = await page.evaluate("return Object.assign({}, window.localStorage);")
+        return {'cookies': cookies, 'local_storage': local_storage or {}}
+    
+    async def delete_session_cookies(self, page):
+        """Like delete_all_cookies(): only ParentZone's, an attached Chrome keeps every other site's"""
+        for cookie in (await self.connection.send('Storage.getCookies'))['cookies']:
+            if 'parentzone' in cookie['domain']:
+                await page.send('Network.deleteCookies', {
+                    'name': cookie['name'], 'domain': cookie['domain'], 'path': cookie['path'],
+                })
+    
+    async def restore_session_state(self, page, state):
+        """Like restore_session_state(); local storage is shared by every tab afterwards"""
+        cookies = []
+        for cookie in state['cookies']:
+            restored = {key: cookie[key] for key in ('name', 'value', 'path', 'domain', 'secure', 'httpOnly')
+                        if key in cookie}
+            if cookie.get('expiry'):
+                restored['expires'] = cookie['expiry']
+            cookies.append(restored)
+        await self.connection.send('Storage.setCookies', {'cookies': cookies})
+        
+        await page.goto(PARENTZONE_SESSION_SEED_URL)
+        await page.evaluate(
+            "for (const [k, v] of Object.entries(arguments[0])) { window.localStorage.setItem(k, v); }",
+            state['local_storage']
+        )
+    
+    async def close(self):
+        if self.process:
+            try:
+                await self.connection.send('Browser.close', timeout=5)
+            except (CdpError, asyncio.TimeoutError):
+                pass
+        await self.connection.close()
+        
+        if self.process:
+            try:
+                await asyncio.to_thread(self.process.wait, 10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+async def cdp_wait_until(page, phase, script, *args):
+    """Poll script in the page until it returns something truthy, within WAIT_BUDGETS[phase]"""
+    started = time.perf_counter()
+    try:
+        while True:
+            try:
+                result = await page.evaluate(script, *args)
+            except CdpError:
+                # The page is still being replaced by the one it is navigating to
+                result = None
+            if result:
+                return result
+            if time.perf_counter() - started > WAIT_BUDGETS[phase]:
+                raise TimeoutError(f"page not ready after {WAIT_BUDGETS[phase]}s")
+            await asyncio.sleep(WAIT_POLL_SECONDS)
+    finally:
+        WAIT_TIMINGS.setdefault(phase, []).append(time.perf_counter() - started)
+
+
+async def cdp_wait_for_calendar(page, phase):
+    """Like CalendarSettled: wait until two polls in a row see the same calendar
+    
+    Raises SessionExpired as soon as the page goes to the login screen instead.
+    """
+    started = time.perf_counter()
+    last_state = None
+    try:
+        while True:
+            try:
+                state = await page.evaluate(
+                    CALENDAR_STATE_JS,
+                    selector_candidates('header'), selector_candidates('day'), selector_candidates('booking')
+                )
+                location = await page.evaluate("return location.href;") if state is None else ''
+            except CdpError:
+                # The page is still being replaced by the one it is navigating to
+                state, location = None, ''
+            
+            if state is not None and state == last_state:
+                return state
+            last_state = state
+            
+            if 'login' in (location or ''):
+                raise SessionExpired("ParentZone asked for the login again")
+            if time.perf_counter() - started > WAIT_BUDGETS[phase]:
+                raise TimeoutError(f"calendar not loaded after {WAIT_BUDGETS[phase]}s")
+            await asyncio.sleep(WAIT_POLL_SECONDS)
+    finally:
+        WAIT_TIMINGS.setdefault(phase, []).append(time.perf_counter() - started)
+
+
+async def cdp_probe_selectors(page, wait=True):
+    """probe_selectors() for a DevTools tab: 'login', 'calendar' or 'loading', or raises SelectorsBroken"""
+    candidates = {name: selector_candidates(name) for name in SELECTOR_STRATEGIES}
+    script = "if (location.href.includes('login')) { return 'login'; }" + SELECTOR_PROBE_JS
+    found = {}
+    
+    started = time.perf_counter()
+    try:
+        while True:
+            try:
+                result = await page.evaluate(script, candidates)
+            except CdpError:
+                # The page is still being replaced by the one it is navigating to
+                result = None
+            if result == 'login':
+                return 'login'
+            if result:
+                found = result
+                if all(found.get(name, -1) >= 0 for name in REQUIRED_SELECTORS):
+                    break
+            if not wait or time.perf_counter() - started > WAIT_BUDGETS['selectors']:
+                break
+            await asyncio.sleep(WAIT_POLL_SECONDS)
+    finally:
+        WAIT_TIMINGS.setdefault('selectors', []).append(time.perf_counter() - started)
+    
+    if not any(found.get(name, -1) >= 0 for name in REQUIRED_SELECTORS):
+        return 'loading'
+    apply_selector_probe(candidates, found)
+    return 'calendar'
+
+
+async def cdp_wait_for_bookings_page(page):
+    """wait_for_bookings_page() for a DevTools tab: 'login' or 'calendar'
+    
+    Raises TimeoutError if the calendar didn't settle in time, and
+    SelectorsBroken (see probe_selectors).
+    """
+    outcome = await cdp_probe_selectors(page)
+    if outcome == 'login':
+        return 'login'
+    
+    timed_out = None
+    try:
+        await cdp_wait_for_calendar(page, 'bookings_page')
+    except SessionExpired:
+        return 'login'
+    except TimeoutError as e:
+        timed_out = e
+    
+    if outcome == 'loading' and await cdp_probe_selectors(page, wait=False) == 'login':
+        return 'login'
+    if timed_out:
+        raise timed_out
+    return 'calendar'
+
+
+async def cdp_open_bookings_page(browser, username, password, session_cache_file=None):
+    """open_bookings_page() for the "cdp" engine: saved session first, then the login form
+    
+    Leaves the session in the browser for every tab opened after it, and
+    checks the page parts can be found (cdp_probe_selectors) before waiting
+    for the calendar. Returns False if the login fails.
+    """
+    load_selector_cache()
+    cache_file = session_cache_file or SESSION_CACHE_FILE
+    page = await browser.new_page()
+    try:
+        resumed = False
+        state = load_session_cache(cache_file)
+        if state:
+            print("♻️ Trying saved session...")
+            await browser.restore_session_state(page, state)
+            await page.goto(PARENTZONE_BOOKINGS_URL)
+            try:
+                # Broken selectors raise here, before anything decides the session was rejected
+                outcome = await cdp_wait_for_bookings_page(page)
+            except TimeoutError:
+                # Still loading is not a rejection, the session is kept
+                print(f"⚠️ Bookings page still loading after {WAIT_BUDGETS['bookings_page']}s, carrying on...")
+                outcome = 'loading'
+            
+            if outcome == 'login':
+                print("⚠️ Saved session was rejected, logging in again")
+                clear_session_cache(cache_file)
+                await browser.delete_session_cookies(page)
+            else:
+                if outcome == 'calendar':
+                    print("✅ Saved session accepted, skipped login")
+                resumed = True
+        
+        if not resumed:
+            print("🔐 Logging into ParentZone...")
+            await page.goto(PARENTZONE_LOGIN_URL)
+            try:
+                await cdp_wait_until(page, 'login', CDP_LOGIN_JS, username, password)
+                await cdp_wait_until(page, 'login', "return !location.href.toLowerCase().includes('login');")
+            except TimeoutError as e:
+                print(f"❌ Login failed: {e}")
+                return False
+            print("✅ Login successful!")
+            
+            await page.goto(PARENTZONE_BOOKINGS_URL)
+            try:
+                if await cdp_wait_for_bookings_page(page) == 'login':
+                    print("❌ ParentZone sent us back to the login page")
+                    return False
+            except TimeoutError:
+                print(f"⚠️ Bookings page still loading after {WAIT_BUDGETS['bookings_page']}s, carrying on...")
+            if cache_file:
+                write_session_cache(await browser.export_session_state(page), cache_file)
+        
+        return True
+    
+    finally:
+        await page.close()
+
+
+async def cdp_read_month(browser, month_start):
+    """Open month_start in a new tab and read its bookings, checked against the header"""
+    page = await browser.new_page()
+    try:
+        await page.goto(PARENTZONE_BOOKINGS_MONTH_URL.format(date=month_start.strftime('%Y-%m-%d')))
+        await cdp_wait_for_calendar(page, 'bookings_page')
+        snapshot = await page.evaluate(
+            CALENDAR_SNAPSHOT_JS,
+            SELECTORS['header'], SELECTORS['day'], SELECTORS['date'],
+            SELECTORS['booking'], SELECTORS['child'], SELECTORS['session']
+        )
+    finally:
+        await page.close()
+    
+    parsed = parse_month_header(snapshot['header'] or '')
+    if not parsed:
+        raise ValueError(f"Could not read the calendar header: {snapshot['header']!r}")
+    month_abbrev, month, year = parsed
+    if (year, month) != (month_start.year, month_start.month):
+        raise RuntimeError(f"ParentZone showed {month_abbrev} {year} instead of {month_start:%b %Y}, "
+                           "check PARENTZONE_BOOKINGS_MONTH_URL")
+    
+    days = [(day[0], [(row[0], row[1]) for row in day[1]]) for day in snapshot['days']]
+    bookings = build_month_bookings(month_abbrev, year, days, verbose=False)
+    print(f"📅 {month_abbrev} {year}: {len(bookings)} booking(s) from {len(days)} day(s)")
+    return bookings
+
+
+async def cdp_scrape_month(browser, month_start):
+    """cdp_read_month with the retries and back-off of scrape_month_with_retries"""
+    for attempt in range(MONTH_RETRIES + 1):
+        try:
+            return await cdp_read_month(browser, month_start)
+        except SessionExpired:
+            raise
+        except Exception as e:
+            if attempt == MONTH_RETRIES:
+                raise
+            delay = MONTH_RETRY_BACKOFF_SECONDS * 2 ** attempt
+            print(f"⚠️ {month_start:%b %Y} failed ({e}), trying again in {delay}s...")
+            await asyncio.sleep(delay)
+
+
+async def cdp_scrape_months(browser, month_starts, on_month, concurrency=None):
+    """Scrape every month as its own task, at most `concurrency` tabs at once
+    
+    Each task opens its month, waits for the calendar and reads it; the
+    others carry on meanwhile. on_month(index, 'Mon YYYY' or None, bookings,
+    seconds, error) is called as each one finishes, in whatever order.
+    """
+    semaphore = asyncio.Semaphore(concurrency or CDP_CONCURRENCY)
+    
+    async def scrape(month_idx, month_start):
+        async with semaphore:
+            month_started = time.perf_counter()
+            try:
+                bookings = await cdp_scrape_month(browser, month_start)
+            except (SessionExpired, asyncio.CancelledError):
+                raise
+            except Exception as e:
+                print(f"⚠️ {month_start:%b %Y} failed: {e}")
+                on_month(month_idx, None, [], 0.0, str(e))
+                return
+            on_month(month_idx, month_start.strftime('%b %Y'), bookings, time.perf_counter() - month_started, None)
+    
+    tasks = [asyncio.create_task(scrape(month_idx, month_start)) for month_idx, month_start in enumerate(month_starts)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Let them finish cancelling before the caller closes the browser under them
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def iter_months_over_cdp(month_starts, username, password, failures=None,
+                         session_cache_file=None, profile_dir=None):
+    """Scrape months with the "cdp" engine, yielding ('Mon YYYY', bookings) like iter_months_parallel
+    
+    The asyncio engine runs in a background thread, so the caller can write
+    each month's iCal file while later months are still loading. Months are
+    yielded in calendar order as soon as they (and every month before them)
+    are done. With failures given, failed months are noted there and
+    skipped; otherwise the first failure stops the scrape.
+    """
+    results = queue.Queue()
+    running = {}
+    stop = threading.Event()
+    
+    async def engine():
+        running['loop'] = asyncio.get_running_loop()
+        running['task'] = asyncio.current_task()
+        if stop.is_set():
+            return
+        
+        browser = await CdpBrowser.start(profile_dir)
+        try:
+            if not await cdp_open_bookings_page(browser, username, password, session_cache_file):
+                raise SessionExpired("Login failed. Please check your credentials.")
+            await cdp_scrape_months(browser, month_starts, lambda *result: results.put(result))
+        finally:
+            await browser.close()
+    
+    def run_engine():
+        try:
+            with TRACE.span('cdp'):
+                asyncio.run(engine())
+            results.put(None)
+        except BaseException as e:
+            results.put(e)
+    
+    started = time.perf_counter()
+    thread = threading.Thread(target=run_engine, name="parentzone-cdp", daemon=True)
+    thread.start()
+    
+    finished = {}
+    next_idx = 0
+    timings = []
+    completed = False
+    try:
+        while next_idx < len(month_starts):
+            result = results.get()
+            if result is None:
+                break
+            if isinstance(result, BaseException):
+                raise result
+            
+            month_idx, month_year, bookings, month_seconds, error = result
+            finished[month_idx] = (month_year, bookings, error)
+            timings.append(month_seconds)
+            
+            while next_idx in finished:
+                month_year, bookings, error = finished.pop(next_idx)
+                if month_year is None:
+                    if failures is None:
+                        print("⚠️ Could not open the next month, stopping here.")
+                        return
+                    failures[month_starts[next_idx].strftime('%Y-%m')] = error
+                else:
+                    yield month_year, bookings
+                next_idx += 1
+        
+        # Every month is in, let the engine close the browser on its own
+        thread.join()
+        completed = True
+    
+    finally:
+        stop.set()
+        if not completed and thread.is_alive() and 'task' in running:
+            running['loop'].call_soon_threadsafe(running['task'].cancel)
+        thread.join()
+    
+    wall_seconds = time.perf_counter() - started
+    print(f"\n⏱️ DevTools scrape of {len(timings)} month(s), {CDP_CONCURRENCY} at a time: {wall_seconds:.1f}s")
+    if wall_seconds > 0 and timings:
+        print(f"   Sequential estimate: {sum(timings):.1f}s (speedup x{sum(timings) / wall_seconds:.2f})")
+
+
+def iter_months_with_cdp(username, password, session_cache_file=None, checkpoint_file=None, profile_dir=None):
+    """The "cdp" engine's iter_months_with_driver: MONTHS_TO_SCRAPE from this month, or the range set"""
+    checkpoint_file = CHECKPOINT_FILE if checkpoint_file is None else checkpoint_file
+    window = scrape_window()
+    if not window:
+        first_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        window = [add_months(first_month, month_idx) for month_idx in range(MONTHS_TO_SCRAPE)]
+    
+    print(f"\n🔍 Scraping {window[0]:%b %Y} to {window[-1]:%b %Y} ({len(window)} month(s)) over DevTools...\n")
+    
+    def scrape(month_starts, failures):
+        return iter_months_over_cdp(month_starts, username, password, failures, session_cache_file, profile_dir)
+    
+    if checkpoint_file:
+        return iter_months_resumable(window, scrape, checkpoint_file)
+    return scrape(window, {})
+
+
+def report_results(months, output_folder=".", month_state=None, show_instructions=True,
+                   state_file=None, feed_cache=None, history=None):
+    """Write each month's iCal file as soon as it is scraped, then print the import instructions
+    
+    months is a month iterator (iter_months and friends), so only one month's
+    bookings are held at a time and the first file appears right after the first
+    month. Only the month each page is for is written, not the overflow days of
+    the neighbouring months. With month_state, months that haven't changed since
+    the last run are skipped, and the state is saved after every month.
+    Every month is also pushed into feed_cache, if given, for run_server(), and
+    recorded in the history store, if given.
+    Returns (files written, bookings found).
+    """
+    created_files = []
+    total_bookings = 0
+    
+    for month_year, bookings in months:
+        month_key = month_key_from_header(month_year)
+        year, month = map(int, month_key.split('-'))
+        month_bookings = [b for b in bookings if (b.start.year, b.start.month) == (year, month)]
+        total_bookings += len(month_bookings)
+        
+        if feed_cache is not None:
+            feed_cache.update_month(month_key, unique_month_bookings(month_bookings))
+        
+        if history is not None:
+            history.record_month(month_key, month_bookings)
+        
+        if month_state is not None:
+            if not month_needs_writing(month_key, month_bookings, month_state, output_folder):
+                continue
+        elif not month_bookings:
+            continue
+        
+        month_name = datetime.strptime(month_key, '%Y-%m').strftime('%Y_%B')
+        created_files.append(write_month_ical(month_name, month_bookings, output_folder))
+        
+        if month_state is not None:
+            save_month_state(month_state, state_file)
+        print()
+    
+    if not show_instructions:
+        return created_files, total_bookings
+    
+    print("\n" + "=" * 60)
+    if created_files:
+        print("✨ Success! Next steps:")
+        print(f"\n📁 Created {len(created_files)} file(s):")
+        for filename in created_files:
+            print(f"   - {filename}")
+        print(f"\n📂 Location: {os.path.abspath(output_folder)}")
+        print("\n🔄 To import to Google Calendar:")
+        print("1. Go to https://calendar.google.com")
+        print("2. Click ⚙️ Settings → Settings")
+        print("3. Click 'Import & export' in left sidebar")
+        print("4. Click 'Select file from your computer'")
+        print("5. Import each .ics file (or select all at once)")
+        print("6. Choose which calendar to import into")
+        print("7. Click 'Import'")
+        print("\n💡 Tip: You can import all files at once by selecting them together!")
+    elif total_bookings:
+        print("✅ Nothing changed since the last run, no files written.")
+    else:
+        print("⚠️ No bookings found. This could mean:")
+        print("   - No bookings exist for these months")
+        print("   - CSS selectors need updating (ParentZone changed their UI)")
+        print("   - Page didn't load properly")
+        print("\n💡 Try running again with the browser visible:")
+        print("   Set BROWSER_PROFILE = \"full\" near the top of the script")
+    
+    return created_files, total_bookings
+
+
+def main():
+    """Main execution"""
+    print("=" * 60)
+    print("ParentZone Calendar Scraper")
+    print("=" * 60)
+    print()
+    
+    if PARENTZONE_USERNAME == "your_email@example.com":
+        print("❌ ERROR: Please edit the script and add your credentials!")
+        print("   Update PARENTZONE_USERNAME and PARENTZONE_PASSWORD")
+        input("\nPress Enter to exit...")
+        return
+    
+    driver = None
+    session = None
+    month_state = load_month_state() if MONTH_STATE_FILE else None
+    history = BookingHistory(HISTORY_DB_FILE) if HISTORY_DB_FILE else None
+    run_ok = False
+    total_bookings = None
+    TRACE.reset()
+    
+    try:
+        if SCRAPE_ENGINE == "http":
+            session = HttpSession()
+            if not ensure_http_login(session, PARENTZONE_USERNAME, PARENTZONE_PASSWORD):
+                print("❌ Login failed. Please check your credentials.")
+                input("\nPress Enter to exit...")
+                return
+            
+            months = iter_months_with_http(session)
+        elif SCRAPE_ENGINE == "cdp":
+            months = iter_months_with_cdp(PARENTZONE_USERNAME, PARENTZONE_PASSWORD)
+        else:
+            print("🌐 Starting Chrome browser...")
+            driver = acquire_driver()
+            
+            if not open_bookings_page(driver, PARENTZONE_USERNAME, PARENTZONE_PASSWORD):
+                print("❌ Login failed. Please check your credentials.")
+                input("\nPress Enter to exit...")
+                return
+            
+            months = iter_months_with_driver(driver, month_state)
+        
+        _, total_bookings = report_results(months, month_state=month_state, history=history)
+        report_wait_timings()
+        report_page_timings()
+        run_ok = True
+        
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        print("\nTroubleshooting tips:")
+        print("1. Make sure Chrome browser is installed")
+        print("2. Install chromedriver matching your Chrome version")
+        print("3. Check if ParentZone website structure changed")
+        print("4. Try running with browser visible (BROWSER_PROFILE = \"full\")")
+        if CHECKPOINT_FILE and os.path.exists(CHECKPOINT_FILE):
+            print("\n💾 The months scraped so far are saved, run the script again to carry on from there.")
+        
+    finally:
+        write_run_trace(run_ok, total_bookings)
+        if driver:
+            print("\n🔒 Closing browser...")
+            release_driver(driver, run_ok)
+        if session:
+            session.close()
+        if history:
+            history.close()
+        
+        print("\n" + "=" * 60)
+        input("Press Enter to exit...")
+
+
+class BookingHistory:
+    """SQLite store of every booking ever scraped, for history and reports
+    
+    Each scraped month replaces that month's rows in one transaction: current
+    bookings are upserted and ones no longer on ParentZone are deleted, so the
+    store always matches the site for the months it has seen.
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS bookings (
+        child_name   TEXT NOT NULL,
+        date         TEXT NOT NULL,
+        booked_start TEXT NOT NULL,
+        booked_end   TEXT NOT NULL,
+        start        TEXT NOT NULL,
+        end          TEXT NOT NULL,
+        month        TEXT NOT NULL,
+        scraped_at   TEXT NOT NULL,
+        PRIMARY KEY (child_name, booked_start)
+    );
+    CREATE INDEX IF NOT EXISTS bookings_child_date ON bookings (child_name, date);
+    CREATE INDEX IF NOT EXISTS bookings_date ON bookings (date);
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.SCHEMA)
+    
+    def close(self):
+        self.db.close()
+    
+    def record_month(self, month_key, bookings):
+        """Make the store's copy of a month match the bookings just scraped"""
+        scraped_at = datetime.now().isoformat(sep=' ')
+        rows = [
+            (
+                b.child_name,
+                b.booked_start.strftime('%Y-%m-%d'),
+                b.booked_start.isoformat(sep=' '),
+                b.booked_end.isoformat(sep=' '),
+                b.start.isoformat(sep=' '),
+                b.end.isoformat(sep=' '),
+                month_key,
+                scraped_at,
+            )
+            for b in bookings
+        ]
+        
+        with self.db:
+            self.db.executemany(
+                """
+                INSERT INTO bookings (child_name, date, booked_start, booked_end, start, end, month, scraped_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (child_name, booked_start) DO UPDATE SET
+                    booked_end = excluded.booked_end,
+                    start = excluded.start,
+                    end = excluded.end,
+                    scraped_at = excluded.scraped_at
+                """,
+                rows
+            )
+            self.db.execute(
+                "DELETE FROM bookings WHERE month = ? AND scraped_at <> ?",
+                (month_key, scraped_at)
+            )
+    
+    def record_bookings(self, bookings):
+        """Bulk load bookings from anywhere (e.g. re-parsed pages), one transaction per month"""
+        by_month = {}
+        for booking in bookings:
+            by_month.setdefault(booking.booked_start.strftime('%Y-%m'), []).append(booking)
+        for month_key in sorted(by_month):
+            self.record_month(month_key, unique_month_bookings(by_month[month_key]))
+    
+    def bookings(self, first_day, last_day, child_name=None):
+        """Bookings from first_day to last_day inclusive ('YYYY-MM-DD'), oldest first"""
+        query = ("SELECT child_name, start, end, booked_start, booked_end FROM bookings "
+                 "WHERE date BETWEEN ? AND ?")
+        params = [first_day, last_day]
+        if child_name:
+            query += " AND child_name = ?"
+            params.append(child_name)
+        query += " ORDER BY booked_start, child_name"
+        
+        return [
+            Booking(
+                child_name,
+                datetime.fromisoformat(start),
+                datetime.fromisoformat(end),
+                datetime.fromisoformat(booked_start),
+                datetime.fromisoformat(booked_end),
+            )
+            for child_name, start, end, booked_start, booked_end in self.db.execute(query, params)
+        ]
+    
+    def totals(self, first_day, last_day):
+        """(child, month, sessions, hours booked) for each child and month in the range"""
+        return self.db.execute(
+            """
+            SELECT child_name, substr(date, 1, 7) AS month, COUNT(*),
+                   ROUND(SUM(julianday(booked_end) - julianday(booked_start)) * 24, 2)
+            FROM bookings
+            WHERE date BETWEEN ? AND ?
+            GROUP BY child_name, month
+            ORDER BY child_name, month
+            """,
+            (first_day, last_day)
+        ).fetchall()
+
+
+def print_history_report(first_day, last_day, db_file=None):
+    """Print the sessions and hours booked per child and month from the history store"""
+    history = BookingHistory(db_file or HISTORY_DB_FILE)
+    try:
+        rows = history.totals(first_day, last_day)
+    finally:
+        history.close()
+    
+    print(f"📊 Bookings from {first_day} to {last_day}\n")
+    print(f"{'Child':<24} {'Month':<8} {'Sessions':>8} {'Hours':>8}")
+    
+    child_totals = {}
+    for child_name, month, sessions, hours in rows:
+        print(f"{child_name[:24]:<24} {month:<8} {sessions:>8} {hours:>8.2f}")
+        totals = child_totals.setdefault(child_name, [0, 0.0])
+        totals[0] += sessions
+        totals[1] += hours
+    
+    print()
+    for child_name, (sessions, hours) in child_totals.items():
+        print(f"{child_name[:24]:<24} {'total':<8} {sessions:>8} {hours:>8.2f}")
+
+
+def export_history(first_day, last_day, output_folder=".", db_file=None):
+    """Rebuild the iCal files for any date range from the history store, no scraping"""
+    history = BookingHistory(db_file or HISTORY_DB_FILE)
+    try:
+        bookings = history.bookings(first_day, last_day)
+    finally:
+        history.close()
+    
+    print(f"📂 {len(bookings)} booking(s) from {first_day} to {last_day} in the history store\n")
+    if bookings:
+        os.makedirs(output_folder, exist_ok=True)
+        generate_ical_per_month(bookings, output_folder)
+
+
+class SessionExpired(Exception):
+    """ParentZone sent the browser back to the login page (or the API turned the login down)"""
+
+
+def refresh_bookings_page(driver):
+    """Reload the bookings page on an already-running browser for the next poll"""
+    driver.get(PARENTZONE_BOOKINGS_URL)
+    if wait_for_bookings_page(driver) == 'login':
+        raise SessionExpired()
+
+
+def run_daemon(feed_cache=None):
+    """Keep a logged-in browser (or HTTP session) open and re-scrape on a schedule
+    
+    Each poll reloads the bookings page in the same browser instead of starting
+    Chrome again. If the browser crashes it is restarted; if the login has
+    expired it logs in again. Stop with Ctrl+C.
+    """
+    print("=" * 60)
+    print("ParentZone Calendar Scraper - daemon mode")
+    print(f"Polling every {POLL_INTERVAL_MINUTES} minute(s) (±{POLL_JITTER_SECONDS}s)")
+    print("=" * 60)
+    
+    if PARENTZONE_USERNAME == "your_email@example.com":
+        print("❌ ERROR: Please edit the script and add your credentials!")
+        return
     
-    # Comment out the headless line if you want to SEE the browser working
-    # chrome_options.add_argument("--headless")
+    driver = None
+    session = None
+    month_state = load_month_state() if MONTH_STATE_FILE else None
+    history = BookingHistory(HISTORY_DB_FILE) if HISTORY_DB_FILE else None
     
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
+    try:
+        while True:
+            cycle_started = time.perf_counter()
+            reset_ical_dtstamp()
+            TRACE.reset()
+            next_poll = POLL_INTERVAL_MINUTES * 60 + random.uniform(-POLL_JITTER_SECONDS, POLL_JITTER_SECONDS)
+            
+            try:
+                if SCRAPE_ENGINE == "http":
+                    session = session or HttpSession()
+                    if not ensure_http_login(session, PARENTZONE_USERNAME, PARENTZONE_PASSWORD):
+                        raise SessionExpired()
+                    # Every poll scrapes fresh, a failed one is simply retried at the next poll
+                    months = iter_months_with_http(session, checkpoint_file="")
+                elif SCRAPE_ENGINE == "cdp":
+                    # Starts its own Chrome each poll, so there is no browser to keep alive
+                    months = iter_months_with_cdp(PARENTZONE_USERNAME, PARENTZONE_PASSWORD, checkpoint_file="")
+                else:
+                    if driver is None:
+                        print("🌐 Starting Chrome browser...")
+                        driver = acquire_driver(headless=True)
+                        if not open_bookings_page(driver, PARENTZONE_USERNAME, PARENTZONE_PASSWORD):
+                            raise SessionExpired()
+                    else:
+                        try:
+                            refresh_bookings_page(driver)
+                        except SessionExpired:
+                            print("🔑 Session expired, logging in again...")
+                            clear_session_cache()
+                            if not open_bookings_page(driver, PARENTZONE_USERNAME, PARENTZONE_PASSWORD):
+                                raise
+                    
+                    # Every poll scrapes fresh, a failed one is simply retried at the next poll
+                    months = iter_months_with_driver(driver, month_state, checkpoint_file="")
+                
+                _, total_bookings = report_results(months, month_state=month_state, show_instructions=False,
+                                                   feed_cache=feed_cache, history=history)
+                report_wait_timings()
+                report_page_timings()
+                write_run_trace(True, total_bookings)
+                WAIT_TIMINGS.clear()
+                PAGE_TIMINGS.clear()
+                print(f"\n🔁 Poll finished in {time.perf_counter() - cycle_started:.1f}s")
+            
+            except SessionExpired:
+                write_run_trace(False)
+                WAIT_TIMINGS.clear()
+                PAGE_TIMINGS.clear()
+                print("❌ Login failed, will try again next poll.")
+                if session:
+                    session.close()
+                    session = None
+            
+            except Exception as e:
+                write_run_trace(False)
+                WAIT_TIMINGS.clear()
+                PAGE_TIMINGS.clear()
+                print(f"\n❌ Poll failed: {e}")
+                if driver:
+                    print("♻️ Restarting the browser...")
+                    release_driver(driver, healthy=False)
+                    driver = None
+                if session:
+                    session.close()
+                    session = None
+                next_poll = min(next_poll, DAEMON_RETRY_SECONDS)
+            
+            next_poll = max(next_poll, 0)
+            print(f"💤 Next poll at {(datetime.now() + timedelta(seconds=next_poll)).strftime('%H:%M:%S')}\n")
+            time.sleep(next_poll)
     
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
+    except KeyboardInterrupt:
+        print("\n👋 Stopping daemon...")
+    
+    finally:
+        if driver:
+            release_driver(driver)
+        if session:
+            session.close()
+        if history:
+            history.close()
 
 
-def login_to_parentzone(driver, username, password):
-    """Log into ParentZone"""
-    print("🔐 Logging into ParentZone...")
-    driver.get(PARENTZONE_LOGIN_URL)
+class FeedCache:
+    """In-memory copy of the current calendars, served by run_server()
     
-    wait = WebDriverWait(driver, 15)
+    A feed is only re-rendered when its bookings change. Its ETag comes from
+    the bookings' fingerprint rather than the file bytes (DTSTAMP changes every
+    run), so subscribed calendar apps keep getting 304 until a booking moves.
+    """
     
-    try:
-        email_field = wait.until(EC.presence_of_element_located((By.NAME, "email")))
-        email_field.clear()
-        email_field.send_keys(username)
+    COMBINED = 'all'
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._months = {}
+        self._feeds = {}
+    
+    def update_month(self, month_key, bookings):
+        """Replace a month's bookings; returns True if anything changed"""
+        fingerprint = month_fingerprint(month_event_rows(bookings))
         
-        password_field = driver.find_element(By.NAME, "password")
-        password_field.clear()
-        password_field.send_keys(password)
+        with self._lock:
+            saved = self._months.get(month_key)
+            if saved and saved[0] == fingerprint:
+                return False
+            months = dict(self._months)
         
-        login_button = driver.find_element(By.XPATH, "//button[@type='submit']")
-        login_button.click()
+        months[month_key] = (fingerprint, bookings)
+        month_name = datetime.strptime(month_key, '%Y-%m').strftime('%Y %B')
+        month_feed = self._render(f"ParentZone {month_name}", bookings, fingerprint)
         
-        time.sleep(5)
-        print("✅ Login successful!")
-        return True
+        combined_fingerprint = hashlib.sha256(
+            ''.join(months[key][0] for key in sorted(months)).encode('utf-8')
+        ).hexdigest()
+        combined_bookings = [b for key in sorted(months) for b in months[key][1]]
+        combined_feed = self._render("ParentZone", combined_bookings, combined_fingerprint)
         
-    except Exception as e:
-        print(f"❌ Login failed: {e}")
-        return False
+        with self._lock:
+            self._months = months
+            self._feeds[month_key] = month_feed
+            self._feeds[self.COMBINED] = combined_feed
+        return True
+    
+    def get(self, name):
+        with self._lock:
+            return self._feeds.get(name)
+    
+    @property
+    def ready(self):
+        with self._lock:
+            return bool(self._feeds)
+    
+    @staticmethod
+    def _render(calendar_name, bookings, fingerprint):
+        buffer = io.StringIO()
+        write_ical(buffer, calendar_name, bookings)
+        body = buffer.getvalue().encode('utf-8')
+        modified = time.time()
+        return {
+            'body': body,
+            'gzip': gzip.compress(body),
+            'etag': f'"{fingerprint[:32]}"',
+            'modified': int(modified),
+            'last_modified': formatdate(modified, usegmt=True),
+        }
 
 
-def extract_bookings_from_page(driver):
-    """Extract bookings from the current calendar view"""
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    """Serves /calendar.ics (every month) and /calendar/YYYY-MM.ics from the FeedCache"""
     
-    wait = WebDriverWait(driver, 15)
+    server_version = "ParentZoneFeed/1.0"
     
-    try:
-        wait.until(EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "h6.MuiTypography-root.MuiTypography-h6.MuiTypography-noWrap.css-1dw86cl-titleWithButtons")
-        ))
-    except:
-        print("⚠️ Calendar not loaded properly, waiting longer...")
-        time.sleep(5)
+    def do_GET(self):
+        self._serve(include_body=True)
     
-    bookings = []
+    def do_HEAD(self):
+        self._serve(include_body=False)
     
-    try:
-        month_year_element = driver.find_element(
-            By.CSS_SELECTOR, 
-            "h6.MuiTypography-root.MuiTypography-h6.MuiTypography-noWrap.css-1dw86cl-titleWithButtons"
-        )
-        full_text = month_year_element.text.strip()
-        month_year_str = full_text.replace('Bookings - ', '').strip()
-        
-        parts = month_year_str.split(' ')
-        if len(parts) != 2:
-            print(f"⚠️ Could not parse month/year: {month_year_str}")
-            return bookings
-        
-        month_abbrev = parts[0]
-        year_str = parts[1]
+    def _serve(self, include_body):
+        feed_cache = self.server.feed_cache
+        path = urlsplit(self.path).path
         
-        month_map = {
-            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-        }
+        month_match = re.fullmatch(r'/calendar/(\d{4}-\d{2})\.ics', path)
+        if path in ('/', '/calendar.ics'):
+            feed = feed_cache.get(FeedCache.COMBINED)
+        elif month_match:
+            feed = feed_cache.get(month_match.group(1))
+        else:
+            self.send_error(404)
+            return
         
-        current_month = month_map.get(month_abbrev)
-        current_year = int(year_str)
+        if feed is None:
+            if feed_cache.ready:
+                self.send_error(404)
+            else:
+                self.send_response(503)
+                self.send_header('Retry-After', '60')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            return
         
-        if not current_month:
-            print(f"⚠️ Invalid month abbreviation: {month_abbrev}")
-            return bookings
+        if self._not_modified(feed):
+            self.send_response(304)
+            self._send_cache_headers(feed)
+            self.end_headers()
+            return
         
-        print(f"📅 Processing {month_abbrev} {current_year}...")
+        use_gzip = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+        body = feed['gzip'] if use_gzip else feed['body']
         
-        day_elements = driver.find_elements(
-            By.CSS_SELECTOR, 
-            "div.css-1btmizi-day.css-1eqmmqv-dayDesktop.css-1ke78x2-dayBorder"
-        )
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/calendar; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self._send_cache_headers(feed)
+        self.end_headers()
         
-        print(f"  Found {len(day_elements)} day elements")
+        if include_body:
+            self.wfile.write(body)
+    
+    def _not_modified(self, feed):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or feed['etag'] in tags or f"W/{feed['etag']}" in tags
         
-        for day_el in day_elements:
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
             try:
-                date_element = day_el.find_element(
-                    By.CSS_SELECTOR,
-                    "p.MuiTypography-root.MuiTypography-body2.css-68o8xu"
-                )
-                date_text = date_element.text.strip()
-                
-                if not date_text:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= feed['modified']
+            except (TypeError, ValueError):
+                return False
+        
+        return False
+    
+    def _send_cache_headers(self, feed):
+        self.send_header('ETag', feed['etag'])
+        self.send_header('Last-Modified', feed['last_modified'])
+        self.send_header('Cache-Control', f"max-age={SERVER_MAX_AGE_SECONDS}")
+        self.send_header('Vary', 'Accept-Encoding')
+    
+    def log_message(self, format, *args):
+        print(f"🌍 {self.address_string()} {format % args}")
+
+
+def start_feed_server(feed_cache, host=None, port=None):
+    """Start serving feed_cache over HTTP on a background thread"""
+    server = ThreadingHTTPServer((host or SERVER_HOST, SERVER_PORT if port is None else port), FeedRequestHandler)
+    server.daemon_threads = True
+    server.feed_cache = feed_cache
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_server():
+    """Serve the calendars for subscription while the daemon keeps them fresh
+    
+    Feed requests are answered from memory only; they never trigger a scrape.
+    """
+    feed_cache = FeedCache()
+    server = start_feed_server(feed_cache)
+    host, port = server.server_address[:2]
+    
+    print(f"📡 Calendar feed: http://{host}:{port}/calendar.ics")
+    print(f"   One month:     http://{host}:{port}/calendar/YYYY-MM.ics")
+    print("   Subscribe to it in Google Calendar with 'Other calendars → From URL'.\n")
+    
+    try:
+        run_daemon(feed_cache=feed_cache)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def process_table():
+    """{pid: (parent pid, memory in bytes)} for every running process, {} if unknown"""
+    table = {}
+    try:
+        if sys.platform.startswith('linux'):
+            page_size = os.sysconf('SC_PAGE_SIZE')
+            for entry in os.listdir('/proc'):
+                if not entry.isdigit():
                     continue
-                
-                date_parts = date_text.split(' ')
-                day_number = int(date_parts[0])
-                
-                day_month = current_month
-                day_year = current_year
-                
-                if len(date_parts) > 1:
-                    day_month_abbrev = date_parts[1]
-                    day_month = month_map.get(day_month_abbrev, current_month)
-                    
-                    if day_month_abbrev == 'Dec' and month_abbrev == 'Jan':
-                        day_year = current_year - 1
-                    elif day_month_abbrev == 'Jan' and month_abbrev == 'Dec':
-                        day_year = current_year + 1
-                
-                booking_containers = day_el.find_elements(
-                    By.CSS_SELECTOR,
-                    "div.css-jvibwz-buttonContainer"
-                )
-                
-                if booking_containers:
-                    print(f"  Day {date_text}: Found {len(booking_containers)} booking(s)")
-                
-                day_bookings = []
-                
-                for container in booking_containers:
-                    try:
-                        child_name_el = container.find_element(
-                            By.CSS_SELECTOR,
-                            "span.css-cypr81-childName"
-                        )
-                        child_name = child_name_el.text.strip() if child_name_el else "Felicity Nursery"
-                        
-                        session_time_el = container.find_element(
-                            By.CSS_SELECTOR,
-                            "span.css-11fzqss-sessionTime"
-                        )
-                        session_time = session_time_el.text.strip()
-                        
-                        if not session_time:
-                            continue
-                        
-                        time_match = re.search(r'(\d{1,2}:\d{2})\s*-\s*(\d{1,2}:\d{2})', session_time)
-                        if not time_match:
-                            print(f"    ⚠️ Could not parse time: {session_time}")
-                            continue
-                        
-                        start_time = time_match.group(1)
-                        end_time = time_match.group(2)
-                        
-                        date_str = f"{day_year}-{day_month:02d}-{day_number:02d}"
-                        start_datetime = datetime.strptime(f"{date_str} {start_time}", "%Y-%m-%d %H:%M")
-                        end_datetime = datetime.strptime(f"{date_str} {end_time}", "%Y-%m-%d %H:%M")
-                        
-                        day_bookings.append({
-                            'child_name': child_name,
-                            'start': start_datetime,
-                            'end': end_datetime
-                        })
-                        
-                    except Exception as e:
-                        print(f"    ⚠️ Failed to parse booking: {e}")
-                        continue
-                
-                if day_bookings:
-                    day_bookings.sort(key=lambda x: x['start'])
-                    
-                    i = 0
-                    while i < len(day_bookings):
-                        current = day_bookings[i]
-                        combined_start = current['start']
-                        combined_end = current['end']
-                        child_name = current['child_name']
-                        
-                        j = i + 1
-                        while j < len(day_bookings):
-                            next_booking = day_bookings[j]
-                            if (next_booking['child_name'] == child_name and 
-                                combined_end == next_booking['start']):
-                                combined_end = next_booking['end']
-                                j += 1
-                            else:
-                                break
-                        
-                        if USE_ACTUAL_TIMES:
-                            event_start = combined_start
-                            event_end = combined_end
-                        else:
-                            reminder_hour, reminder_minute = map(int, REMINDER_TIME.split(':'))
-                            event_start = combined_start.replace(hour=reminder_hour, minute=reminder_minute)
-                            event_end = event_start + timedelta(minutes=REMINDER_DURATION_MINUTES)
-                        
-                        if INCLUDE_TIME_IN_SUMMARY:
-                            start_hour = combined_start.hour
-                            end_hour = combined_end.hour
-                            
-                            if start_hour == 0:
-                                start_12h = "12am"
-                            elif start_hour < 12:
-                                start_12h = f"{start_hour}am"
-                            elif start_hour == 12:
-                                start_12h = "12pm"
-                            else:
-                                start_12h = f"{start_hour - 12}pm"
-                            
-                            if end_hour == 0:
-                                end_12h = "12am"
-                            elif end_hour < 12:
-                                end_12h = f"{end_hour}am"
-                            elif end_hour == 12:
-                                end_12h = "12pm"
-                            else:
-                                end_12h = f"{end_hour - 12}pm"
-                            
-                            time_str = f"{start_12h}-{end_12h}"
-                            summary = f"{child_name} {time_str}"
-                        else:
-                            summary = child_name
-                        
-                        bookings.append({
-                            'summary': summary,
-                            'start': event_start,
-                            'end': event_end,
-                            'description': f'ParentZone booking: {child_name} ({combined_start.strftime("%H:%M")}-{combined_end.strftime("%H:%M")})',
-                            'original_start': combined_start.strftime("%H:%M"),
-                            'original_end': combined_end.strftime("%H:%M")
-                        })
-                        
-                        print(f"    ✓ {summary}")
-                        i = j
-                    
-            except Exception as e:
-                continue
+                try:
+                    with open(f'/proc/{entry}/stat', 'r') as f:
+                        fields = f.read().rsplit(')', 1)[1].split()
+                except OSError:
+                    continue
+                table[int(entry)] = (int(fields[1]), int(fields[21]) * page_size)
         
-        print(f"  Total: {len(bookings)} booking(s) this month\n")
+        elif os.name == 'nt':
+            output = subprocess.run(
+                ['powershell', '-NoProfile', '-Command',
+                 'Get-CimInstance Win32_Process | ForEach-Object '
+                 '{ "$($_.ProcessId) $($_.ParentProcessId) $($_.WorkingSetSize)" }'],
+                capture_output=True, text=True, timeout=60
+            ).stdout
+            for line in output.splitlines():
+                parts = line.split()
+                if len(parts) == 3:
+                    table[int(parts[0])] = (int(parts[1]), int(parts[2]))
         
-    except Exception as e:
-        print(f"❌ Error extracting bookings: {e}")
+        else:
+            output = subprocess.run(['ps', '-A', '-o', 'pid=,ppid=,rss='],
+                                    capture_output=True, text=True, timeout=60).stdout
+            for line in output.splitlines():
+                parts = line.split()
+                if len(parts) == 3:
+                    table[int(parts[0])] = (int(parts[1]), int(parts[2]) * 1024)
     
-    return bookings
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return {}
+    return table
 
 
-def click_next_month(driver):
-    """Click the next month button and wait for page to update"""
-    try:
-        month_year_element = driver.find_element(
-            By.CSS_SELECTOR, 
-            "h6.MuiTypography-root.MuiTypography-h6.MuiTypography-noWrap.css-1dw86cl-titleWithButtons"
-        )
-        old_month_year = month_year_element.text.replace('Bookings - ', '').strip()
+def process_tree_memory_mb(pid, table=None):
+    """Memory used by a process and everything it started (Chrome is many processes)"""
+    table = process_table() if table is None else table
+    children = {}
+    for child, (parent, _) in table.items():
+        children.setdefault(parent, []).append(child)
+    
+    total = 0
+    todo = [pid]
+    while todo:
+        current = todo.pop()
+        if current in table:
+            total += table[current][1]
+        todo.extend(children.get(current, []))
+    return total / (1024 * 1024)
+
+
+class BrowserPool:
+    """Warm, logged-in headless browsers that runs can borrow and give back
+    
+    Each browser has its own profile folder and debugging port. A run borrows
+    one, attaches to it with attach_driver() and returns it when done. Idle
+    browsers are health-checked every BROWSER_HEALTH_CHECK_SECONDS and are
+    restarted when they stop answering, after BROWSER_MAX_USES borrows, or
+    when they use more than BROWSER_MAX_MEMORY_MB.
+    """
+    
+    def __init__(self, size=None):
+        self.size = size or BROWSER_POOL_SIZE
+        self.lock = threading.Condition()
+        self.browsers = {}
+        self.next_id = 1
+        self.closing = False
+        self.stats_counters = {
+            'borrowed': 0, 'returned': 0, 'turned_away': 0,
+            'recycled': {}, 'start_failures': 0, 'total_wait_seconds': 0.0,
+        }
+    
+    def start(self):
+        """Start every browser (in parallel) and the health-check thread"""
+        with ThreadPoolExecutor(max_workers=self.size) as starter:
+            list(starter.map(lambda slot: self._start_browser(slot), range(self.size)))
+        threading.Thread(target=self._health_loop, daemon=True).start()
+    
+    def _start_browser(self, slot):
+        """Launch and log in the browser for one pool slot"""
+        slot_folder = os.path.join(BROWSER_POOL_FOLDER, f"browser_{slot + 1}")
+        port = BROWSER_POOL_FIRST_DEBUG_PORT + slot
         
-        next_button = None
+        with self.lock:
+            browser_id = self.next_id
+            self.next_id += 1
+            self.browsers[browser_id] = {
+                'id': browser_id, 'slot': slot, 'port': port, 'driver': None,
+                'state': 'starting', 'uses': 0, 'started': time.time(),
+                'borrowed_at': None, 'memory_mb': None,
+            }
         
+        driver = None
         try:
-            next_button = driver.find_element(By.CSS_SELECTOR, 'button[data-test-id="next_btn"]')
-            print(f"  Found next month button via data-test-id")
-        except:
-            try:
-                next_button = driver.find_element(
-                    By.CSS_SELECTOR,
-                    "button.MuiButtonBase-root.MuiIconButton-root.MuiIconButton-sizeSmall.css-1j7qk7u"
-                )
-                print(f"  Found next month button via CSS classes")
-            except:
-                try:
-                    chevron_icon = driver.find_element(By.CSS_SELECTOR, 'svg[data-testid="ChevronRightIcon"]')
-                    next_button = chevron_icon.find_element(By.XPATH, "..")
-                    print(f"  Found next month button via ChevronRightIcon")
-                except:
-                    pass
+            driver = setup_driver(headless=True, profile_dir=os.path.join(slot_folder, 'chrome_profile'),
+                                  debugging_port=port)
+            session_cache_file = os.path.join(slot_folder, 'session.json') if SESSION_CACHE_FILE else None
+            if not open_bookings_page(driver, PARENTZONE_USERNAME, PARENTZONE_PASSWORD, session_cache_file):
+                raise RuntimeError("login failed")
+            if not self._healthy({'port': port}):
+                raise RuntimeError(f"not answering on port {port}")
+        except Exception as e:
+            print(f"⚠️ Pool browser {slot + 1} didn't start, trying again later: {e}")
+            if driver:
+                driver.quit()
+            with self.lock:
+                self.browsers.pop(browser_id, None)
+                self.stats_counters['start_failures'] += 1
+            return
         
-        if not next_button:
-            print("⚠️ Could not find next month button")
-            return False
+        with self.lock:
+            browser = self.browsers.get(browser_id)
+            if browser is not None and not self.closing:
+                browser['driver'] = driver
+                browser['state'] = 'idle'
+                self.lock.notify_all()
+        
+        if browser is None or self.closing:
+            driver.quit()
+            return
+        print(f"🏊 Pool browser #{browser_id} ready on port {port}")
+    
+    def _recycle(self, browser, reason, expected_state):
+        """Close a browser and start a fresh one in its slot, in the background
         
-        next_button.click()
+        Nothing happens if the browser has moved on from expected_state meanwhile
+        (e.g. the health check and a borrow picked the same idle browser).
+        """
+        with self.lock:
+            if browser['state'] != expected_state:
+                return
+            browser['state'] = 'recycling'
+            recycled = self.stats_counters['recycled']
+            recycled[reason] = recycled.get(reason, 0) + 1
         
-        wait = WebDriverWait(driver, 5)
+        print(f"♻️ Restarting pool browser #{browser['id']} ({reason})")
         
-        def month_changed(driver):
+        def replace():
             try:
-                element = driver.find_element(
-                    By.CSS_SELECTOR,
-                    "h6.MuiTypography-root.MuiTypography-h6.MuiTypography-noWrap.css-1dw86cl-titleWithButtons"
-                )
-                new_month_year = element.text.replace('Bookings - ', '').strip()
-                return new_month_year != old_month_year
-            except:
-                return False
+                browser['driver'].quit()
+            except Exception:
+                pass
+            # The old entry holds the slot until the new browser has started,
+            # so the health check doesn't start a second one for it
+            if not self.closing:
+                self._start_browser(browser['slot'])
+            with self.lock:
+                self.browsers.pop(browser['id'], None)
         
-        wait.until(month_changed)
-        time.sleep(1)
+        threading.Thread(target=replace, daemon=True).start()
+    
+    def borrow(self, wait_seconds=None):
+        """Hand out an idle, healthy browser; None if none frees up in time"""
+        wait_seconds = BROWSER_POOL_WAIT_SECONDS if wait_seconds is None else wait_seconds
+        started = time.perf_counter()
+        deadline = time.monotonic() + wait_seconds
         
-        print(f"  ➡️ Advanced to next month")
-        return True
+        while True:
+            with self.lock:
+                while True:
+                    idle = [b for b in self.browsers.values() if b['state'] == 'idle']
+                    if idle:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats_counters['turned_away'] += 1
+                        return None
+                    self.lock.wait(remaining)
+                
+                # Least used first, so the pool wears evenly
+                browser = min(idle, key=lambda b: b['uses'])
+                browser['state'] = 'checking'
+            
+            if self._healthy(browser):
+                break
+            self._recycle(browser, 'not responding', 'checking')
         
-    except Exception as e:
-        print(f"⚠️ Could not advance to next month: {e}")
-        return False
-
-
-def generate_ical_per_month(all_bookings, output_folder="."):
-    """Generate separate iCal files for each month"""
-    
-    bookings_by_month = {}
-    
-    for booking in all_bookings:
-        month_key = booking['start'].strftime('%Y-%m')
-        month_name = booking['start'].strftime('%Y_%B')
+        with self.lock:
+            browser['state'] = 'borrowed'
+            browser['borrowed_at'] = time.time()
+            self.stats_counters['borrowed'] += 1
+            self.stats_counters['total_wait_seconds'] += time.perf_counter() - started
         
-        if month_key not in bookings_by_month:
-            bookings_by_month[month_key] = {
-                'name': month_name,
-                'bookings': []
-            }
+        return {
+            'id': browser['id'],
+            'debugger_address': f"127.0.0.1:{browser['port']}",
+            'uses': browser['uses'],
+        }
+    
+    def give_back(self, browser_id, healthy=True):
+        with self.lock:
+            browser = self.browsers.get(browser_id)
+            if not browser or browser['state'] != 'borrowed':
+                return False
+            browser['uses'] += 1
+            browser['borrowed_at'] = None
+            self.stats_counters['returned'] += 1
         
-        bookings_by_month[month_key]['bookings'].append(booking)
+        if not healthy:
+            self._recycle(browser, 'run failed', 'borrowed')
+        elif browser['uses'] >= BROWSER_MAX_USES:
+            self._recycle(browser, 'max uses', 'borrowed')
+        else:
+            with self.lock:
+                browser['state'] = 'idle'
+                self.lock.notify_all()
+        return True
     
-    created_files = []
+    def _healthy(self, browser):
+        """Is the browser still answering on its debugging port?"""
+        connection = http.client.HTTPConnection('127.0.0.1', browser['port'], timeout=5)
+        try:
+            connection.request('GET', '/json/version')
+            return connection.getresponse().status == 200
+        except OSError:
+            return False
+        finally:
+            connection.close()
     
-    for month_key in sorted(bookings_by_month.keys()):
-        month_data = bookings_by_month[month_key]
-        month_bookings = month_data['bookings']
-        month_name = month_data['name']
-        
-        seen = set()
-        unique_bookings = []
-        
-        for booking in month_bookings:
-            original_start = booking.get('original_start', booking['start'].strftime('%H:%M'))
-            original_end = booking.get('original_end', booking['end'].strftime('%H:%M'))
-            date_str = booking['start'].strftime('%Y-%m-%d')
-            
-            booking_key = (
-                booking['summary'],
-                date_str,
-                original_start,
-                original_end
-            )
+    def _health_loop(self):
+        while not self.closing:
+            time.sleep(BROWSER_HEALTH_CHECK_SECONDS)
+            table = process_table()
+            lease_limit = time.time() - BROWSER_LEASE_MAX_MINUTES * 60
+            
+            with self.lock:
+                browsers = list(self.browsers.values())
+            
+            # Slots whose browser failed to start get another go each round
+            for slot in set(range(self.size)) - {b['slot'] for b in browsers}:
+                threading.Thread(target=self._start_browser, args=(slot,), daemon=True).start()
             
-            if booking_key not in seen:
-                seen.add(booking_key)
-                unique_bookings.append(booking)
+            for browser in browsers:
+                driver = browser['driver']
+                if driver is None:
+                    continue
+                
+                chromedriver = getattr(driver.service, 'process', None)
+                if table and chromedriver:
+                    browser['memory_mb'] = round(process_tree_memory_mb(chromedriver.pid, table), 1)
+                
+                if browser['state'] == 'borrowed':
+                    if browser['borrowed_at'] and browser['borrowed_at'] < lease_limit:
+                        self._recycle(browser, 'never returned', 'borrowed')
+                    continue
+                
+                if browser['state'] != 'idle':
+                    continue
+                
+                if not self._healthy(browser):
+                    self._recycle(browser, 'not responding', 'idle')
+                elif browser['memory_mb'] and browser['memory_mb'] > BROWSER_MAX_MEMORY_MB:
+                    self._recycle(browser, 'memory', 'idle')
+    
+    def stats(self):
+        """Pool statistics, as served on /stats"""
+        with self.lock:
+            counters = dict(self.stats_counters, recycled=dict(self.stats_counters['recycled']))
+            browsers = [
+                {
+                    'id': b['id'], 'state': b['state'], 'port': b['port'], 'uses': b['uses'],
+                    'age_minutes': round((time.time() - b['started']) / 60, 1),
+                    'memory_mb': b['memory_mb'],
+                }
+                for b in sorted(self.browsers.values(), key=lambda b: b['id'])
+            ]
         
-        duplicates_removed = len(month_bookings) - len(unique_bookings)
+        borrowed = counters['borrowed']
+        counters['average_wait_seconds'] = round(counters.pop('total_wait_seconds') / borrowed, 3) if borrowed else 0.0
+        return {
+            'size': self.size,
+            'idle': sum(1 for b in browsers if b['state'] == 'idle'),
+            'borrowed_now': sum(1 for b in browsers if b['state'] == 'borrowed'),
+            **counters,
+            'browsers': browsers,
+        }
+    
+    def close(self):
+        with self.lock:
+            self.closing = True
+            browsers = list(self.browsers.values())
+            self.browsers.clear()
+        for browser in browsers:
+            if browser['driver']:
+                try:
+                    browser['driver'].quit()
+                except Exception:
+                    pass
+
+
+class PoolRequestHandler(BaseHTTPRequestHandler):
+    """POST /borrow, POST /return?id=N&healthy=1 and GET /stats for the BrowserPool"""
+    
+    server_version = "ParentZonePool/1.0"
+    
+    def do_GET(self):
+        if urlsplit(self.path).path == '/stats':
+            self._send_json(200, self.server.browser_pool.stats())
+        else:
+            self.send_error(404)
+    
+    def do_POST(self):
+        url = urlsplit(self.path)
+        query = dict(part.split('=', 1) for part in url.query.split('&') if '=' in part)
         
-        filename = f"parentzone_bookings_{month_name}.ics"
-        filepath = os.path.join(output_folder, filename)
+        if url.path == '/borrow':
+            lease = self.server.browser_pool.borrow()
+            if lease:
+                self._send_json(200, lease)
+            else:
+                self._send_json(503, {'error': 'no browser free'})
         
-        ical_content = [
-            "BEGIN:VCALENDAR",
-            "VERSION:2.0",
-            "PRODID:-//ParentZone Scraper//EN",
-            "CALSCALE:GREGORIAN",
-            "METHOD:PUBLISH",
-            f"X-WR-CALNAME:ParentZone {month_name.replace('_', ' ')}",
-            "X-WR-TIMEZONE:Europe/London",
-        ]
+        elif url.path == '/return' and query.get('id', '').isdigit():
+            returned = self.server.browser_pool.give_back(int(query['id']), query.get('healthy') != '0')
+            self._send_json(200 if returned else 404, {'returned': returned})
         
-        for idx, booking in enumerate(unique_bookings):
-            original_start = booking.get('original_start', booking['start'].strftime('%H:%M'))
-            original_end = booking.get('original_end', booking['end'].strftime('%H:%M'))
-            date_str = booking['start'].strftime('%Y%m%d')
-            uid = f"parentzone-{date_str}-{original_start.replace(':', '')}-{idx}@parentzone.me"
-            
-            dtstart = booking['start'].strftime('%Y%m%dT%H%M%S')
-            dtend = booking['end'].strftime('%Y%m%dT%H%M%S')
-            dtstamp = datetime.now().strftime('%Y%m%dT%H%M%SZ')
-            
-            ical_content.extend([
-                "BEGIN:VEVENT",
-                f"UID:{uid}",
-                f"DTSTAMP:{dtstamp}",
-                f"DTSTART:{dtstart}",
-                f"DTEND:{dtend}",
-                f"SUMMARY:{booking['summary']}",
-                f"DESCRIPTION:{booking['description']}",
-                "STATUS:CONFIRMED",
-                "END:VEVENT"
-            ])
-        
-        ical_content.append("END:VCALENDAR")
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(ical_content))
-        
-        created_files.append(filename)
-        
-        print(f"✅ Created: {filename}")
-        print(f"   📊 {len(unique_bookings)} unique event(s)", end="")
-        if duplicates_removed > 0:
-            print(f" ({duplicates_removed} duplicate(s) removed)")
         else:
-            print()
+            self.send_error(404)
     
-    return created_files
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
 
 
-def main():
-    """Main execution"""
+def run_pool():
+    """Keep BROWSER_POOL_SIZE logged-in browsers warm for other runs to borrow"""
     print("=" * 60)
-    print("ParentZone Calendar Scraper")
+    print("ParentZone Calendar Scraper - browser pool")
     print("=" * 60)
-    print()
     
     if PARENTZONE_USERNAME == "your_email@example.com":
         print("❌ ERROR: Please edit the script and add your credentials!")
-        print("   Update PARENTZONE_USERNAME and PARENTZONE_PASSWORD")
-        input("\nPress Enter to exit...")
         return
     
+    browser_pool = BrowserPool()
+    print(f"\n🌐 Starting {browser_pool.size} browser(s)...")
+    browser_pool.start()
+    
+    server = ThreadingHTTPServer(('127.0.0.1', BROWSER_POOL_PORT), PoolRequestHandler)
+    server.daemon_threads = True
+    server.browser_pool = browser_pool
+    
+    print(f"\n🏊 Pool ready: set BROWSER_POOL_URL = \"http://127.0.0.1:{BROWSER_POOL_PORT}\" for runs to use it")
+    print(f"   Stats: http://127.0.0.1:{BROWSER_POOL_PORT}/stats")
+    print("   Stop with Ctrl+C.\n")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping browser pool...")
+    finally:
+        server.server_close()
+        browser_pool.close()
+
+
+def load_accounts(accounts_file):
+    """Read the account list for batch mode
+    
+    The file is JSON: [{"name": "...", "username": "...", "password": "..."}, ...]
+    "name" is used for the account's folder and defaults to the username.
+    """
+    with open(accounts_file, 'r', encoding='utf-8') as f:
+        accounts = json.load(f)
+    
+    for account in accounts:
+        account.setdefault('name', account['username'])
+        account['name'] = re.sub(r'[^A-Za-z0-9_.-]+', '_', account['name'])
+    return accounts
+
+
+def scrape_account(account):
+    """Scrape one account of a batch into its own folder
+    
+    Every account gets its own output folder, browser profile, session cache
+    and month state, so accounts never share a login.
+    """
+    name = account['name']
+    account_folder = os.path.join(BATCH_OUTPUT_FOLDER, name)
+    os.makedirs(account_folder, exist_ok=True)
+    session_cache_file = os.path.join(account_folder, 'session.json') if SESSION_CACHE_FILE else None
+    state_file = os.path.join(account_folder, 'state.json') if MONTH_STATE_FILE else None
+    checkpoint_file = os.path.join(account_folder, 'checkpoint.json') if CHECKPOINT_FILE else ""
+    history = BookingHistory(os.path.join(account_folder, 'history.db')) if HISTORY_DB_FILE else None
+    
+    result = {'name': name, 'status': 'ok', 'bookings': 0, 'files': 0, 'seconds': 0.0}
+    started = time.perf_counter()
     driver = None
-    all_bookings = []
-    scraped_months = []
+    session = None
+    month_state = load_month_state(state_file) if state_file else None
     
     try:
-        print("🌐 Starting Chrome browser...")
-        driver = setup_driver()
-        
-        if not login_to_parentzone(driver, PARENTZONE_USERNAME, PARENTZONE_PASSWORD):
-            print("❌ Login failed. Please check your credentials.")
-            input("\nPress Enter to exit...")
-            return
-        
-        print("📆 Navigating to bookings page...")
-        driver.get(PARENTZONE_BOOKINGS_URL)
-        time.sleep(5)
-        
-        print(f"\n🔍 Scraping up to {MONTHS_TO_SCRAPE} month(s)...\n")
-        
-        for month_idx in range(MONTHS_TO_SCRAPE):
-            try:
-                month_year_element = driver.find_element(
-                    By.CSS_SELECTOR,
-                    "h6.MuiTypography-root.MuiTypography-h6.MuiTypography-noWrap.css-1dw86cl-titleWithButtons"
-                )
-                current_month_year = month_year_element.text.replace('Bookings - ', '').strip()
-                
-                if current_month_year in scraped_months:
-                    print(f"⚠️ Already scraped {current_month_year}, stopping to avoid duplicates.")
-                    break
-                
-                scraped_months.append(current_month_year)
-                
-            except:
-                print("⚠️ Could not read current month, stopping.")
-                break
-            
-            bookings = extract_bookings_from_page(driver)
-            all_bookings.extend(bookings)
-            
-            if month_idx < MONTHS_TO_SCRAPE - 1:
-                if not click_next_month(driver):
-                    print("⚠️ Could not navigate further, stopping here.")
-                    break
-        
-        print("\n" + "=" * 60)
-        if all_bookings:
-            print("📝 Generating iCal files...\n")
-            created_files = generate_ical_per_month(all_bookings)
-            
-            print("\n" + "=" * 60)
-            print("✨ Success! Next steps:")
-            print(f"\n📁 Created {len(created_files)} file(s):")
-            for filename in created_files:
-                print(f"   - {filename}")
-            print(f"\n📂 Location: {os.path.abspath('.')}")
-            print("\n🔄 To import to Google Calendar:")
-            print("1. Go to https://calendar.google.com")
-            print("2. Click ⚙️ Settings → Settings")
-            print("3. Click 'Import & export' in left sidebar")
-            print("4. Click 'Select file from your computer'")
-            print("5. Import each .ics file (or select all at once)")
-            print("6. Choose which calendar to import into")
-            print("7. Click 'Import'")
-            print("\n💡 Tip: You can import all files at once by selecting them together!")
+        print(f"👤 [{name}] starting...")
+        months = None
+        if SCRAPE_ENGINE == "http":
+            session = HttpSession()
+            if ensure_http_login(session, account['username'], account['password']):
+                months = iter_months_with_http(session, checkpoint_file)
+        elif SCRAPE_ENGINE == "cdp":
+            months = iter_months_with_cdp(account['username'], account['password'], session_cache_file,
+                                          checkpoint_file, os.path.join(account_folder, 'chrome_profile'))
         else:
-            print("⚠️ No bookings found. This could mean:")
-            print("   - No bookings exist for these months")
-            print("   - CSS selectors need updating (ParentZone changed their UI)")
-            print("   - Page didn't load properly")
-            print("\n💡 Try running again with the browser visible:")
-            print("   Comment out the --headless line in setup_driver()")
+            driver = setup_driver(headless=True, profile_dir=os.path.join(account_folder, 'chrome_profile'))
+            if open_bookings_page(driver, account['username'], account['password'], session_cache_file):
+                months = iter_months_with_driver(driver, month_state, checkpoint_file)
         
+        if months is None:
+            result['status'] = 'login failed'
+        else:
+            created_files, total_bookings = report_results(
+                months, account_folder, month_state=month_state,
+                show_instructions=False, state_file=state_file, history=history
+            )
+            result['bookings'] = total_bookings
+            result['files'] = len(created_files)
+            if checkpoint_file and os.path.exists(checkpoint_file):
+                result['status'] = 'months failed'
+    
     except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
-        print("\nTroubleshooting tips:")
-        print("1. Make sure Chrome browser is installed")
-        print("2. Install chromedriver matching your Chrome version")
-        print("3. Check if ParentZone website structure changed")
-        print("4. Try running with browser visible (comment out --headless)")
-        
+        result['status'] = f"error: {e}"
+    
     finally:
         if driver:
-            print("\n🔒 Closing browser...")
             driver.quit()
+        if session:
+            session.close()
+        if history:
+            history.close()
+        result['seconds'] = time.perf_counter() - started
+        print(f"👤 [{name}] {result['status']} in {result['seconds']:.1f}s")
+    
+    return result
+
+
+def run_batch(accounts_file):
+    """Scrape several accounts at once, BATCH_WORKERS at a time"""
+    print("=" * 60)
+    print("ParentZone Calendar Scraper - batch mode")
+    print("=" * 60)
+    
+    accounts = load_accounts(accounts_file)
+    print(f"\n👥 {len(accounts)} account(s), {BATCH_WORKERS} at a time\n")
+    
+    # Accounts finished by an interrupted batch aren't scraped again
+    progress_file = os.path.join(BATCH_OUTPUT_FOLDER, 'batch_checkpoint.json') if CHECKPOINT_FILE else ""
+    names = sorted(account['name'] for account in accounts)
+    progress = load_checkpoint(names, progress_file) if progress_file else None
+    progress_lock = threading.Lock()
+    if progress and progress['done']:
+        print(f"♻️ Carrying on from the last batch: {len(progress['done'])} account(s) already done\n")
+    
+    def scrape_account_once(account):
+        if progress and account['name'] in progress['done']:
+            return {'name': account['name'], 'status': 'ok (earlier run)', 'bookings': 0, 'files': 0, 'seconds': 0.0}
         
-        print("\n" + "=" * 60)
-        input("Press Enter to exit...")
+        result = scrape_account(account)
+        if progress and result['status'] == 'ok':
+            with progress_lock:
+                progress['done'][account['name']] = True
+                os.makedirs(BATCH_OUTPUT_FOLDER, exist_ok=True)
+                save_checkpoint(progress, progress_file)
+        return result
+    
+    started = time.perf_counter()
+    TRACE.reset()
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as pool:
+        results = list(pool.map(scrape_account_once, accounts))
+    wall_seconds = time.perf_counter() - started
+    write_run_trace(all(r['status'].startswith('ok') for r in results), sum(r['bookings'] for r in results))
+    
+    if progress and all(r['status'].startswith('ok') for r in results):
+        clear_checkpoint(progress_file)
+    
+    print("\n" + "=" * 60)
+    print(f"{'Account':<24} {'Status':<16} {'Bookings':>8} {'Files':>6} {'Time':>8}")
+    for result in results:
+        print(f"{result['name'][:24]:<24} {result['status'][:16]:<16} "
+              f"{result['bookings']:>8} {result['files']:>6} {result['seconds']:>7.1f}s")
+    
+    failed = sum(1 for result in results if not result['status'].startswith('ok'))
+    print(f"\n⏱️ {len(results)} account(s) in {wall_seconds:.1f}s "
+          f"(one after another: {sum(r['seconds'] for r in results):.1f}s), {failed} failed")
+    print(f"📂 Location: {os.path.abspath(BATCH_OUTPUT_FOLDER)}")
+    return results
+
+
+def reparse_saved_pages(paths, output_folder="."):
+    """Rebuild the iCal files from saved calendar pages, no browser needed"""
+    print(f"📂 Re-parsing {len(paths)} saved page(s)...")
+    started = time.perf_counter()
+    
+    all_bookings = []
+    for path, bookings in parse_saved_pages(paths):
+        print(f"  {os.path.basename(path)}: {len(bookings)} booking(s)")
+        all_bookings.extend(bookings)
+    
+    print(f"  ⏱️ Parsed in {time.perf_counter() - started:.2f}s\n")
+    
+    if all_bookings:
+        generate_ical_per_month(all_bookings, output_folder)
+    else:
+        print("⚠️ No bookings found in the saved pages.")
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "--parse-saved":
+        reparse_saved_pages(sys.argv[2:])
+    elif len(sys.argv) > 2 and sys.argv[1] == "--batch":
+        run_batch(sys.argv[2])
+    elif len(sys.argv) > 3 and sys.argv[1] == "--history":
+        print_history_report(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) > 3 and sys.argv[1] == "--export-history":
+        export_history(sys.argv[2], sys.argv[3], *sys.argv[4:5])
+    elif "--serve" in sys.argv[1:]:
+        run_server()
+    elif "--pool" in sys.argv[1:]:
+        run_pool()
+    elif RUN_AS_DAEMON or "--daemon" in sys.argv[1:]:
+        run_daemon()
+    else:
+        main()
@@ -0,0 +1,305 @@
+"""The "cdp" engine over a real DevTools WebSocket, reading the pages in tests/fixtures/pages
+
+FakeChrome speaks just enough of the DevTools protocol for the engine. Each tab
+really fetches its page from a local fixture server, and the calendar scripts
+are answered by the offline parser, so no Chrome is needed.
+"""
+
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import urlopen
+import asyncio
+import base64
+import contextlib
+import hashlib
+import io
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+MONTHS = [datetime(2027, 1, 1), datetime(2027, 2, 1), datetime(2027, 3, 1)]
+
+
+def fixture_page(month_start):
+    with open(os.path.join(PAGES, f"bookings_{month_start:%b_%Y}.html".lower()), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """/bookings?date=YYYY-MM-DD from tests/fixtures/pages (January without a date), /login and /robots.txt"""
+    
+    def do_GET(self):
+        url = urlsplit(self.path)
+        date = parse_qs(url.query).get('date', ['2027-01-01'])[0]
+        
+        if url.path == '/bookings' and date in self.server.expired:
+            self.send_response(302)
+            self.send_header('Location', '/login')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        try:
+            if url.path == '/bookings':
+                body = fixture_page(datetime.strptime(date, '%Y-%m-%d'))
+            elif url.path == '/login':
+                body = '<form><input name="email"><input name="password"><button type="submit"></button></form>'
+            elif url.path == '/robots.txt':
+                body = 'User-agent: *\n'
+            else:
+                raise FileNotFoundError(url.path)
+        except FileNotFoundError:
+            self.send_error(404)
+            return
+        
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeChrome:
+    """A DevTools endpoint whose tabs load pages with urllib and run the calendar scripts in Python
+    
+    delays holds extra seconds before a month's calendar shows, by date.
+    """
+    
+    GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+    
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.tabs = {}
+        self.loop = None
+    
+    def start(self):
+        ready = threading.Event()
+        
+        async def serve():
+            self.loop = asyncio.get_running_loop()
+            self.stopped = asyncio.Event()
+            async with await asyncio.start_server(self.handle, '127.0.0.1', 0) as server:
+                self.port = server.sockets[0].getsockname()[1]
+                ready.set()
+                await self.stopped.wait()
+        
+        self.thread = threading.Thread(target=asyncio.run, args=(serve(),), daemon=True)
+        self.thread.start()
+        ready.wait()
+        return f"127.0.0.1:{self.port}"
+    
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.stopped.set)
+        self.thread.join()
+    
+    async def handle(self, reader, writer):
+        request = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1')
+        if request.startswith('GET /json/version '):
+            body = json.dumps({'webSocketDebuggerUrl': f"ws://127.0.0.1:{self.port}/devtools/browser/fake"}).encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+            await writer.drain()
+            writer.close()
+            return
+        
+        key = next(line.split(':', 1)[1].strip() for line in request.split('\r\n')
+                   if line.lower().startswith('sec-websocket-key:'))
+        accept = base64.b64encode(hashlib.sha1((key + self.GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        
+        while True:
+            try:
+                first, second = await reader.readexactly(2)
+                length = second & 0x7F
+                if length == 126:
+                    length = struct.unpack('!H', await reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack('!Q', await reader.readexactly(8))[0]
+                mask = await reader.readexactly(4)
+                payload = await reader.readexactly(length)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            command = json.loads(bytes(byte ^ mask[idx % 4] for idx, byte in enumerate(payload)))
+            asyncio.create_task(self.reply(command, writer))
+    
+    async def reply(self, command, writer):
+        result = await self.run(command['method'], command['params'], self.tabs.get(command.get('sessionId')))
+        reply = {'id': command['id'], 'result': result}
+        data = json.dumps(reply).encode()
+        if len(data) < 126:
+            header = bytes([0x81, len(data)])
+        elif len(data) < 65536:
+            header = bytes([0x81, 126]) + struct.pack('!H', len(data))
+        else:
+            header = bytes([0x81, 127]) + struct.pack('!Q', len(data))
+        writer.write(header + data)
+        await writer.drain()
+    
+    async def run(self, method, params, tab):
+        if method == 'Target.createTarget':
+            target_id = f"tab{len(self.tabs) + 1}"
+            self.tabs[target_id] = {'url': 'about:blank', 'html': None, 'ready_at': 0}
+            return {'targetId': target_id}
+        if method == 'Target.attachToTarget':
+            return {'sessionId': params['targetId']}
+        if method == 'Page.navigate':
+            tab['url'], tab['html'] = await asyncio.to_thread(self.fetch, params['url'])
+            date = parse_qs(urlsplit(params['url']).query).get('date', [None])[0]
+            tab['ready_at'] = time.perf_counter() + self.delays.get(date, 0)
+            return {'frameId': 'frame'}
+        if method == 'Runtime.evaluate':
+            return {'result': {'type': 'object', 'value': self.evaluate(params['expression'], tab)}}
+        if method == 'Storage.getCookies':
+            return {'cookies': []}
+        return {}
+    
+    @staticmethod
+    def fetch(url):
+        try:
+            with urlopen(url, timeout=5) as response:
+                return response.url, response.read().decode('utf-8')
+        except HTTPError as error:
+            with error:
+                return url, None
+    
+    def evaluate(self, expression, tab):
+        script, _, args = expression.rpartition(').apply(null, ')
+        args = json.loads(args[:-1])
+        calendar = None
+        if tab['html'] and time.perf_counter() >= tab['ready_at']:
+            header, days = pz.parse_calendar_html(tab['html'])
+            calendar = (header, days) if header and days else None
+        
+        if 'input[name="email"]' in script:
+            # Submitting the login form lands on the bookings page
+            tab['url'] = pz.PARENTZONE_BOOKINGS_URL
+            return True
+        if pz.SELECTOR_PROBE_JS in script:
+            if "location.href.includes('login')" in script and 'login' in tab['url']:
+                return 'login'
+            return {name: 0 if calendar else -1 for name in args[0]}
+        if pz.CALENDAR_STATE_JS in script:
+            if not calendar:
+                return None
+            header, days = calendar
+            return [header, len(days), days[0][0], days[-1][0], sum(len(rows) for _, rows in days)]
+        if pz.CALENDAR_SNAPSHOT_JS in script:
+            header, days = calendar
+            return {'header': header, 'days': [[date, [list(row) for row in rows]] for date, rows in days]}
+        if "toLowerCase().includes('login')" in script:
+            return 'login' not in tab['url'].lower()
+        if 'return location.href;' in script:
+            return tab['url']
+        if 'Object.assign({}, window.localStorage)' in script:
+            return {}
+        return None
+
+
+class CdpEngineTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.site = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+        self.site.expired = set()
+        threading.Thread(target=self.site.serve_forever, daemon=True).start()
+        self.addCleanup(self.site.server_close)
+        self.addCleanup(self.site.shutdown)
+        site_url = f"http://127.0.0.1:{self.site.server_address[1]}"
+        
+        self.chrome = FakeChrome()
+        chrome_address = self.chrome.start()
+        self.addCleanup(self.chrome.stop)
+        
+        for name, value in (('PARENTZONE_LOGIN_URL', f"{site_url}/login"),
+                            ('PARENTZONE_BOOKINGS_URL', f"{site_url}/bookings"),
+                            ('PARENTZONE_BOOKINGS_MONTH_URL', f"{site_url}/bookings?date={{date}}"),
+                            ('PARENTZONE_SESSION_SEED_URL', f"{site_url}/robots.txt"),
+                            ('CHROME_DEBUGGER_ADDRESS', chrome_address),
+                            ('SESSION_CACHE_FILE', ""),
+                            ('SELECTOR_CACHE_FILE', ""),
+                            ('USE_ACTUAL_TIMES', True),
+                            ('CDP_CONCURRENCY', 3),
+                            ('MONTH_RETRIES', 1),
+                            ('MONTH_RETRY_BACKOFF_SECONDS', 0),
+                            ('WAIT_POLL_SECONDS', 0.02)):
+            self.addCleanup(setattr, pz, name, getattr(pz, name))
+            setattr(pz, name, value)
+        self.addCleanup(pz.WAIT_BUDGETS.update, dict(pz.WAIT_BUDGETS))
+        pz.WAIT_BUDGETS.update(bookings_page=1, selectors=0.5, login=2)
+    
+    def scrape(self, month_starts, failures=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return list(pz.iter_months_over_cdp(month_starts, 'parent@example.com', 'secret', failures))
+    
+    def sessions(self, bookings):
+        return [(b.child_name, b.booked_start, b.booked_end) for b in bookings]
+    
+    def test_same_bookings_as_the_selenium_path(self):
+        months = self.scrape(MONTHS)
+        
+        self.assertEqual([month_year for month_year, _ in months], ['Jan 2027', 'Feb 2027', 'Mar 2027'])
+        for month_start, (_, bookings) in zip(MONTHS, months):
+            header_text, days = pz.parse_calendar_html(fixture_page(month_start))
+            month_abbrev, _, year = pz.parse_month_header(header_text)
+            expected = pz.build_month_bookings(month_abbrev, year, days, verbose=False)
+            self.assertEqual(self.sessions(bookings), self.sessions(expected))
+    
+    def test_months_come_out_in_order_however_they_finish(self):
+        self.chrome.delays = {'2027-01-01': 0.4, '2027-03-01': 0.1}
+        finished = []
+        
+        async def scrape_directly():
+            browser = await pz.CdpBrowser.start()
+            try:
+                await pz.cdp_scrape_months(browser, MONTHS, lambda month_idx, *result: finished.append(month_idx))
+            finally:
+                await browser.close()
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(scrape_directly())
+        self.assertEqual(finished, [1, 2, 0])
+        
+        months = self.scrape(MONTHS)
+        self.assertEqual([month_year for month_year, _ in months], ['Jan 2027', 'Feb 2027', 'Mar 2027'])
+    
+    def test_failed_month_is_noted_and_the_others_carry_on(self):
+        failures = {}
+        months = self.scrape([MONTHS[0], datetime(2027, 4, 1), MONTHS[2]], failures)
+        
+        self.assertEqual([month_year for month_year, _ in months], ['Jan 2027', 'Mar 2027'])
+        self.assertEqual(list(failures), ['2027-04'])
+        self.assertIn("calendar not loaded", failures['2027-04'])
+    
+    def test_failed_month_stops_the_scrape_without_failures(self):
+        months = self.scrape([MONTHS[0], datetime(2027, 4, 1), MONTHS[2]])
+        
+        self.assertEqual([month_year for month_year, _ in months], ['Jan 2027'])
+    
+    def test_expired_session_fails_fast(self):
+        self.site.expired.add('2027-02-01')
+        pz.WAIT_BUDGETS['bookings_page'] = 10
+        
+        started = time.perf_counter()
+        with self.assertRaises(pz.SessionExpired):
+            self.scrape(MONTHS, {})
+        self.assertLess(time.perf_counter() - started, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""The calendar feed server, over real HTTP on a free port"""
+
+import gzip
+import os
+import sys
+import unittest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+
+class FeedServerTest(unittest.TestCase):
+    
+    def setUp(self):
+        with open(os.path.join(PAGES, 'bookings_jan_2027.html'), 'r', encoding='utf-8') as f:
+            self.bookings = pz.extract_bookings_from_html(f.read())
+        
+        self.feed_cache = pz.FeedCache()
+        self.server = pz.start_feed_server(self.feed_cache, host='127.0.0.1', port=0)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        host, port = self.server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+    
+    def fetch(self, path, **headers):
+        """GET path; returns (status, headers, body) without raising on 304/404"""
+        try:
+            with urlopen(Request(self.base_url + path, headers=headers), timeout=5) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as error:
+            with error:
+                return error.code, error.headers, error.read()
+    
+    def test_503_until_the_first_scrape(self):
+        status, headers, _ = self.fetch('/calendar.ics')
+        self.assertEqual(status, 503)
+        self.assertEqual(headers['Retry-After'], '60')
+    
+    def test_serves_month_and_combined_feeds(self):
+        self.feed_cache.update_month('2027-01', self.bookings)
+        
+        for path in ('/calendar.ics', '/calendar/2027-01.ics'):
+            status, headers, body = self.fetch(path)
+            self.assertEqual(status, 200)
+            self.assertEqual(headers['Content-Type'], 'text/calendar; charset=utf-8')
+            self.assertIsNone(headers['Content-Encoding'])
+            self.assertTrue(headers['ETag'])
+            self.assertTrue(body.startswith(b'BEGIN:VCALENDAR'))
+            self.assertEqual(body.count(b'BEGIN:VEVENT'), len(self.bookings))
+    
+    def test_304_on_if_none_match(self):
+        self.feed_cache.update_month('2027-01', self.bookings)
+        _, headers, _ = self.fetch('/calendar/2027-01.ics')
+        
+        status, not_modified, body = self.fetch('/calendar/2027-01.ics', **{'If-None-Match': headers['ETag']})
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b'')
+        self.assertEqual(not_modified['ETag'], headers['ETag'])
+        
+        status, _, _ = self.fetch('/calendar/2027-01.ics', **{'If-None-Match': '"something-else"'})
+        self.assertEqual(status, 200)
+    
+    def test_304_on_if_modified_since(self):
+        self.feed_cache.update_month('2027-01', self.bookings)
+        _, headers, _ = self.fetch('/calendar.ics')
+        
+        status, _, body = self.fetch('/calendar.ics', **{'If-Modified-Since': headers['Last-Modified']})
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b'')
+        
+        status, _, _ = self.fetch('/calendar.ics', **{'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+        self.assertEqual(status, 200)
+    
+    def test_etag_unchanged_until_a_booking_moves(self):
+        self.feed_cache.update_month('2027-01', self.bookings)
+        _, first, _ = self.fetch('/calendar.ics')
+        
+        self.assertFalse(self.feed_cache.update_month('2027-01', list(self.bookings)))
+        _, again, _ = self.fetch('/calendar.ics')
+        self.assertEqual(again['ETag'], first['ETag'])
+        
+        self.assertTrue(self.feed_cache.update_month('2027-01', self.bookings[1:]))
+        _, changed, _ = self.fetch('/calendar.ics')
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+    
+    def test_gzip(self):
+        self.feed_cache.update_month('2027-01', self.bookings)
+        _, _, plain = self.fetch('/calendar.ics')
+        
+        status, headers, body = self.fetch('/calendar.ics', **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(headers['Content-Length']), len(body))
+        self.assertEqual(gzip.decompress(body), plain)
+    
+    def test_404(self):
+        self.feed_cache.update_month('2027-01', self.bookings)
+        
+        for path in ('/calendar/2027-02.ics', '/nothing-here', '/calendar/2027-01.txt'):
+            status, _, _ = self.fetch(path)
+            self.assertEqual(status, 404, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
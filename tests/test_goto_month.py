@@ -0,0 +1,140 @@
+"""Getting to a month: direct URL, then the page's own router, then clicking (goto_month)"""
+
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+from selenium.common.exceptions import NoSuchElementException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+class FakeElement:
+    
+    def __init__(self, text='', on_click=None):
+        self.text = text
+        self.on_click = on_click
+    
+    def click(self):
+        self.on_click()
+
+
+class MonthPagesDriver:
+    """A bookings page showing one month at a time, with working 'next' / 'previous' buttons
+    
+    honours_url: loading PARENTZONE_BOOKINGS_MONTH_URL opens that month,
+    otherwise the page always opens on home_month.
+    follows_router: the page follows SOFT_NAVIGATE_JS without a reload.
+    buttons: the page has its 'next' / 'previous' buttons.
+    Every page load, router jump and click is kept in self.steps.
+    """
+    
+    def __init__(self, month, honours_url=True, follows_router=True, buttons=True):
+        self.month = month
+        self.home_month = month
+        self.honours_url = honours_url
+        self.follows_router = follows_router
+        self.buttons = buttons
+        self.steps = []
+    
+    @property
+    def header_text(self):
+        return f"Bookings - {self.month:%b %Y}"
+    
+    def url_month(self, url):
+        date = parse_qs(urlsplit(url).query).get('date')
+        return datetime.strptime(date[0], '%Y-%m-%d') if date else self.home_month
+    
+    def get(self, url):
+        self.steps.append('load')
+        self.month = self.url_month(url) if self.honours_url else self.home_month
+    
+    def click(self, direction):
+        self.steps.append(direction)
+        self.month = pz.add_months(self.month, 1 if direction == 'next' else -1)
+    
+    def find_element(self, by, selector):
+        if selector in pz.selector_candidates('header'):
+            return FakeElement(self.header_text)
+        for direction in ('next', 'previous'):
+            if self.buttons and selector in pz.selector_candidates(f'{direction}_button'):
+                return FakeElement(on_click=lambda direction=direction: self.click(direction))
+        raise NoSuchElementException(selector)
+    
+    def execute_script(self, script, *args):
+        if script == pz.SOFT_NAVIGATE_JS:
+            self.steps.append('router')
+            if self.follows_router:
+                self.month = self.url_month(args[0])
+            return None
+        if script == pz.CALENDAR_STATE_JS:
+            return [self.header_text, 35, '1', '31', 0]
+        raise AssertionError(f"unexpected script: {script[:40]}")
+
+
+class GotoMonthTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.addCleanup(pz.DIRECT_NAVIGATION.update, dict(pz.DIRECT_NAVIGATION))
+        pz.DIRECT_NAVIGATION.update(works=None, in_page=None)
+        self.addCleanup(pz.WAIT_BUDGETS.update, dict(pz.WAIT_BUDGETS))
+        pz.WAIT_BUDGETS.update(month_jump=0.2, month_change=1, bookings_page=1)
+        self.addCleanup(setattr, pz, 'WAIT_POLL_SECONDS', pz.WAIT_POLL_SECONDS)
+        pz.WAIT_POLL_SECONDS = 0.01
+        self.addCleanup(setattr, pz, 'SELECTOR_CACHE_FILE', pz.SELECTOR_CACHE_FILE)
+        pz.SELECTOR_CACHE_FILE = ""
+    
+    def goto(self, driver, year, month):
+        driver.steps = []
+        month_start = datetime(year, month, 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(pz.goto_month(driver, month_start))
+        self.assertEqual(pz.shown_month(driver), month_start)
+        return driver.steps
+    
+    def test_url_then_the_pages_own_router(self):
+        driver = MonthPagesDriver(datetime(2027, 1, 1))
+        
+        self.assertEqual(self.goto(driver, 2027, 3), ['load'])
+        self.assertEqual(self.goto(driver, 2027, 4), ['router'])
+        self.assertEqual(self.goto(driver, 2027, 5), ['router'])
+        self.assertEqual(pz.DIRECT_NAVIGATION, {'works': True, 'in_page': True})
+    
+    def test_page_reloaded_when_the_router_ignores_the_url(self):
+        driver = MonthPagesDriver(datetime(2027, 1, 1), follows_router=False)
+        
+        self.assertEqual(self.goto(driver, 2027, 3), ['load'])
+        self.assertEqual(self.goto(driver, 2027, 4), ['router', 'load'])
+        self.assertEqual(self.goto(driver, 2027, 5), ['load'])
+        self.assertEqual(pz.DIRECT_NAVIGATION, {'works': True, 'in_page': False})
+    
+    def test_clicks_through_when_the_url_is_ignored(self):
+        driver = MonthPagesDriver(datetime(2027, 1, 1), honours_url=False)
+        
+        self.assertEqual(self.goto(driver, 2027, 3), ['load', 'next', 'next'])
+        self.assertEqual(pz.DIRECT_NAVIGATION['works'], False)
+        self.assertEqual(self.goto(driver, 2026, 12), ['previous', 'previous', 'previous'])
+    
+    def test_clicks_through_when_direct_navigation_is_off(self):
+        pz.DIRECT_NAVIGATION.update(works=False)
+        driver = MonthPagesDriver(datetime(2027, 1, 1))
+        
+        self.assertEqual(self.goto(driver, 2027, 2), ['next'])
+        self.assertEqual(self.goto(driver, 2026, 11), ['previous', 'previous', 'previous'])
+    
+    def test_month_out_of_reach(self):
+        driver = MonthPagesDriver(datetime(2027, 1, 1), honours_url=False, buttons=False)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(pz.goto_month(driver, datetime(2027, 3, 1)))
+        self.assertEqual(driver.steps, ['load'])
+
+
+if __name__ == '__main__':
+    unittest.main()
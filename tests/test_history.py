@@ -0,0 +1,107 @@
+"""The SQLite history store (HISTORY_DB_FILE)"""
+
+from datetime import datetime
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+def session(child_name, month, day, start, end):
+    """A Booking on 2027-<month>-<day> from 'HH:MM' to 'HH:MM'"""
+    return pz.Booking.from_session(
+        child_name,
+        datetime.strptime(f"2027-{month:02d}-{day:02d} {start}", '%Y-%m-%d %H:%M'),
+        datetime.strptime(f"2027-{month:02d}-{day:02d} {end}", '%Y-%m-%d %H:%M'),
+    )
+
+
+JANUARY = [
+    session('Amy', 1, 4, '08:00', '13:00'),
+    session('Ben', 1, 4, '09:00', '15:00'),
+    session('Amy', 1, 5, '08:00', '17:30'),
+]
+FEBRUARY = [
+    session('Amy', 2, 1, '08:00', '12:00'),
+]
+
+
+class BookingHistoryTest(unittest.TestCase):
+    
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name
+        self.db_file = os.path.join(self.folder, 'history.db')
+        self.history = pz.BookingHistory(self.db_file)
+        self.addCleanup(self.history.close)
+    
+    def sessions(self, first_day='2027-01-01', last_day='2027-12-31', child_name=None):
+        return [(b.child_name, b.booked_start, b.booked_end)
+                for b in self.history.bookings(first_day, last_day, child_name)]
+    
+    def test_bookings_come_back_as_they_went_in(self):
+        self.history.record_month('2027-01', JANUARY)
+        
+        self.assertEqual(self.history.bookings('2027-01-01', '2027-01-31'), [JANUARY[0], JANUARY[1], JANUARY[2]])
+        self.assertEqual(self.sessions('2027-01-05', '2027-01-05'),
+                         [('Amy', datetime(2027, 1, 5, 8), datetime(2027, 1, 5, 17, 30))])
+        self.assertEqual([child for child, _, _ in self.sessions(child_name='Ben')], ['Ben'])
+    
+    def test_same_child_and_start_is_updated_not_duplicated(self):
+        self.history.record_month('2027-01', JANUARY)
+        later_end = session('Amy', 1, 4, '08:00', '14:00')
+        self.history.record_month('2027-01', [later_end] + JANUARY[1:])
+        
+        self.assertEqual(self.sessions('2027-01-04', '2027-01-04'), [
+            ('Amy', datetime(2027, 1, 4, 8), datetime(2027, 1, 4, 14)),
+            ('Ben', datetime(2027, 1, 4, 9), datetime(2027, 1, 4, 15)),
+        ])
+    
+    def test_rescraping_a_month_deletes_its_cancelled_bookings_only(self):
+        self.history.record_month('2027-01', JANUARY)
+        self.history.record_month('2027-02', FEBRUARY)
+        self.history.record_month('2027-01', JANUARY[:1])
+        
+        self.assertEqual(self.sessions(), [
+            ('Amy', datetime(2027, 1, 4, 8), datetime(2027, 1, 4, 13)),
+            ('Amy', datetime(2027, 2, 1, 8), datetime(2027, 2, 1, 12)),
+        ])
+        
+        self.history.record_month('2027-02', [])
+        self.assertEqual(len(self.sessions()), 1)
+    
+    def test_totals_per_child_and_month(self):
+        self.history.record_bookings(JANUARY + FEBRUARY + JANUARY[:1])
+        
+        self.assertEqual(self.history.totals('2027-01-01', '2027-12-31'), [
+            ('Amy', '2027-01', 2, 14.5),
+            ('Amy', '2027-02', 1, 4.0),
+            ('Ben', '2027-01', 1, 6.0),
+        ])
+        self.assertEqual(self.history.totals('2027-02-01', '2027-02-28'), [('Amy', '2027-02', 1, 4.0)])
+    
+    def test_report_and_export(self):
+        self.history.record_bookings(JANUARY + FEBRUARY)
+        self.history.close()
+        output_folder = os.path.join(self.folder, 'export')
+        
+        with contextlib.redirect_stdout(io.StringIO()) as report:
+            pz.print_history_report('2027-01-01', '2027-12-31', self.db_file)
+            pz.export_history('2027-01-01', '2027-12-31', output_folder, self.db_file)
+        
+        self.assertRegex(report.getvalue(), r"Amy\s+total\s+3\s+18\.50")
+        self.assertEqual(sorted(os.listdir(output_folder)),
+                         ['parentzone_bookings_2027_February.ics', 'parentzone_bookings_2027_January.ics'])
+        with open(os.path.join(output_folder, 'parentzone_bookings_2027_January.ics'), 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read().count('BEGIN:VEVENT'), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
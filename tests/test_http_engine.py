@@ -0,0 +1,156 @@
+"""The "http" engine against a local server replaying the API fixtures in tests/fixtures/api"""
+
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'api')
+
+# (method, path) -> fixture file replayed for it, or an HTTP error status
+RESPONSES = {
+    ('POST', '/v1/auth/login'): 'login.json',
+    ('GET', '/v1/bookings?dateFrom=2026-07-01&dateTo=2026-07-31'): 'bookings_2026-07.json',
+    ('GET', '/v1/bookings?dateFrom=2026-12-01&dateTo=2026-12-31'): 'bookings_2026-12.json',
+}
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    def _replay(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.requests.append((method, self.path, self.headers.get('Authorization')))
+        
+        fixture = RESPONSES.get((method, self.path))
+        if fixture is None or isinstance(fixture, int):
+            self.send_error(fixture or 404)
+            return
+        with open(os.path.join(FIXTURES, fixture), 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        self._replay('GET')
+    
+    def do_POST(self):
+        self._replay('POST')
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpEngineTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ReplayHandler)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        
+        for name, value in (('PARENTZONE_API_URL', f"http://127.0.0.1:{self.server.server_address[1]}"),
+                            ('PARENTZONE_TIMEZONE', "Europe/London"),
+                            ('USE_ACTUAL_TIMES', True)):
+            self.addCleanup(setattr, pz, name, getattr(pz, name))
+            setattr(pz, name, value)
+    
+    def scrape(self, month_starts):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return pz.scrape_bookings_over_http('parent@example.com', 'secret', month_starts)
+    
+    def sessions(self, bookings):
+        return [(b.child_name, b.booked_start, b.booked_end) for b in bookings]
+    
+    def test_summer_times_are_converted_to_london_time(self):
+        bookings = self.scrape([datetime(2026, 7, 1)])
+        
+        # 30 Jun is the month before, 31 Jul 23:30 UTC is already 1 Aug in London
+        self.assertEqual(self.sessions(bookings), [
+            ('Amy Smith', datetime(2026, 7, 1, 8, 0), datetime(2026, 7, 1, 17, 30)),
+            ('Ben Smith', datetime(2026, 7, 1, 8, 30), datetime(2026, 7, 1, 13, 0)),
+        ])
+    
+    def test_winter_times_stay_as_they_are(self):
+        bookings = self.scrape([datetime(2026, 12, 1)])
+        
+        self.assertEqual(self.sessions(bookings), [
+            ('Amy Smith', datetime(2026, 12, 1, 8, 0), datetime(2026, 12, 1, 13, 0)),
+            ('Amy Smith', datetime(2026, 12, 2, 8, 0), datetime(2026, 12, 2, 17, 0)),
+        ])
+    
+    def test_login_token_is_sent_with_every_month(self):
+        self.scrape([datetime(2026, 7, 1), datetime(2026, 12, 1)])
+        
+        self.assertEqual(self.server.requests, [
+            ('POST', '/v1/auth/login', None),
+            ('GET', '/v1/bookings?dateFrom=2026-07-01&dateTo=2026-07-31', 'Bearer test-token-123'),
+            ('GET', '/v1/bookings?dateFrom=2026-12-01&dateTo=2026-12-31', 'Bearer test-token-123'),
+        ])
+    
+    def test_failed_login_returns_none(self):
+        self.addCleanup(RESPONSES.update, dict(RESPONSES))
+        del RESPONSES[('POST', '/v1/auth/login')]
+        
+        self.assertIsNone(self.scrape([datetime(2026, 7, 1)]))
+    
+    def test_failed_month_is_retried_then_picked_up_by_the_next_run(self):
+        august = ('GET', '/v1/bookings?dateFrom=2026-08-01&dateTo=2026-08-31')
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        checkpoint_file = os.path.join(folder.name, 'checkpoint.json')
+        for name, value in (('SCRAPE_START_MONTH', "2026-07"), ('SCRAPE_END_MONTH', "2026-08"),
+                            ('MONTH_RETRIES', 1), ('MONTH_RETRY_BACKOFF_SECONDS', 0)):
+            self.addCleanup(setattr, pz, name, getattr(pz, name))
+            setattr(pz, name, value)
+        
+        session = pz.HttpSession()
+        self.addCleanup(session.close)
+        with contextlib.redirect_stdout(io.StringIO()):
+            pz.ensure_http_login(session, 'parent@example.com', 'secret')
+            first_run = list(pz.iter_months_with_http(session, checkpoint_file))
+        
+        self.assertEqual([month_year for month_year, _ in first_run], ['Jul 2026'])
+        self.assertEqual([request[:2] for request in self.server.requests].count(august), 2)
+        with open(checkpoint_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(list(json.load(f)['failed']), ['2026-08'])
+        
+        # The July recording also has a session that starts on 1 Aug London time
+        self.addCleanup(RESPONSES.update, dict(RESPONSES))
+        RESPONSES[august] = 'bookings_2026-07.json'
+        self.server.requests.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            second_run = list(pz.iter_months_with_http(session, checkpoint_file))
+        
+        self.assertEqual([month_year for month_year, _ in second_run], ['Jul 2026', 'Aug 2026'])
+        self.assertEqual([request[:2] for request in self.server.requests], [august])
+        self.assertFalse(os.path.exists(checkpoint_file))
+    
+    def test_expired_login_is_not_retried(self):
+        self.addCleanup(RESPONSES.update, dict(RESPONSES))
+        RESPONSES[('GET', '/v1/bookings?dateFrom=2026-07-01&dateTo=2026-07-31')] = 401
+        
+        with self.assertRaises(pz.SessionExpired):
+            self.scrape([datetime(2026, 7, 1)])
+        self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""The .ics files follow RFC 5545: escaping, folding, CRLF, one DTSTAMP, stable UIDs"""
+
+from datetime import datetime
+import contextlib
+import io
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+def session(child_name, day, start_hour, end_hour):
+    return pz.Booking.from_session(child_name, datetime(2027, 1, day, start_hour), datetime(2027, 1, day, end_hour))
+
+
+def calendar_text(bookings, calendar_name="ParentZone 2027 January"):
+    buffer = io.StringIO(newline='')
+    pz.write_ical(buffer, calendar_name, bookings)
+    return buffer.getvalue()
+
+
+def unfold(text):
+    return text.replace('\r\n ', '')
+
+
+class IcalTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.addCleanup(setattr, pz, 'USE_ACTUAL_TIMES', pz.USE_ACTUAL_TIMES)
+        pz.USE_ACTUAL_TIMES = True
+        pz.reset_ical_dtstamp()
+        self.addCleanup(pz.reset_ical_dtstamp)
+    
+    def test_escaping(self):
+        self.assertEqual(pz.ical_escape('a,b;c\\d\ne\r\nf'), 'a\\,b\\;c\\\\d\\ne\\nf')
+        
+        text = unfold(calendar_text([session('Smith, Amy; "AJ"\\', 4, 8, 13)]))
+        self.assertIn('\r\nSUMMARY:Smith\\, Amy\\; "AJ"\\\\ 8am-1pm\r\n', text)
+    
+    def test_folding_never_splits_a_character(self):
+        line = 'DESCRIPTION:' + 'Zoë 😀 ' * 30
+        folded = pz.ical_line(line)
+        
+        self.assertTrue(folded.endswith('\r\n'))
+        physical_lines = folded[:-2].split('\r\n')
+        self.assertGreater(len(physical_lines), 1)
+        for idx, physical_line in enumerate(physical_lines):
+            # Each line is whole characters, so it encodes on its own
+            self.assertLessEqual(len(physical_line.encode('utf-8')), 75)
+            if idx:
+                self.assertTrue(physical_line.startswith(' '))
+        self.assertEqual(unfold(folded[:-2]), line)
+    
+    def test_short_lines_are_not_folded(self):
+        self.assertEqual(pz.ical_line('X' * 75), 'X' * 75 + '\r\n')
+        self.assertEqual(pz.ical_line('X' * 76), 'X' * 75 + '\r\n X\r\n')
+    
+    def test_crlf_line_endings_in_the_file(self):
+        with tempfile.TemporaryDirectory() as folder, contextlib.redirect_stdout(io.StringIO()):
+            filename = pz.write_month_ical('2027_January', [session('Amy', 4, 8, 13)], folder)
+            with open(os.path.join(folder, filename), 'rb') as f:
+                data = f.read()
+        
+        self.assertTrue(data.startswith(b'BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(data.endswith(b'END:VCALENDAR\r\n'))
+        self.assertNotIn(b'\n', data.replace(b'\r\n', b''))
+        self.assertNotIn(b'\r', data.replace(b'\r\n', b''))
+    
+    def test_one_dtstamp_per_run(self):
+        bookings = [session('Amy', day, 8, 13) for day in range(4, 9)]
+        text = calendar_text(bookings) + calendar_text(bookings[:2], "ParentZone 2027 February")
+        
+        dtstamps = set(re.findall(r'\r\nDTSTAMP:(\S+)\r\n', text))
+        self.assertEqual(len(dtstamps), 1)
+        self.assertRegex(dtstamps.pop(), r'^\d{8}T\d{6}Z$')
+        
+        pz.reset_ical_dtstamp()
+        self.assertIsNone(pz._run_dtstamp)
+    
+    def test_uids_survive_a_neighbour_being_removed(self):
+        bookings = [session('Amy', 4, 8, 13), session('Ben', 4, 8, 13), session('Amy', 5, 8, 13)]
+        uids = [pz.booking_uid(booking) for booking in bookings]
+        
+        self.assertEqual(len(set(uids)), 3)
+        remaining = re.findall(r'\r\nUID:(\S+)\r\n', unfold(calendar_text([bookings[0], bookings[2]])))
+        self.assertEqual(remaining, [uids[0], uids[2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+"""The lean browser profile's request blocking"""
+
+from fnmatch import fnmatchcase
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+def blocked(url):
+    """Whether Network.setBlockedURLs with BLOCKED_URL_PATTERNS would block url"""
+    return any(fnmatchcase(url, pattern) for pattern in pz.BLOCKED_URL_PATTERNS)
+
+
+class BlockedUrlTest(unittest.TestCase):
+    
+    def test_pages_the_scraper_opens_are_not_blocked(self):
+        for url in (pz.PARENTZONE_LOGIN_URL, pz.PARENTZONE_BOOKINGS_URL, pz.PARENTZONE_SESSION_SEED_URL,
+                    pz.PARENTZONE_BOOKINGS_MONTH_URL.format(date='2027-01-01')):
+            self.assertFalse(blocked(url), url)
+    
+    def test_images_fonts_and_trackers_are_blocked(self):
+        for url in ("https://www.parentzone.me/favicon.ico", "https://www.parentzone.me/static/logo.png",
+                    "https://www.parentzone.me/fonts/roboto.woff2", "https://www.google-analytics.com/g/collect"):
+            self.assertTrue(blocked(url), url)
+
+
+if __name__ == '__main__':
+    unittest.main()
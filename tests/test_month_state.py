@@ -0,0 +1,100 @@
+"""Spotting months that changed since the last run (MONTH_STATE_FILE)"""
+
+from datetime import datetime
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+def session(child_name, day, start, end):
+    """A Booking on 2027-01-<day> from 'HH:MM' to 'HH:MM'"""
+    return pz.Booking.from_session(
+        child_name,
+        datetime.strptime(f"2027-01-{day:02d} {start}", '%Y-%m-%d %H:%M'),
+        datetime.strptime(f"2027-01-{day:02d} {end}", '%Y-%m-%d %H:%M'),
+    )
+
+
+JANUARY = [
+    session('Amy', 4, '08:00', '13:00'),
+    session('Ben', 4, '09:00', '15:00'),
+    session('Amy', 5, '08:00', '17:30'),
+]
+
+
+class MonthStateTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.addCleanup(setattr, pz, 'USE_ACTUAL_TIMES', pz.USE_ACTUAL_TIMES)
+        pz.USE_ACTUAL_TIMES = True
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name
+        self.month_state = {}
+    
+    def diff(self, old_bookings, new_bookings):
+        return pz.diff_month_events(pz.month_event_rows(old_bookings), pz.month_event_rows(new_bookings))
+    
+    def needs_writing(self, bookings):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return pz.month_needs_writing('2027-01', bookings, self.month_state, self.folder)
+    
+    def write(self, bookings):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return pz.report_results([('Jan 2027', bookings)], self.folder, self.month_state,
+                                     show_instructions=False, state_file=os.path.join(self.folder, 'state.json'))
+    
+    def test_fingerprint_ignores_order_and_duplicates(self):
+        fingerprint = pz.month_fingerprint(pz.month_event_rows(JANUARY))
+        
+        self.assertEqual(pz.month_fingerprint(pz.month_event_rows(JANUARY[::-1] + JANUARY[:1])), fingerprint)
+        self.assertNotEqual(pz.month_fingerprint(pz.month_event_rows(JANUARY[:2])), fingerprint)
+    
+    def test_unchanged(self):
+        self.assertEqual(self.diff(JANUARY, list(JANUARY)), (0, 0, 0))
+    
+    def test_added_and_removed(self):
+        extra = session('Ben', 6, '08:00', '12:00')
+        
+        self.assertEqual(self.diff(JANUARY, JANUARY + [extra]), (1, 0, 0))
+        self.assertEqual(self.diff(JANUARY, JANUARY[1:]), (0, 1, 0))
+    
+    def test_moved_session_counts_as_changed(self):
+        moved = [session('Amy', 4, '10:00', '13:00')] + JANUARY[1:]
+        
+        self.assertEqual(self.diff(JANUARY, moved), (0, 0, 1))
+    
+    def test_unchanged_month_is_only_written_again_if_its_file_is_missing(self):
+        self.assertEqual(self.write(JANUARY), (['parentzone_bookings_2027_January.ics'], 3))
+        self.assertFalse(self.needs_writing(list(JANUARY)))
+        
+        os.remove(os.path.join(self.folder, 'parentzone_bookings_2027_January.ics'))
+        self.assertTrue(self.needs_writing(list(JANUARY)))
+    
+    def test_changed_month_is_written(self):
+        self.write(JANUARY)
+        
+        self.assertTrue(self.needs_writing(JANUARY[:2]))
+        self.assertEqual(self.month_state['2027-01']['events'], pz.month_event_rows(JANUARY[:2]))
+    
+    def test_empty_month_gets_no_file(self):
+        self.assertEqual(self.write([]), ([], 0))
+        self.assertEqual(os.listdir(self.folder), [])
+        self.assertNotIn('2027-01', self.month_state)
+    
+    def test_month_whose_bookings_all_went_is_written_empty(self):
+        self.write(JANUARY)
+        
+        self.assertEqual(self.write([]), (['parentzone_bookings_2027_January.ics'], 0))
+        self.assertEqual(self.write([]), ([], 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""The saved-page parser against the live snapshot path, on pages with the real MUI class names"""
+
+from datetime import datetime
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+
+class SnapshotDriver:
+    """Answers CALENDAR_SNAPSHOT_JS with what Chrome returned for the same page"""
+    
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+    
+    def execute_script(self, script, *args):
+        assert script == pz.CALENDAR_SNAPSHOT_JS
+        return self.snapshot
+
+
+def load_page(name):
+    with open(os.path.join(PAGES, f"{name}.html"), 'r', encoding='utf-8') as f:
+        page_source = f.read()
+    with open(os.path.join(PAGES, f"{name}.snapshot.json"), 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    return page_source, snapshot
+
+
+class OfflineParserTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.addCleanup(setattr, pz, 'USE_ACTUAL_TIMES', pz.USE_ACTUAL_TIMES)
+        pz.USE_ACTUAL_TIMES = True
+        self.page_source, self.snapshot = load_page('bookings_jan_2027')
+    
+    def live_bookings(self):
+        header_text, days = pz.read_calendar_snapshot(SnapshotDriver(self.snapshot))
+        month_abbrev, _, year = pz.parse_month_header(header_text)
+        return pz.build_month_bookings(month_abbrev, year, days, verbose=False)
+    
+    def test_reads_the_same_grid_as_the_snapshot(self):
+        self.assertEqual(
+            pz.parse_calendar_html(self.page_source),
+            pz.read_calendar_snapshot(SnapshotDriver(self.snapshot))
+        )
+    
+    def test_same_bookings_as_the_live_path(self):
+        self.assertEqual(pz.extract_bookings_from_html(self.page_source), self.live_bookings())
+    
+    def test_bookings(self):
+        sessions = [
+            (b.child_name, b.booked_start, b.booked_end)
+            for b in pz.extract_bookings_from_html(self.page_source)
+        ]
+        
+        self.assertEqual(sessions, [
+            # 28 Dec on the January page is last year's
+            ('Amy', datetime(2026, 12, 28, 8, 0), datetime(2026, 12, 28, 13, 0)),
+            # back-to-back sessions merged, text inside nested tags joined up
+            ('Amy', datetime(2027, 1, 4, 8, 0), datetime(2027, 1, 4, 17, 30)),
+            ('Ben Jones', datetime(2027, 1, 4, 9, 15), datetime(2027, 1, 4, 15, 45)),
+            # bookings missing their child name or session time are skipped
+            ('Amy', datetime(2027, 1, 5, 7, 30), datetime(2027, 1, 5, 18, 0)),
+            ('Ben Jones', datetime(2027, 1, 31, 8, 0), datetime(2027, 1, 31, 12, 0)),
+            ('Amy', datetime(2027, 2, 1, 8, 0), datetime(2027, 2, 1, 13, 0)),
+        ])
+    
+    def test_fallback_selectors_read_the_same_page(self):
+        self.addCleanup(pz.SELECTORS.update, dict(pz.SELECTORS))
+        for name in ('header', 'day', 'booking', 'child', 'session'):
+            pz.SELECTORS[name] = pz.SELECTOR_STRATEGIES[name][1]
+        
+        self.assertEqual(pz.extract_bookings_from_html(self.page_source), self.live_bookings())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+"""The run trace's phase totals"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+
+class RunTraceTest(unittest.TestCase):
+    
+    def setUp(self):
+        pz.TRACE.reset()
+        self.addCleanup(pz.TRACE.reset)
+    
+    def test_nested_phases_are_not_counted_twice(self):
+        @pz.traced('login')
+        def login():
+            time.sleep(0.2)
+        
+        @pz.traced('navigate')
+        def navigate():
+            time.sleep(0.1)
+            login()
+        
+        navigate()
+        run_seconds = time.perf_counter() - pz.TRACE.started
+        totals = pz.TRACE.phase_totals()
+        
+        self.assertGreaterEqual(totals['login']['seconds'], 0.2)
+        self.assertGreaterEqual(totals['navigate']['seconds'], 0.1)
+        self.assertLess(totals['navigate']['seconds'], 0.2)
+        self.assertLessEqual(sum(t['seconds'] for t in totals.values()), run_seconds)
+    
+    def test_each_file_is_one_generate_call(self):
+        with open(os.path.join(PAGES, 'bookings_jan_2027.html'), 'r', encoding='utf-8') as f:
+            bookings = pz.extract_bookings_from_html(f.read())
+        
+        with tempfile.TemporaryDirectory() as folder:
+            created_files = pz.generate_ical_per_month(bookings, folder)
+        
+        self.assertEqual(len(created_files), 3)
+        self.assertEqual(pz.TRACE.phase_totals()['generate']['calls'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Telling a slow bookings page from one ParentZone has changed (probe_selectors)"""
+
+import os
+import sys
+import time
+import unittest
+
+from selenium.common.exceptions import TimeoutException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+class SlowPageDriver:
+    """A bookings page that shows its parts (or goes to login) after a delay
+    
+    parts are the required page parts the page has once loaded, each found
+    with its first selector.
+    """
+    
+    def __init__(self, delay, parts=pz.REQUIRED_SELECTORS, goes_to_login=False):
+        self.opened = time.perf_counter()
+        self.delay = delay
+        self.parts = parts
+        self.goes_to_login = goes_to_login
+    
+    @property
+    def loaded(self):
+        return time.perf_counter() - self.opened >= self.delay
+    
+    @property
+    def current_url(self):
+        if self.goes_to_login and self.loaded:
+            return pz.PARENTZONE_LOGIN_URL
+        return pz.PARENTZONE_BOOKINGS_URL
+    
+    def execute_script(self, script, *args):
+        if script == pz.SELECTOR_PROBE_JS:
+            return {name: 0 if self.loaded and name in self.parts else -1 for name in args[0]}
+        if script == pz.CALENDAR_STATE_JS:
+            if not self.loaded or self.goes_to_login or self.parts != pz.REQUIRED_SELECTORS:
+                return None
+            return ['Bookings - Jan 2027', 35, '28 Dec', '31', 4]
+        raise AssertionError(f"unexpected script: {script[:40]}")
+
+
+class SelectorProbeTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.addCleanup(pz.WAIT_BUDGETS.update, dict(pz.WAIT_BUDGETS))
+        pz.WAIT_BUDGETS.update(selectors=0.2, bookings_page=1)
+        self.addCleanup(setattr, pz, 'SELECTOR_CACHE_FILE', pz.SELECTOR_CACHE_FILE)
+        pz.SELECTOR_CACHE_FILE = ""
+    
+    def test_slower_than_the_probe_still_loads(self):
+        driver = SlowPageDriver(delay=0.5)
+        
+        self.assertEqual(pz.wait_for_bookings_page(driver), 'calendar')
+    
+    def test_changed_page_fails_without_waiting_for_the_calendar(self):
+        driver = SlowPageDriver(delay=0, parts=('header', 'date', 'next_button'))
+        
+        started = time.perf_counter()
+        with self.assertRaisesRegex(pz.SelectorsBroken, r"can't find: day "):
+            pz.wait_for_bookings_page(driver)
+        self.assertLess(time.perf_counter() - started, pz.WAIT_BUDGETS['bookings_page'])
+    
+    def test_late_login_redirect(self):
+        driver = SlowPageDriver(delay=0.5, goes_to_login=True)
+        
+        self.assertEqual(pz.wait_for_bookings_page(driver), 'login')
+    
+    def test_page_that_never_loads_times_out(self):
+        driver = SlowPageDriver(delay=60)
+        
+        with self.assertRaises(TimeoutException):
+            pz.wait_for_bookings_page(driver)
+
+
+if __name__ == '__main__':
+    unittest.main()
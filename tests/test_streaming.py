@@ -0,0 +1,99 @@
+"""Writing each month's file as it is scraped (report_results), and never half a file"""
+
+from datetime import datetime
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrape_parentzone_bookings as pz
+
+
+PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+
+def fixture_months():
+    """('Mon YYYY', bookings) for each fixture page, like the month iterators yield"""
+    for month_start in (datetime(2027, 1, 1), datetime(2027, 2, 1), datetime(2027, 3, 1)):
+        with open(os.path.join(PAGES, f"bookings_{month_start:%b_%Y}.html".lower()), 'r', encoding='utf-8') as f:
+            yield f"{month_start:%b %Y}", pz.extract_bookings_from_html(f.read())
+
+
+def read_folder(folder):
+    files = {}
+    for filename in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, filename), 'rb') as f:
+            files[filename] = f.read()
+    return files
+
+
+class StreamingWriteTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.addCleanup(setattr, pz, 'USE_ACTUAL_TIMES', pz.USE_ACTUAL_TIMES)
+        pz.USE_ACTUAL_TIMES = True
+        pz.reset_ical_dtstamp()
+        self.addCleanup(pz.reset_ical_dtstamp)
+        self.folders = []
+        for _ in range(2):
+            folder = tempfile.TemporaryDirectory()
+            self.addCleanup(folder.cleanup)
+            self.folders.append(folder.name)
+    
+    def test_same_files_as_the_list_path(self):
+        streamed_folder, list_folder = self.folders
+        with contextlib.redirect_stdout(io.StringIO()):
+            created_files, _ = pz.report_results(fixture_months(), streamed_folder, show_instructions=False)
+            pz.generate_ical_per_month(pz.collect_months(fixture_months()), list_folder)
+        
+        streamed = read_folder(streamed_folder)
+        self.assertEqual(list(streamed), sorted(created_files))
+        self.assertEqual(len(streamed), 3)
+        # The list path also writes the overflow days of Dec and Apr as partial
+        # months of their own; the streamed files are the whole months it writes
+        listed = read_folder(list_folder)
+        self.assertEqual(set(listed) - set(streamed), {'parentzone_bookings_2026_December.ics',
+                                                       'parentzone_bookings_2027_April.ics'})
+        for filename, data in streamed.items():
+            self.assertEqual(data, listed[filename], filename)
+    
+    def test_interrupted_write_keeps_the_previous_file(self):
+        folder = self.folders[0]
+        with contextlib.redirect_stdout(io.StringIO()):
+            pz.report_results(fixture_months(), folder, show_instructions=False)
+        before = read_folder(folder)
+        
+        def crash_half_way(f, calendar_name, bookings):
+            f.write("BEGIN:VCALENDAR\r\n")
+            raise KeyboardInterrupt()
+        
+        with mock.patch.object(pz, 'write_ical', crash_half_way), contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(KeyboardInterrupt):
+                pz.report_results(fixture_months(), folder, show_instructions=False)
+        
+        self.assertEqual(read_folder(folder), before)
+    
+    def test_crash_in_a_later_month_keeps_the_earlier_files(self):
+        folder = self.folders[0]
+        
+        def months_then_crash():
+            months = fixture_months()
+            yield next(months)
+            yield next(months)
+            raise ConnectionError("browser went away")
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(ConnectionError):
+                pz.report_results(months_then_crash(), folder, show_instructions=False)
+        
+        self.assertEqual(list(read_folder(folder)), ['parentzone_bookings_2027_February.ics',
+                                                     'parentzone_bookings_2027_January.ics'])
+
+
+if __name__ == '__main__':
+    unittest.main()